@@ -1,4 +1,4 @@
-import pkg_resources
+import sys
 
 from .monkey import patch, patch_all  # noqa: E402
 from .pin import Pin  # noqa: E402
@@ -7,11 +7,42 @@ from .tracer import Tracer  # noqa: E402
 from .settings import config  # noqa: E402
 from .utils.deprecation import deprecated  # noqa: E402
 
-try:
-    __version__ = pkg_resources.get_distribution(__name__).version
-except pkg_resources.DistributionNotFound:
-    # package is not installed
-    __version__ = "dev"
+
+def _get_version():
+    """Returns the version of the installed distribution of ddtrace."""
+    try:
+        # DEV: `importlib.metadata` is only available from Python 3.8 and much cheaper to import than `pkg_resources`
+        from importlib import metadata
+    except ImportError:
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution(__name__).version
+        except pkg_resources.DistributionNotFound:
+            # package is not installed
+            return "dev"
+
+    try:
+        return metadata.version(__name__)
+    except metadata.PackageNotFoundError:
+        # package is not installed
+        return "dev"
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        # DEV: Looking up the version of the distribution is a significant part of the import time of ddtrace: look
+        #   it up the first time `ddtrace.__version__` is accessed
+        if name == "__version__":
+            global __version__
+            __version__ = _get_version()
+            return __version__
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+else:
+    __version__ = _get_version()
 
 
 # a global tracer instance with integration settings
@@ -3,12 +3,9 @@ from copy import deepcopy
 
 from .internal.logger import get_logger
 
-from .vendor import attr
-
 log = get_logger(__name__)
 
 
-@attr.s(slots=True)
 class Hooks(object):
     """
     Hooks configuration object is used for registering and calling hook functions
@@ -20,7 +17,14 @@ class Hooks(object):
             pass
     """
 
-    _hooks = attr.ib(init=False, factory=lambda: collections.defaultdict(set))
+    # DEV: Not an attrs class so that `import ddtrace` does not import `attr`
+    __slots__ = ("_hooks",)
+
+    def __init__(self):
+        self._hooks = collections.defaultdict(set)
+
+    def __repr__(self):
+        return "Hooks(_hooks={!r})".format(self._hooks)
 
     def __deepcopy__(self, memodict=None):
         hooks = Hooks()
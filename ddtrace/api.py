@@ -38,13 +38,15 @@ class Response(object):
     can call `resp.read()` and load the body once into an instance before we
     close the HTTPConnection used for the request.
     """
-    __slots__ = ['status', 'body', 'reason', 'msg']
+    __slots__ = ['status', 'body', 'reason', 'msg', 'payload']
 
     def __init__(self, status=None, body=None, reason=None, msg=None):
         self.status = status
         self.body = body
         self.reason = reason
         self.msg = msg
+        # The payload sent, set by the API
+        self.payload = None
 
     @classmethod
     def from_http_response(cls, resp):
@@ -153,7 +155,6 @@ class API(object):
             'Datadog-Meta-Lang': 'python',
             'Datadog-Meta-Lang-Version': PYTHON_VERSION,
             'Datadog-Meta-Lang-Interpreter': PYTHON_INTERPRETER,
-            'Datadog-Meta-Tracer-Version': ddtrace.__version__,
         })
 
         # Add container information if we have it
@@ -242,10 +243,33 @@ class API(object):
 
         return responses
 
+    def send_payload(self, payload):
+        """Send a payload of already encoded traces to the API.
+
+        :param payload: The payload to send.
+        :type payload: :class:`ddtrace.payload.Payload`
+        :return: The API HTTP response, or the exception raised while sending the payload.
+        """
+        return self._flush(payload)
+
+    def ping(self):
+        """Send a payload with an empty trace to the API, to check whether the agent is reachable.
+
+        :return: The API HTTP response, or the exception raised while sending the payload.
+        """
+        # DEV: `send_traces` and `payload.add_trace` ignore empty traces
+        payload = Payload(encoder=self._encoder)
+        encoded = self._encoder.encode_trace([])
+        payload.traces.append(encoded)
+        payload.size += len(encoded)
+        return self._flush(payload)
+
     def _flush(self, payload):
         try:
             response = self._put(self._traces, payload.get_payload(), payload.length)
         except (httplib.HTTPException, OSError, IOError) as e:
+            # DEV: Keep the payload so that it can be sent again without encoding the traces again
+            e.payload = payload
             return e
 
         # the API endpoint is not available so we should downgrade the connection and re-try the call
@@ -254,6 +278,7 @@ class API(object):
             self._downgrade()
             return self._flush(payload)
 
+        response.payload = payload
         return response
 
     @deprecated(message='Sending services to the API is no longer necessary', version='1.0.0')
@@ -262,6 +287,8 @@ class API(object):
 
     def _put(self, endpoint, data, count):
         headers = self._headers.copy()
+        # DEV: The version is looked up when sending the first payload rather than when importing ddtrace
+        headers.setdefault('Datadog-Meta-Tracer-Version', ddtrace.__version__)
         headers[self.TRACE_COUNT_HEADER] = str(count)
 
         if self.uds_path is None:
@@ -95,6 +95,20 @@ except ImportError:
         return int(_process_time() * 1e9)
 
 
+try:
+    from time import thread_time_ns
+except ImportError:
+    try:
+        from time import clock_gettime, CLOCK_THREAD_CPUTIME_ID
+    except ImportError:
+        # No per-thread CPU clock available: the process CPU clock is the best approximation we have
+        thread_time_ns = process_time_ns
+    else:
+
+        def thread_time_ns():
+            return int(clock_gettime(CLOCK_THREAD_CPUTIME_ID) * 1e9)
+
+
 if sys.version_info.major < 3:
     getrandbits = random.SystemRandom().getrandbits
 else:
@@ -102,7 +116,12 @@ else:
 
 
 if PYTHON_VERSION_INFO[0:2] >= (3, 4):
-    from asyncio import iscoroutinefunction
+
+    def iscoroutinefunction(fn):
+        # DEV: asyncio is expensive to import, only import it when it is needed to decorate functions
+        from asyncio import iscoroutinefunction
+
+        return iscoroutinefunction(fn)
 
     # Execute from a string to get around syntax errors from `yield from`
     # DEV: The idea to do this was stolen from `six`
@@ -111,7 +130,6 @@ if PYTHON_VERSION_INFO[0:2] >= (3, 4):
         textwrap.dedent(
             """
     import functools
-    import asyncio
 
 
     def make_async_decorator(tracer, coro, *params, **kw_params):
@@ -125,6 +143,8 @@ if PYTHON_VERSION_INFO[0:2] >= (3, 4):
         :param tuple params: arguments given to the Tracer.trace()
         :param dict kw_params: keyword arguments given to the Tracer.trace()
         \"\"\"
+        import asyncio
+
         @functools.wraps(coro)
         @asyncio.coroutine
         def func_wrapper(*args, **kwargs):
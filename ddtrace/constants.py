@@ -12,6 +12,7 @@ VERSION_KEY = 'version'
 SERVICE_KEY = 'service.name'
 SERVICE_VERSION_KEY = 'service.version'
 SPAN_MEASURED_KEY = '_dd.measured'
+GC_PAUSE_KEY = 'gc.pause_ns'
 
 NUMERIC_TAGS = (ANALYTICS_SAMPLE_RATE_KEY, )
 
@@ -3,12 +3,30 @@ import threading
 
 from .constants import HOSTNAME_KEY, SAMPLING_PRIORITY_KEY, ORIGIN_KEY, LOG_SPAN_KEY
 from .internal.logger import get_logger
+from .internal import compression
 from .internal import hostname
 from .settings import config
 from .utils.formats import asbool, get_env
 
 log = get_logger(__name__)
 
+# Rough estimates of the memory used by a span and by each of its tags, in bytes
+SPAN_SIZE = 400
+TAG_SIZE = 100
+
+# Metrics of the root span counting the spans dropped because the trace exceeded its budget
+DROPPED_SPANS_KEY = 'trace.dropped_spans'
+DROPPED_SPANS_COUNT_KEY = 'trace.dropped_spans.%s.%s.count'
+DROPPED_SPANS_DURATION_KEY = 'trace.dropped_spans.%s.%s.duration_ns'
+
+
+def _span_size(span):
+    """Return an estimate of the memory used by a finished span."""
+    size = SPAN_SIZE + TAG_SIZE * (len(span.meta) + len(span.metrics))
+    for key, value in span.meta.items():
+        size += len(key) + len(value)
+    return size
+
 
 class Context(object):
     """
@@ -27,6 +45,9 @@ class Context(object):
     """
     _partial_flush_enabled = asbool(get_env('tracer', 'partial_flush_enabled', default=False))
     _partial_flush_min_spans = int(get_env('tracer', 'partial_flush_min_spans', default=500))
+    # Budget of a trace: the maximum number of spans and the estimated memory (in bytes) kept by the context
+    _max_spans = int(get_env('tracer', 'max_spans_per_trace', default=0))
+    _max_memory = int(get_env('tracer', 'max_trace_memory', default=0))
 
     def __init__(self, trace_id=None, span_id=None, sampling_priority=None, _dd_origin=None):
         """
@@ -39,6 +60,14 @@ class Context(object):
         self._finished_spans = 0
         self._current_span = None
         self._lock = threading.Lock()
+        # {span id of a span with children: its last closed child}, used to compress consecutive siblings
+        self._last_children = {}
+        # Estimated memory of the finished spans kept by the context
+        self._memory = 0
+        # Identifiers of the open spans dropped because the trace exceeded its budget
+        self._dropped_spans = set()
+        # {(service, name): [count, total duration in nanoseconds]} of the dropped spans
+        self._dropped_stats = {}
 
         self._parent_trace_id = trace_id
         self._parent_span_id = span_id
@@ -112,15 +141,77 @@ class Context(object):
         else:
             self._parent_span_id = None
 
+    def _over_budget(self, span):
+        """
+        Return whether a new span exceeds the budget of the trace. The root span
+        is always kept and the children of dropped spans are always dropped.
+
+        Non-safe if not used with a lock. For internal Context usage only.
+        """
+        if span._parent is None:
+            return False
+        if self._dropped_spans and id(span._parent) in self._dropped_spans:
+            return True
+        if (
+            (self._max_spans and len(self._trace) >= self._max_spans)
+            or (self._max_memory and self._memory >= self._max_memory)
+        ):
+            if not self._dropped_stats:
+                log.debug('Trace %d exceeded its budget of %d spans and %d bytes, dropping new spans',
+                          span.trace_id, self._max_spans, self._max_memory)
+            return True
+        return False
+
     def add_span(self, span):
         """
         Add a span to the context trace list, keeping it as the last active span.
+
+        When the trace is over its budget, the span is not kept: only the number
+        and the total duration of such spans are reported on the root span.
         """
         with self._lock:
             self._set_current_span(span)
 
+            if (self._max_spans or self._max_memory) and self._over_budget(span):
+                self._dropped_spans.add(id(span))
+                stats = self._dropped_stats.setdefault((span.service, span.name), [0, 0])
+                stats[0] += 1
+                span._context = self
+                return
+
             self._trace.append(span)
             span._context = self
+            if span._parent is not None:
+                self._last_children.setdefault(span._parent.span_id, None)
+
+    def _compress_span(self, span):
+        """
+        Merge a closed span into the sibling closed right before it, if they are
+        compressible. Return whether the span was removed from the trace.
+
+        Non-safe if not used with a lock. For internal Context usage only.
+        """
+        parent = span._parent
+        if parent is None:
+            return False
+        sibling = self._last_children.get(parent.span_id)
+        self._last_children[parent.span_id] = span
+        if (
+            sibling is None
+            or sibling.span_id in self._last_children
+            or span.span_id in self._last_children
+            or not compression.can_merge(span, sibling)
+        ):
+            return False
+
+        compression.merge(span, sibling)
+        self._last_children[parent.span_id] = sibling
+        # The span has no children: it is most likely the last one of the trace
+        if self._trace[-1] is span:
+            self._trace.pop()
+        else:
+            self._trace.remove(span)
+        return True
 
     def close_span(self, span):
         """
@@ -128,9 +219,18 @@ class Context(object):
         cycles inside _trace list.
         """
         with self._lock:
-            self._finished_spans += 1
             self._set_current_span(span._parent)
 
+            if self._dropped_spans and id(span) in self._dropped_spans:
+                self._dropped_spans.discard(id(span))
+                self._dropped_stats[(span.service, span.name)][1] += span.duration_ns
+                return
+
+            if not self._compress_span(span):
+                self._finished_spans += 1
+                if self._max_memory:
+                    self._memory += _span_size(span)
+
             # notify if the trace is not closed properly; this check is executed only
             # if the debug logging is enabled and when the root span is closed
             # for an unfinished trace. This logging is meant to be used for debugging
@@ -147,6 +247,20 @@ class Context(object):
                     for wrong_span in unfinished_spans:
                         log.debug('\n%s', wrong_span.pprint(), extra=extra)
 
+    def _report_dropped_spans(self, root):
+        """
+        Set the number and the total duration of the spans dropped by the budget of
+        the trace on the root span, per service and name.
+
+        Non-safe if not used with a lock. For internal Context usage only.
+        """
+        total = 0
+        for (service, name), (count, duration) in self._dropped_stats.items():
+            total += count
+            root.set_metric(DROPPED_SPANS_COUNT_KEY % (service, name), count)
+            root.set_metric(DROPPED_SPANS_DURATION_KEY % (service, name), duration)
+        root.set_metric(DROPPED_SPANS_KEY, total)
+
     def _is_sampled(self):
         return any(span.sampled for span in self._trace)
 
@@ -179,17 +293,30 @@ class Context(object):
                     # DEV: `get_hostname()` value is cached
                     trace[0].set_tag(HOSTNAME_KEY, hostname.get_hostname())
 
+                # report the spans dropped because of the budget of the trace on its root span
+                if self._dropped_stats and trace:
+                    self._report_dropped_spans(trace[0])
+
                 # clean the current state
                 self._trace = []
                 self._finished_spans = 0
+                self._last_children = {}
+                self._memory = 0
+                self._dropped_spans = set()
+                self._dropped_stats = {}
                 self._parent_trace_id = None
                 self._parent_span_id = None
                 self._sampling_priority = None
                 return trace, sampled
 
-            elif self._partial_flush_enabled:
-                finished_spans = [t for t in self._trace if t.finished]
-                if len(finished_spans) >= self._partial_flush_min_spans:
+            # DEV: the finished spans are counted as they are closed, they are only
+            # looked for in the trace when they are flushed
+            elif self._partial_flush_enabled and self._finished_spans >= self._partial_flush_min_spans:
+                finished_spans = []
+                open_spans = []
+                for t in self._trace:
+                    (finished_spans if t.finished else open_spans).append(t)
+                if finished_spans:
                     # partial flush when enabled and we have more than the minimal required spans
                     trace = self._trace
                     sampled = self._is_sampled()
@@ -208,10 +335,13 @@ class Context(object):
                         trace[0].set_tag(HOSTNAME_KEY, hostname.get_hostname())
 
                     self._finished_spans = 0
+                    self._memory = 0
+                    # The flushed spans can not be merged anymore
+                    self._last_children = dict.fromkeys(self._last_children)
 
                     # Any open spans will remain as `self._trace`
                     # Any finished spans will get returned to be flushed
-                    self._trace = [t for t in self._trace if not t.finished]
+                    self._trace = open_spans
 
                     return finished_spans, sampled
             return None, None
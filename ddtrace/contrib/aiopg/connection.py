@@ -8,6 +8,7 @@ from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
 from ...ext import SpanTypes, sql
 from ...pin import Pin
 from ...settings import config
+from ..trace_utils import sql_resource
 
 
 class AIOTracedCursor(wrapt.ObjectProxy):
@@ -26,6 +27,7 @@ class AIOTracedCursor(wrapt.ObjectProxy):
             result = yield from method(*args, **kwargs)
             return result
         service = pin.service
+        resource = sql_resource(resource)
 
         with pin.tracer.trace(self._datadog_name, service=service,
                               resource=resource, span_type=SpanTypes.SQL) as s:
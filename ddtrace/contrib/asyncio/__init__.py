@@ -37,6 +37,19 @@ threads:
     * ``create_task(coro)``: creates a new asyncio ``Task`` that inherits the
       current active ``Context`` so that generated traces in the new task are
       attached to the main trace
+
+The health of the event loop can be monitored with ``loop_monitor``::
+
+    from ddtrace.contrib.asyncio import loop_monitor
+
+    loop_monitor.start(loop)
+
+It reports the event loop lag, the callbacks blocking the event loop for
+longer than a threshold and the delay before new tasks start running in the
+runtime metrics, and adds the blocking and delay times to the active spans.
+The heartbeat interval and the slow callback threshold, in seconds, can be set
+with ``DD_ASYNCIO_LOOP_MONITOR_INTERVAL`` (default: ``0.1``) and
+``DD_ASYNCIO_SLOW_CALLBACK_THRESHOLD`` (default: ``0.1``).
 """
 from ...utils.importlib import require_modules
 
@@ -55,6 +68,14 @@ with require_modules(required_modules) as missing_modules:
             context_provider = AsyncioContextProvider()
 
         from .helpers import set_call_context, ensure_future, run_in_executor
+        from .monitor import loop_monitor
         from .patch import patch
 
-        __all__ = ["context_provider", "set_call_context", "ensure_future", "run_in_executor", "patch"]
+        __all__ = [
+            "context_provider",
+            "set_call_context",
+            "ensure_future",
+            "run_in_executor",
+            "loop_monitor",
+            "patch",
+        ]
@@ -0,0 +1,217 @@
+"""
+Monitor the health of asyncio event loops.
+
+The monitor measures:
+
+* the event loop lag, using a heartbeat callback scheduled at a fixed interval: the lag is how late the heartbeat runs;
+* the callbacks that block the event loop for longer than a threshold, with the qualified name of the callback or of
+  the coroutine of the task;
+* the delay between the creation of a task with ``create_task`` and the first time it runs.
+
+The statistics are reported by the runtime metrics. The task delay is also added to the ``asyncio.task_delay_ns``
+metric of the span active when the task was created. When contextvars are available, the time spent in slow callbacks
+is added to the ``asyncio.blocked_ns`` metric of the span active in the callback, and the callback name is set as the
+``asyncio.slow_callback`` tag.
+
+The slow callbacks and task delays are only measured on event loops based on ``asyncio.BaseEventLoop``.
+"""
+import functools
+import weakref
+
+from ... import compat
+from ...internal.histogram import DurationHistogram
+from ...internal.logger import get_logger
+from ...utils.formats import get_env
+from ...vendor import wrapt
+
+
+log = get_logger(__name__)
+
+SLOW_CALLBACK_KEY = "asyncio.slow_callback"
+BLOCKED_KEY = "asyncio.blocked_ns"
+TASK_DELAY_KEY = "asyncio.task_delay_ns"
+
+
+def _callback_name(callback):
+    """Return the qualified name of a callback, or of the coroutine of the task it runs."""
+    task = getattr(callback, "__self__", None)
+    if task is not None and hasattr(task, "_coro"):
+        callback = task._coro
+    while isinstance(callback, functools.partial):
+        callback = callback.func
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class LoopMonitor(object):
+    """Measure event loop lag, slow callbacks and task scheduling delays."""
+
+    def __init__(self, tracer=None, interval=None, slow_callback_threshold=None):
+        """
+        :param tracer: The tracer used to find the active spans. Defaults to the global tracer.
+        :param interval: The interval between heartbeats, in seconds.
+        :param slow_callback_threshold: The duration in seconds over which a callback is reported as slow.
+        """
+        self.tracer = tracer
+        self.interval = (
+            float(get_env("asyncio", "loop_monitor_interval", default=0.1)) if interval is None else interval
+        )
+        self.slow_callback_threshold = (
+            float(get_env("asyncio", "slow_callback_threshold", default=0.1))
+            if slow_callback_threshold is None
+            else slow_callback_threshold
+        )
+        self.lag = DurationHistogram()
+        self.slow_callbacks = DurationHistogram()
+        self.task_delay = DurationHistogram()
+        self._loops = []
+        # {handle running the first step of a task: (creation time in nanoseconds, span active at creation)}
+        # DEV: handles of tasks cancelled before running, or left in a closed loop, are never run: do not keep them
+        self._task_handles = weakref.WeakKeyDictionary()
+
+    @property
+    def running(self):
+        return bool(self._loops)
+
+    def snapshot(self):
+        """Return a copy of the lag, slow callbacks and task delay statistics."""
+        return self.lag.copy(), self.slow_callbacks.copy(), self.task_delay.copy()
+
+    def start(self, loop=None):
+        """Start monitoring an event loop.
+
+        :param loop: The event loop to monitor. Defaults to the current event loop.
+        """
+        import asyncio
+
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        if loop in self._loops:
+            return
+        if not self._loops:
+            _add_monitor(self, asyncio)
+        self._loops.append(loop)
+        loop.call_soon_threadsafe(self._schedule_heartbeat, loop)
+
+    def stop(self):
+        """Stop monitoring all the event loops."""
+        if self._loops:
+            self._loops = []
+            _remove_monitor(self)
+        self._task_handles.clear()
+
+    def _schedule_heartbeat(self, loop):
+        if loop in self._loops and not loop.is_closed():
+            loop.call_later(self.interval, self._heartbeat, loop, loop.time() + self.interval)
+
+    def _heartbeat(self, loop, expected):
+        self.lag.add(max(0, int((loop.time() - expected) * 1e9)))
+        self._schedule_heartbeat(loop)
+
+    def _record_task(self, handle, created_ns):
+        self._task_handles[handle] = (created_ns, self._active_span())
+
+    def _record_handle(self, handle, start, end):
+        task_handle = self._task_handles.pop(handle, None)
+        if task_handle is not None:
+            created_ns, span = task_handle
+            delay = start - created_ns
+            self.task_delay.add(delay)
+            self._add_span_metric(span, TASK_DELAY_KEY, delay)
+
+        duration = end - start
+        if duration >= self.slow_callback_threshold * 1e9:
+            self.slow_callbacks.add(duration)
+            name = _callback_name(handle._callback)
+            log.debug("Executing %s blocked the event loop for %.3f seconds", name, duration / 1e9)
+            # The span is only reachable through the context the handle ran in
+            context = getattr(handle, "_context", None)
+            if context is not None:
+                span = context.run(self._active_span)
+                if self._add_span_metric(span, BLOCKED_KEY, duration):
+                    span.set_tag(SLOW_CALLBACK_KEY, name)
+
+    @staticmethod
+    def _add_span_metric(span, key, value):
+        """Add a value to a metric of a span, if it is not finished yet."""
+        if span is None or span.finished:
+            return False
+        span.set_metric(key, (span.get_metric(key) or 0) + value)
+        return True
+
+    def _active_span(self):
+        tracer = self.tracer
+        if tracer is None:
+            from ... import tracer
+        if not tracer.context_provider._has_active_context():
+            return None
+        return tracer.context_provider.active().get_current_span()
+
+
+# The running monitors share a single patch of asyncio, removed when the last one stops
+_monitors = []
+_originals = []
+
+
+def _add_monitor(monitor, asyncio):
+    if not _monitors:
+        for owner, name, wrapper in (
+            (asyncio.events.Handle, "_run", _run_handle),
+            (asyncio.BaseEventLoop, "create_task", _create_task),
+        ):
+            wrapped = wrapt.FunctionWrapper(getattr(owner, name), wrapper)
+            _originals.append((owner, name, owner.__dict__.get(name), wrapped))
+            setattr(owner, name, wrapped)
+    _monitors.append(monitor)
+
+
+def _remove_monitor(monitor):
+    _monitors.remove(monitor)
+    if _monitors:
+        return
+    for owner, name, original, wrapped in reversed(_originals):
+        # Leave the wrapper in place if something patched the method after us: it does nothing once stopped
+        if owner.__dict__.get(name) is not wrapped:
+            continue
+        if original is None:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+    del _originals[:]
+
+
+def _loop_monitors(loop):
+    """Return the monitors of an event loop."""
+    return [monitor for monitor in _monitors if loop in monitor._loops]
+
+
+def _create_task(wrapped, instance, args, kwargs):
+    created_ns = compat.monotonic_ns()
+    task = wrapped(*args, **kwargs)
+    monitors = _loop_monitors(instance)
+    if monitors:
+        # The first step of the task has just been scheduled by the task constructor
+        ready = getattr(instance, "_ready", None)
+        if ready:
+            for monitor in monitors:
+                monitor._record_task(ready[-1], created_ns)
+    return task
+
+
+def _run_handle(wrapped, instance, args, kwargs):
+    monitors = _loop_monitors(getattr(instance, "_loop", None))
+    if not monitors:
+        return wrapped(*args, **kwargs)
+
+    start = compat.monotonic_ns()
+    try:
+        return wrapped(*args, **kwargs)
+    finally:
+        end = compat.monotonic_ns()
+        for monitor in monitors:
+            try:
+                monitor._record_handle(instance, start, end)
+            except Exception:
+                log.debug("Unable to record the duration of %r", instance, exc_info=True)
+
+
+loop_monitor = LoopMonitor()
@@ -8,6 +8,7 @@ import botocore.client
 
 # project
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
+from ...internal import compression
 from ...pin import Pin
 from ...ext import SpanTypes, http, aws
 from ...utils.formats import deep_getattr
@@ -43,8 +44,11 @@ def patched_api_call(original_func, instance, args, kwargs):
         return original_func(*args, **kwargs)
 
     endpoint_name = deep_getattr(instance, '_endpoint._endpoint_prefix')
+    span_name = '{}.command'.format(endpoint_name)
+    # The span names depend on the endpoints: register them as they are used
+    compression.register(span_name, 'botocore')
 
-    with pin.tracer.trace('{}.command'.format(endpoint_name),
+    with pin.tracer.trace(span_name,
                           service='{}.{}'.format(pin.service, endpoint_name),
                           span_type=SpanTypes.HTTP) as span:
         span.set_tag(SPAN_MEASURED_KEY)
@@ -9,7 +9,7 @@ from ...pin import Pin
 from ...settings import config
 from ...utils.formats import asbool, get_env
 from ...vendor import wrapt
-from ..trace_utils import ext_service, iswrapped
+from ..trace_utils import SpanTemplate, ext_service, get_span_template, iswrapped, sql_resource
 
 
 log = get_logger(__name__)
@@ -25,7 +25,9 @@ class TracedCursor(wrapt.ObjectProxy):
 
     def __init__(self, cursor, pin, cfg):
         super(TracedCursor, self).__init__(cursor)
-        pin.onto(self)
+        # DEV: Share the pin of the connection instead of retargeting it with `pin.onto(self)`, which would clone a new
+        #   pin for each cursor: the span templates of the pin are built once per connection.
+        self._self_datadog_pin = pin
         name = pin.app or 'sql'
         self._self_datadog_name = '{}.query'.format(name)
         self._self_last_execute_operation = None
@@ -36,34 +38,23 @@ class TracedCursor(wrapt.ObjectProxy):
         Internal function to trace the call to the underlying cursor method
         :param method: The callable to be wrapped
         :param name: The name of the resulting span.
-        :param resource: The sql query. Sql queries are obfuscated on the agent side.
+        :param resource: The sql query. Normalized if SQL normalization is enabled, obfuscated by the agent otherwise.
         :param extra_tags: A dict of tags to store into the span's meta
         :param args: The args that will be passed as positional args to the wrapped method
         :param kwargs: The args that will be passed as kwargs to the wrapped method
         :return: The result of the wrapped method invocation
         """
-        pin = Pin.get_from(self)
+        # DEV: `Pin.get_from` would look for `__getddpin__` on the wrapped cursor first
+        pin = getattr(self, "_self_datadog_pin", None)
         if not pin or not pin.enabled():
             return method(*args, **kwargs)
-        measured = name == self._self_datadog_name
-        cfg = _get_config(self._self_config)
 
-        with pin.tracer.trace(
-            name, service=ext_service(pin, cfg), resource=resource, span_type=SpanTypes.SQL
-        ) as s:
-            if measured:
-                s.set_tag(SPAN_MEASURED_KEY)
+        template = get_span_template(pin, name, self._build_span_template)
+        with template.trace(pin.tracer, resource=sql_resource(resource, pin.app)) as s:
             # No reason to tag the query since it is set as the resource by the agent. See:
             # https://github.com/DataDog/datadog-trace-agent/blob/bda1ebbf170dd8c5879be993bdd4dbae70d10fda/obfuscate/sql.go#L232
-            s.set_tags(pin.tags)
-            s.set_tags(extra_tags)
-
-            # set analytics sample rate if enabled but only for non-FetchTracedCursor
-            if not isinstance(self, FetchTracedCursor):
-                s.set_tag(
-                    ANALYTICS_SAMPLE_RATE_KEY,
-                    config.dbapi2.get_analytics_sample_rate()
-                )
+            if extra_tags:
+                s.set_tags(extra_tags)
 
             try:
                 return method(*args, **kwargs)
@@ -77,6 +68,18 @@ class TracedCursor(wrapt.ObjectProxy):
                 if row_count and row_count >= 0:
                     s.set_tag(sql.ROWS, row_count)
 
+    def _build_span_template(self, pin, name):
+        tags = {}
+        if name == self._self_datadog_name:
+            tags[SPAN_MEASURED_KEY] = True
+        if pin.tags:
+            tags.update(pin.tags)
+        # set analytics sample rate if enabled but only for non-FetchTracedCursor
+        if not isinstance(self, FetchTracedCursor):
+            tags[ANALYTICS_SAMPLE_RATE_KEY] = config.dbapi2.get_analytics_sample_rate()
+        cfg = _get_config(self._self_config)
+        return SpanTemplate(name, ext_service(pin, cfg), SpanTypes.SQL, tags)
+
     def executemany(self, query, *args, **kwargs):
         """ Wraps the cursor.executemany method"""
         self._self_last_execute_operation = query
@@ -212,10 +215,9 @@ class TracedConnection(wrapt.ObjectProxy):
                 return r
             else:
                 pin = Pin.get_from(self)
-                cfg = _get_config(self._self_config)
                 if not pin:
                     return r
-                return self._self_cursor_cls(r, pin, cfg)
+                return self._self_cursor_cls(r, pin, self._self_config)
         else:
             # Otherwise r is some other object, so maintain the functionality
             # of the original.
@@ -225,21 +227,23 @@ class TracedConnection(wrapt.ObjectProxy):
         pin = Pin.get_from(self)
         if not pin or not pin.enabled():
             return method(*args, **kwargs)
-        cfg = _get_config(self._self_config)
 
-        with pin.tracer.trace(name, service=ext_service(pin, cfg)) as s:
-            s.set_tags(pin.tags)
-            s.set_tags(extra_tags)
+        template = get_span_template(pin, name, self._build_span_template)
+        with template.trace(pin.tracer) as s:
+            if extra_tags:
+                s.set_tags(extra_tags)
 
             return method(*args, **kwargs)
 
+    def _build_span_template(self, pin, name):
+        return SpanTemplate(name, ext_service(pin, _get_config(self._self_config)), tags=pin.tags)
+
     def cursor(self, *args, **kwargs):
         cursor = self.__wrapped__.cursor(*args, **kwargs)
         pin = Pin.get_from(self)
-        cfg = _get_config(self._self_config)
         if not pin:
             return cursor
-        return self._self_cursor_cls(cursor, pin, cfg)
+        return self._self_cursor_cls(cursor, pin, self._self_config)
 
     def commit(self, *args, **kwargs):
         span_name = '{}.{}'.format(self._self_datadog_name, 'commit')
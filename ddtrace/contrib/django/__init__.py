@@ -79,6 +79,27 @@ Configuration
 
    Default: ``True``
 
+.. py:data:: ddtrace.config.django['collapse_middleware']
+
+   Whether or not to time the middleware hooks instead of tracing each of them.
+
+   The exclusive duration of each hook, in nanoseconds, is added to the
+   ``django.middleware.<middleware>.<hook>.duration_ns`` metric of the ``django.request`` span and a
+   ``django.middleware`` span is only created for the hooks slower than ``middleware_span_threshold``.
+
+   Can also be enabled with the ``DD_DJANGO_COLLAPSE_MIDDLEWARE`` environment variable.
+
+   Default: ``False``
+
+.. py:data:: ddtrace.config.django['middleware_span_threshold']
+
+   The duration in seconds over which a ``django.middleware`` span is created for a hook when the
+   middleware is collapsed.
+
+   Can also be configured via the ``DD_DJANGO_MIDDLEWARE_SPAN_THRESHOLD`` environment variable.
+
+   Default: ``0.1``
+
 .. py:data:: ddtrace.config.django['instrument_databases']
 
    Whether or not to instrument databases.
@@ -6,11 +6,12 @@ Django internals are instrumented via normal `patch()`.
 `django.apps.registry.Apps.populate` is patched to add instrumentation for any
 specific Django apps like Django Rest Framework (DRF).
 """
+from collections import namedtuple
 import sys
 
 from inspect import isclass, isfunction, getmro
 
-from ddtrace import config, Pin
+from ddtrace import compat, config, Pin
 from ddtrace.vendor import debtcollector, six, wrapt
 from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY
 from ddtrace.contrib import func_name, dbapi
@@ -19,6 +20,7 @@ from ddtrace.http import store_request_headers, store_response_headers
 from ddtrace.internal.logger import get_logger
 from ddtrace.propagation.http import HTTPPropagator
 from ddtrace.propagation.utils import from_wsgi_header
+from ddtrace.utils.cache import LRUCache
 from ddtrace.utils.formats import asbool, get_env
 
 from .. import trace_utils
@@ -37,6 +39,8 @@ config._add(
         database_service_name=get_env("django", "database_service_name", default=""),
         distributed_tracing_enabled=True,
         instrument_middleware=asbool(get_env("django", "instrument_middleware", default=True)),
+        collapse_middleware=asbool(get_env("django", "collapse_middleware", default=False)),
+        middleware_span_threshold=float(get_env("django", "middleware_span_threshold", default=0.1)),
         instrument_databases=True,
         instrument_caches=True,
         analytics_enabled=None,  # None allows the value to be overridden by the global config
@@ -49,8 +53,17 @@ config._add(
 
 propagator = HTTPPropagator()
 
+# What is needed from the resolution of a request path to name and tag the request span
+_Resolution = namedtuple("_Resolution", ["handler", "route", "view_name", "namespaces", "app_names"])
+
+# {(urlconf, path): resolution of the path or None if it is not found}
+_resolutions = LRUCache(maxsize=1024)
+
 
 def patch_conn(django, conn):
+    # The pin of the cursors of the connection, shared so that their span templates are built once
+    cursor_pins = {}
+
     def cursor(django, pin, func, instance, args, kwargs):
         alias = getattr(conn, "alias", "default")
 
@@ -66,8 +79,12 @@ def patch_conn(django, conn):
             "django.db.vendor": vendor,
             "django.db.alias": alias,
         }
-        pin = Pin(service, tags=tags, tracer=pin.tracer, app=prefix)
-        return dbapi.TracedCursor(func(*args, **kwargs), pin, config.django)
+        key = (service, vendor, alias, pin.tracer)
+        cursor_pin = cursor_pins.get(key)
+        if cursor_pin is None:
+            cursor_pins.clear()
+            cursor_pin = cursor_pins[key] = Pin(service, tags=tags, tracer=pin.tracer, app=prefix)
+        return dbapi.TracedCursor(func(*args, **kwargs), cursor_pin, config.django)
 
     if not isinstance(conn.cursor, wrapt.ObjectProxy):
         conn.cursor = wrapt.FunctionWrapper(conn.cursor, trace_utils.with_traced_module(cursor)(django))
@@ -239,6 +256,71 @@ def traced_process_exception(django, name, resource=None):
     return trace_utils.with_traced_module(wrapped)(django)
 
 
+class _MiddlewareTimer(object):
+    """Time the middleware hooks of a request instead of tracing them.
+
+    The duration of each hook is added to a metric of the request span. The durations
+    are exclusive: the time spent in the hooks of the next middleware and in the view,
+    called from ``__call__``, is not counted. A ``django.middleware`` span is created
+    only for the hooks slower than ``config.django.middleware_span_threshold``.
+    """
+
+    __slots__ = ("tracer", "span", "_stack")
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+        # [start time in nanoseconds, time spent in nested hooks in nanoseconds] of each running hook
+        self._stack = []
+
+    def time(self, func, args, kwargs, resource=None):
+        """Call a hook and record its exclusive duration, or only exclude it from the calling hook if no resource."""
+        self._stack.append([compat.monotonic_ns(), 0])
+        try:
+            return func(*args, **kwargs)
+        finally:
+            start, nested = self._stack.pop()
+            duration = compat.monotonic_ns() - start
+            if self._stack:
+                self._stack[-1][1] += duration
+            if resource is not None:
+                self._record(resource, duration, duration - nested)
+
+    def _record(self, resource, duration, exclusive):
+        key = "django.middleware.{0}.duration_ns".format(resource)
+        self.span.set_metric(key, (self.span.get_metric(key) or 0) + exclusive)
+
+        if exclusive >= config.django.middleware_span_threshold * 1e9:
+            span = self.tracer.start_span("django.middleware", child_of=self.span, resource=resource)
+            span.start_ns -= duration
+            span.finish()
+
+
+def traced_middleware(django, resource, traced):
+    """Returns a function timing a middleware hook if the middleware is collapsed or else tracing it with `traced`."""
+
+    def wrapped(func, instance, args, kwargs):
+        request = args[0] if args else kwargs.get("request")
+        timer = getattr(request, "_datadog_middleware_timer", None)
+        if timer is None:
+            return traced(func, instance, args, kwargs)
+        return timer.time(func, args, kwargs, resource)
+
+    return wrapped
+
+
+def timed_view_response(func, instance, args, kwargs):
+    """Exclude django.core.handlers.base.BaseHandler._get_response(), calling the view, from the middleware durations.
+
+    This is called by the innermost middleware, whose duration would otherwise include the view.
+    """
+    request = args[0] if args else kwargs.get("request")
+    timer = getattr(request, "_datadog_middleware_timer", None)
+    if timer is None:
+        return func(*args, **kwargs)
+    return timer.time(func, args, kwargs)
+
+
 @trace_utils.with_traced_module
 def traced_load_middleware(django, pin, func, instance, args, kwargs):
     """Patches django.core.handlers.base.BaseHandler.load_middleware to instrument all middlewares."""
@@ -268,7 +350,10 @@ def traced_load_middleware(django, pin, func, instance, args, kwargs):
             def wrapped_factory(func, instance, args, kwargs):
                 # r is the middleware handler function returned from the factory
                 r = func(*args, **kwargs)
-                return wrapt.FunctionWrapper(r, traced_func(django, "django.middleware", resource=mw_path))
+                return wrapt.FunctionWrapper(
+                    r,
+                    traced_middleware(django, mw_path, traced_func(django, "django.middleware", resource=mw_path)),
+                )
 
             trace_utils.wrap(base, attr, wrapped_factory)
 
@@ -282,19 +367,101 @@ def traced_load_middleware(django, pin, func, instance, args, kwargs):
                 "__call__",
             ]:
                 if hasattr(mw, hook) and not trace_utils.iswrapped(mw, hook):
+                    res = mw_path + ".{0}".format(hook)
                     trace_utils.wrap(
-                        mw, hook, traced_func(django, "django.middleware", resource=mw_path + ".{0}".format(hook))
+                        mw, hook, traced_middleware(django, res, traced_func(django, "django.middleware", resource=res))
                     )
             # Do a little extra for `process_exception`
             if hasattr(mw, "process_exception") and not trace_utils.iswrapped(mw, "process_exception"):
                 res = mw_path + ".{0}".format("process_exception")
                 trace_utils.wrap(
-                    mw, "process_exception", traced_process_exception(django, "django.middleware", resource=res)
+                    mw,
+                    "process_exception",
+                    traced_middleware(django, res, traced_process_exception(django, "django.middleware", resource=res)),
                 )
 
     return func(*args, **kwargs)
 
 
+def _resolution_from_match(django, urlconf, resolver_match):
+    handler = func_name(resolver_match.func)
+    route = None
+    # In Django >= 2.2.0 we can access the original route or regex pattern
+    if django.VERSION >= (2, 2, 0) and not config.django.use_handler_resource_format:
+        # TODO: Validate if `resolver.pattern.regex.pattern` is available on django<2.2
+        route = resolver_match.route or utils.get_django_2_route(get_resolver(urlconf), resolver_match)
+    return _Resolution(
+        handler, route, resolver_match.view_name, resolver_match.namespaces, getattr(resolver_match, "app_names", None)
+    )
+
+
+def _resolve(django, request):
+    """Return the resolution of the path of a request, or None if the path is not found.
+
+    The resolutions are cached by urlconf and path.
+    """
+    urlconf = getattr(request, "urlconf", None)
+    key = (urlconf, request.path_info)
+    try:
+        return _resolutions[key]
+    except KeyError:
+        pass
+
+    if django.VERSION < (1, 10, 0):
+        error_type_404 = django.core.urlresolvers.Resolver404
+    else:
+        error_type_404 = django.urls.exceptions.Resolver404
+
+    try:
+        resolver_match = get_resolver(urlconf).resolve(request.path_info)
+    except error_type_404:
+        resolution = None
+    else:
+        resolution = _resolution_from_match(django, urlconf, resolver_match)
+    _resolutions[key] = resolution
+    return resolution
+
+
+def _set_resolution_tags(django, span, request):
+    """Set the resource, route and view tags of the request span.
+
+    The resolution Django made of the request path is used when available, otherwise
+    the path is resolved again, e.g. for requests not found or answered by a middleware.
+    """
+    try:
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is not None:
+            resolution = _resolution_from_match(django, getattr(request, "urlconf", None), resolver_match)
+        else:
+            resolution = _resolve(django, request)
+    except Exception:
+        log.debug(
+            "Failed to resolve request path %r with path info %r",
+            request,
+            getattr(request, "path_info", "not-set"),
+            exc_info=True,
+        )
+        return
+
+    if resolution is None:
+        # Normalize all 404 requests into a single resource name
+        # DEV: This is for potential cardinality issues
+        span.resource = "{0} 404".format(request.method)
+        return
+
+    if resolution.route is not None:
+        span.resource = "{0} {1}".format(request.method, resolution.route)
+        if resolution.route:
+            span.set_tag("http.route", resolution.route)
+    else:
+        span.resource = "{0} {1}".format(request.method, resolution.handler)
+
+    span.set_tag("django.view", resolution.view_name)
+    utils.set_tag_array(span, "django.namespace", resolution.namespaces)
+    # Django >= 2.0.0
+    utils.set_tag_array(span, "django.app", resolution.app_names)
+
+
 @trace_utils.with_traced_module
 def traced_get_response(django, pin, func, instance, args, kwargs):
     """Trace django.core.handlers.base.BaseHandler.get_response() (or other implementations).
@@ -311,91 +478,39 @@ def traced_get_response(django, pin, func, instance, args, kwargs):
 
     try:
         request_headers = request.META
+        int_settings = config.django.snapshot()
 
-        if config.django.distributed_tracing_enabled:
+        if int_settings.distributed_tracing_enabled:
             context = propagator.extract(request_headers)
             if context.trace_id:
                 pin.tracer.context_provider.activate(context)
-
-        # Determine the resolver and resource name for this request
-        resolver = get_resolver(getattr(request, "urlconf", None))
-
-        if django.VERSION < (1, 10, 0):
-            error_type_404 = django.core.urlresolvers.Resolver404
-        else:
-            error_type_404 = django.urls.exceptions.Resolver404
-
-        route = None
-        resolver_match = None
-        resource = request.method
-        try:
-            # Resolve the requested url and build resource name pieces
-            resolver_match = resolver.resolve(request.path_info)
-            handler, _, _ = resolver_match
-            handler = func_name(handler)
-            urlpattern = ""
-            resource_format = None
-
-            if config.django.use_handler_resource_format:
-                resource_format = "{method} {handler}"
-            else:
-                # In Django >= 2.2.0 we can access the original route or regex pattern
-                # TODO: Validate if `resolver.pattern.regex.pattern` is available on django<2.2
-                if django.VERSION >= (2, 2, 0):
-                    route = utils.get_django_2_route(resolver, resolver_match)
-                    resource_format = "{method} {urlpattern}"
-                else:
-                    resource_format = "{method} {handler}"
-
-                if route is not None:
-                    urlpattern = route
-
-            resource = resource_format.format(method=request.method, urlpattern=urlpattern, handler=handler)
-
-        except error_type_404:
-            # Normalize all 404 requests into a single resource name
-            # DEV: This is for potential cardinality issues
-            resource = "{0} 404".format(request.method)
-        except Exception:
-            log.debug(
-                "Failed to resolve request path %r with path info %r",
-                request,
-                getattr(request, "path_info", "not-set"),
-                exc_info=True,
-            )
     except Exception:
         log.debug("Failed to trace django request %r", args, exc_info=True)
         return func(*args, **kwargs)
     else:
         with pin.tracer.trace(
             "django.request",
-            resource=resource,
+            resource=request.method,
             service=trace_utils.int_service(pin, config.django),
             span_type=SpanTypes.HTTP,
         ) as span:
-            analytics_sr = config.django.get_analytics_sample_rate(use_global_config=True)
-            if analytics_sr is not None:
-                span.set_tag(ANALYTICS_SAMPLE_RATE_KEY, analytics_sr)
+            if int_settings.analytics_sample_rate is not None:
+                span.set_tag(ANALYTICS_SAMPLE_RATE_KEY, int_settings.analytics_sample_rate)
 
-            if config.django.http.trace_query_string:
+            if int_settings.trace_query_string:
                 span.set_tag(http.QUERY_STRING, request_headers["QUERY_STRING"])
 
-            # Not a 404 request
-            if resolver_match:
-                span.set_tag("django.view", resolver_match.view_name)
-                utils.set_tag_array(span, "django.namespace", resolver_match.namespaces)
-
-                # Django >= 2.0.0
-                if hasattr(resolver_match, "app_names"):
-                    utils.set_tag_array(span, "django.app", resolver_match.app_names)
-
-            if route:
-                span.set_tag("http.route", route)
-
             # Set HTTP Request tags
             span.set_tag(http.URL, utils.get_request_uri(request))
 
-            response = func(*args, **kwargs)
+            if int_settings.collapse_middleware:
+                request._datadog_middleware_timer = _MiddlewareTimer(pin.tracer, span)
+
+            try:
+                response = func(*args, **kwargs)
+            finally:
+                # DEV: the resource is set once Django resolved the request path itself
+                _set_resolution_tags(django, span, request)
 
             # Note: this call must be done after the function call because
             # some attributes (like `user`) are added to the request through
@@ -554,6 +669,9 @@ def _patch(django):
 
     if config.django.instrument_middleware:
         trace_utils.wrap(django, "core.handlers.base.BaseHandler.load_middleware", traced_load_middleware(django))
+        # DEV: the middleware chain calls _get_response since Django 1.10
+        if hasattr(django.core.handlers.base.BaseHandler, "_get_response"):
+            trace_utils.wrap(django, "core.handlers.base.BaseHandler._get_response", timed_view_response)
 
     trace_utils.wrap(django, "core.handlers.base.BaseHandler.get_response", traced_get_response(django))
 
@@ -591,6 +709,7 @@ def _unpatch(django):
     trace_utils.unwrap(django.apps.registry.Apps, "populate")
     trace_utils.unwrap(django.core.handlers.base.BaseHandler, "lotrace_utils.ad_middleware")
     trace_utils.unwrap(django.core.handlers.base.BaseHandler, "getrace_utils.t_response")
+    trace_utils.unwrap(django.core.handlers.base.BaseHandler, "_get_response")
     trace_utils.unwrap(django.template.base.Template, "render")
     trace_utils.unwrap(django.conf.urls.static, "static")
     trace_utils.unwrap(django.conf.urls, "url")
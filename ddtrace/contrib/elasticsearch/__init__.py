@@ -18,6 +18,13 @@
     es = Elasticsearch(port=ELASTICSEARCH_CONFIG['port'])
     Pin.override(es.transport, service='elasticsearch-videos')
     es.indices.create(index='videos', ignore=400)
+
+The resource of the spans is the method and the URL of the requests, with the
+IDs and the parts of the index names matching the regular expressions of the
+``ddtrace.config.elasticsearch['quantize_index_patterns']`` setting replaced by
+``?``. It defaults to ``['[0-9]{2,}']`` to group timestamped indexes, and can
+also be set with the ``DD_ELASTICSEARCH_QUANTIZE_INDEX_PATTERNS`` environment
+variable as a list of regular expressions separated by spaces.
 """
 from ...utils.importlib import require_modules
 
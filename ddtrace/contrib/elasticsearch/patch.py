@@ -2,7 +2,7 @@ from importlib import import_module
 
 from ddtrace.vendor.wrapt import wrap_function_wrapper as _w
 
-from .quantize import quantize
+from .quantize import quantize_resource
 
 from ...compat import urlencode
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
@@ -78,7 +78,7 @@ def _get_perform_request(elasticsearch):
             # set analytics sample rate
             span.set_tag(ANALYTICS_SAMPLE_RATE_KEY, config.elasticsearch.get_analytics_sample_rate())
 
-            span = quantize(span)
+            span.resource = quantize_resource(method, url)
 
             try:
                 result = func(*args, **kwargs)
@@ -1,6 +1,9 @@
 import re
 
 from ...ext import elasticsearch as metadata
+from ...settings import config
+from ...utils.cache import LRUCache
+from ...utils.formats import get_env
 
 # Replace any ID
 ID_REGEXP = re.compile(r"/([0-9]+)([/\?]|$)")
@@ -11,6 +14,69 @@ ID_PLACEHOLDER = r"/?\2"
 INDEX_REGEXP = re.compile(r"[0-9]{2,}")
 INDEX_PLACEHOLDER = r"?"
 
+config._add(
+    "elasticsearch",
+    dict(
+        # DEV: Separated by spaces since regular expressions often contain commas
+        quantize_index_patterns=get_env(
+            "elasticsearch", "quantize_index_patterns", default=INDEX_REGEXP.pattern
+        ).split(),
+    ),
+)
+
+
+class Quantizer(object):
+    """Quantize the URLs of requests into resources, caching the resources by method and URL.
+
+    The IDs and the parts of the URL matching the ``quantize_index_patterns`` setting of the integration are
+    replaced in a single pass of a regular expression combining them, compiled again when the setting changes.
+    """
+
+    def __init__(self, maxsize=1024):
+        self._resources = LRUCache(maxsize)
+        self._version = None
+        self._patterns = None
+        self._regexp = None
+
+    def _compile(self):
+        patterns = tuple(getattr(p, "pattern", p) for p in config.elasticsearch.get("quantize_index_patterns") or ())
+        if patterns != self._patterns:
+            # The IDs come first so that they take precedence, like when they were replaced before the indexes
+            self._regexp = re.compile(
+                "|".join([r"/(?P<_dd_id>[0-9]+)(?P<_dd_id_end>[/\?]|$)"] + ["(?:{})".format(p) for p in patterns])
+            )
+            self._patterns = patterns
+            self._resources.clear()
+        self._version = config._version
+
+    @staticmethod
+    def _replace(match):
+        if match.group("_dd_id") is not None:
+            return "/?" + match.group("_dd_id_end")
+        return INDEX_PLACEHOLDER
+
+    def resource(self, method, url):
+        """Return the resource of a request."""
+        if self._version != config._version:
+            self._compile()
+
+        key = (method, url)
+        try:
+            return self._resources[key]
+        except KeyError:
+            pass
+        quantized_url = self._regexp.sub(self._replace, url)
+        resource = self._resources[key] = "{method} {url}".format(method=method, url=quantized_url)
+        return resource
+
+
+_quantizer = Quantizer()
+
+
+def quantize_resource(method, url):
+    """Return the resource of an elasticsearch request, see `quantize`."""
+    return _quantizer.resource(method, url)
+
 
 def quantize(span):
     """Quantize an elasticsearch span
@@ -19,16 +85,11 @@ def quantize(span):
     We do it based on the method + url, with some cleanup applied to the URL.
 
     The URL might a ID, but also it is common to have timestamped indexes.
-    While the first is easy to catch, the second should probably be configurable.
+    While the first is easy to catch, the second is configurable with the
+    ``quantize_index_patterns`` setting.
 
     All of this should probably be done in the Agent. Later.
     """
-    url = span.get_tag(metadata.URL)
-    method = span.get_tag(metadata.METHOD)
-
-    quantized_url = ID_REGEXP.sub(ID_PLACEHOLDER, url)
-    quantized_url = INDEX_REGEXP.sub(INDEX_PLACEHOLDER, quantized_url)
-
-    span.resource = "{method} {url}".format(method=method, url=quantized_url)
+    span.resource = quantize_resource(span.get_tag(metadata.METHOD), span.get_tag(metadata.URL))
 
     return span
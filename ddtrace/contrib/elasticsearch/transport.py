@@ -2,7 +2,7 @@
 #   `elasticsearch`, `elasticsearch1`, `elasticsearch2`, `elasticsearch5`, 'elasticsearch6'
 from .elasticsearch import elasticsearch
 
-from .quantize import quantize
+from .quantize import quantize_resource
 
 from ...constants import SPAN_MEASURED_KEY
 from ...utils.deprecation import deprecated
@@ -38,7 +38,7 @@ def get_traced_transport(datadog_tracer, datadog_service=DEFAULT_SERVICE):
                     s.set_tag(http.QUERY_STRING, urlencode(params))
                 if method == "GET":
                     s.set_tag(metadata.BODY, self.serializer.dumps(body))
-                s = quantize(s)
+                s.resource = quantize_resource(method, url)
 
                 try:
                     result = super(TracedTransport, self).perform_request(method, url, params=params, body=body)
@@ -262,9 +262,10 @@ def traced_wsgi_app(pin, wrapped, instance, args, kwargs):
     # Create a werkzeug request from the `environ` to make interacting with it easier
     # DEV: This executes before a request context is created
     request = werkzeug.Request(environ)
+    int_settings = config.flask.snapshot()
 
     # Configure distributed tracing
-    if config.flask.get('distributed_tracing_enabled', False):
+    if int_settings.distributed_tracing_enabled:
         propagator = HTTPPropagator()
         context = propagator.extract(request.headers)
         # Only need to activate the new context if something was propagated
@@ -284,9 +285,8 @@ def traced_wsgi_app(pin, wrapped, instance, args, kwargs):
     ) as s:
         s.set_tag(SPAN_MEASURED_KEY)
         # set analytics sample rate with global config enabled
-        sample_rate = config.flask.get_analytics_sample_rate(use_global_config=True)
-        if sample_rate is not None:
-            s.set_tag(ANALYTICS_SAMPLE_RATE_KEY, sample_rate)
+        if int_settings.analytics_sample_rate is not None:
+            s.set_tag(ANALYTICS_SAMPLE_RATE_KEY, int_settings.analytics_sample_rate)
 
         s.set_tag(FLASK_VERSION, flask_version_str)
 
@@ -315,7 +315,7 @@ def traced_wsgi_app(pin, wrapped, instance, args, kwargs):
                 s.set_tag(http.STATUS_CODE, code)
                 if 500 <= code < 600:
                     s.error = 1
-                elif code in config.flask.get('extra_error_codes', set()):
+                elif code in int_settings.extra_error_codes:
                     s.error = 1
                 return func(status_code, headers)
             return traced_start_response
@@ -325,7 +325,7 @@ def traced_wsgi_app(pin, wrapped, instance, args, kwargs):
         # DEV: Use `request.base_url` and not `request.url` to keep from leaking any query string parameters
         s.set_tag(http.URL, request.base_url)
         s.set_tag(http.METHOD, request.method)
-        if config.flask.trace_query_string:
+        if int_settings.trace_query_string:
             s.set_tag(http.QUERY_STRING, compat.to_unicode(request.query_string))
 
         return wrapped(environ, start_response)
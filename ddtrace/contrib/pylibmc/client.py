@@ -9,8 +9,10 @@ import pylibmc
 import ddtrace
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
 from ...ext import SpanTypes, memcached, net
+from ...internal import compression
 from ...internal.logger import get_logger
 from ...settings import config
+from ..trace_utils import SpanTemplate, get_span_template
 from .addrs import parse_addresses
 
 
@@ -20,6 +22,8 @@ _Client = pylibmc.Client
 
 log = get_logger(__name__)
 
+compression.register('memcached.cmd', 'pylibmc')
+
 
 class TracedClient(ObjectProxy):
     """ TracedClient is a proxy for a pylibmc.Client that times it's network operations. """
@@ -131,13 +135,8 @@ class TracedClient(ObjectProxy):
         if not pin or not pin.enabled():
             return self._no_span()
 
-        span = pin.tracer.trace(
-            'memcached.cmd',
-            service=pin.service,
-            resource=cmd_name,
-            span_type=SpanTypes.CACHE,
-        )
-        span.set_tag(SPAN_MEASURED_KEY)
+        template = get_span_template(pin, 'memcached.cmd', _build_span_template)
+        span = template.trace(pin.tracer, resource=cmd_name)
 
         try:
             self._tag_span(span)
@@ -153,8 +152,11 @@ class TracedClient(ObjectProxy):
             span.set_meta(net.TARGET_HOST, host)
             span.set_meta(net.TARGET_PORT, port)
 
+
+def _build_span_template(pin, name):
+    tags = {
+        SPAN_MEASURED_KEY: True,
         # set analytics sample rate
-        span.set_tag(
-            ANALYTICS_SAMPLE_RATE_KEY,
-            config.pylibmc.get_analytics_sample_rate()
-        )
+        ANALYTICS_SAMPLE_RATE_KEY: config.pylibmc.get_analytics_sample_rate(),
+    }
+    return SpanTemplate(name, pin.service, SpanTypes.CACHE, tags)
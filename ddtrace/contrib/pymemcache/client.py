@@ -16,12 +16,15 @@ from pymemcache.exceptions import (
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
 from ...compat import reraise
 from ...ext import SpanTypes, net, memcached as memcachedx
+from ...internal import compression
 from ...internal.logger import get_logger
 from ...pin import Pin
 from ...settings import config
 
 log = get_logger(__name__)
 
+compression.register(memcachedx.CMD, 'pymemcache')
+
 
 # keep a reference to the original unpatched clients
 _Client = Client
@@ -8,11 +8,13 @@ from ddtrace.vendor.wrapt import ObjectProxy
 
 # project
 import ddtrace
-from ...compat import iteritems
+from ...compat import iteritems, stringify
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
 from ...ext import SpanTypes, mongo as mongox, net as netx
 from ...internal.logger import get_logger
 from ...settings import config
+from ...utils.cache import LRUCache
+from ..trace_utils import SpanTemplate, get_span_template
 from .parse import parse_spec, parse_query, parse_msg
 
 # Original Client class
@@ -20,6 +22,9 @@ _MongoClient = pymongo.MongoClient
 
 log = get_logger(__name__)
 
+# {query shape: (`mongodb.query` tag, normalized query as JSON)}
+_normalized_queries = LRUCache(maxsize=1024)
+
 
 class TracedMongoClient(ObjectProxy):
 
@@ -69,16 +74,23 @@ class TracedTopology(ObjectProxy):
     def select_server(self, *args, **kwargs):
         s = self.__wrapped__.select_server(*args, **kwargs)
         if not isinstance(s, TracedServer):
-            s = TracedServer(s)
-        # Reattach the pin every time in case it changed since the initial patching
-        ddtrace.Pin.get_from(self).onto(s)
+            s = TracedServer(s, self)
         return s
 
 
 class TracedServer(ObjectProxy):
 
-    def __init__(self, server):
+    def __init__(self, server, topology):
         super(TracedServer, self).__init__(server)
+        # DEV: Share the pin of the topology instead of attaching it to each server, which would retarget it and drop
+        #   its span templates every time a server is selected. It is read every time in case it changed.
+        self._self_topology = topology
+
+    def __setddpin__(self, pin):
+        pin.onto(self._self_topology)
+
+    def __getddpin__(self):
+        return ddtrace.Pin.get_from(self._self_topology)
 
     def _datadog_trace_operation(self, operation):
         cmd = None
@@ -94,19 +106,14 @@ class TracedServer(ObjectProxy):
         if not cmd or not pin or not pin.enabled():
             return None
 
-        span = pin.tracer.trace('pymongo.cmd', span_type=SpanTypes.MONGODB, service=pin.service)
-        span.set_tag(SPAN_MEASURED_KEY)
+        template = get_span_template(pin, 'pymongo.cmd', _build_span_template)
+        span = template.trace(pin.tracer)
         span.set_tag(mongox.DB, cmd.db)
         span.set_tag(mongox.COLLECTION, cmd.coll)
         span.set_tags(cmd.tags)
 
         # set `mongodb.query` tag and resource for span
         _set_query_metadata(span, cmd)
-
-        # set analytics sample rate
-        sample_rate = config.pymongo.get_analytics_sample_rate()
-        if sample_rate is not None:
-            span.set_tag(ANALYTICS_SAMPLE_RATE_KEY, sample_rate)
         return span
 
     # Pymongo >= 3.9
@@ -161,8 +168,7 @@ class TracedServer(ObjectProxy):
     def get_socket(self, *args, **kwargs):
         with self.__wrapped__.get_socket(*args, **kwargs) as s:
             if not isinstance(s, TracedSocket):
-                s = TracedSocket(s)
-            ddtrace.Pin.get_from(self).onto(s)
+                s = TracedSocket(s, self)
             yield s
 
     @staticmethod
@@ -173,8 +179,16 @@ class TracedServer(ObjectProxy):
 
 class TracedSocket(ObjectProxy):
 
-    def __init__(self, socket):
+    def __init__(self, socket, server):
         super(TracedSocket, self).__init__(socket)
+        # DEV: Share the pin of the server, see `TracedServer`
+        self._self_server = server
+
+    def __setddpin__(self, pin):
+        pin.onto(self._self_server)
+
+    def __getddpin__(self):
+        return ddtrace.Pin.get_from(self._self_server)
 
     def command(self, dbname, spec, *args, **kwargs):
         cmd = None
@@ -212,12 +226,9 @@ class TracedSocket(ObjectProxy):
 
     def __trace(self, cmd):
         pin = ddtrace.Pin.get_from(self)
-        s = pin.tracer.trace(
-            'pymongo.cmd',
-            span_type=SpanTypes.MONGODB,
-            service=pin.service)
+        template = get_span_template(pin, 'pymongo.cmd', _build_span_template)
+        s = template.trace(pin.tracer)
 
-        s.set_tag(SPAN_MEASURED_KEY)
         if cmd.db:
             s.set_tag(mongox.DB, cmd.db)
         if cmd:
@@ -228,17 +239,20 @@ class TracedSocket(ObjectProxy):
         # set `mongodb.query` tag and resource for span
         _set_query_metadata(s, cmd)
 
-        # set analytics sample rate
-        s.set_tag(
-            ANALYTICS_SAMPLE_RATE_KEY,
-            config.pymongo.get_analytics_sample_rate()
-        )
-
         if self.address:
             set_address_tags(s, self.address)
         return s
 
 
+def _build_span_template(pin, name):
+    tags = {SPAN_MEASURED_KEY: True}
+    # set analytics sample rate
+    sample_rate = config.pymongo.get_analytics_sample_rate()
+    if sample_rate is not None:
+        tags[ANALYTICS_SAMPLE_RATE_KEY] = sample_rate
+    return SpanTemplate(name, pin.service, SpanTypes.MONGODB, tags)
+
+
 def normalize_filter(f=None):
     if f is None:
         return {}
@@ -267,6 +281,21 @@ def normalize_filter(f=None):
         return {}
 
 
+def _query_shape(f):
+    """Return a hashable value identifying the normalized filter of a query.
+
+    Filters with the same keys and nesting, whatever their values, have the same shape.
+    """
+    if isinstance(f, list):
+        return (None, tuple(_query_shape(s) for s in f))
+    elif isinstance(f, dict):
+        return tuple(
+            (k, '?' if k == '$in' or k == '$nin' else _query_shape(v) if isinstance(v, (list, dict)) else '?')
+            for k, v in iteritems(f)
+        )
+    return None
+
+
 def set_address_tags(span, address):
     # the address is only set after the cursor is done.
     if address:
@@ -277,11 +306,15 @@ def set_address_tags(span, address):
 def _set_query_metadata(span, cmd):
     """ Sets span `mongodb.query` tag and resource given command query """
     if cmd.query:
-        nq = normalize_filter(cmd.query)
+        shape = _query_shape(cmd.query)
+        try:
+            nq, q = _normalized_queries[shape]
+        except KeyError:
+            normalized = normalize_filter(cmd.query)
+            # needed to dump json so we don't get unicode
+            # dict keys like {u'foo':'bar'}
+            nq, q = _normalized_queries[shape] = stringify(normalized), json.dumps(normalized)
         span.set_tag('mongodb.query', nq)
-        # needed to dump json so we don't get unicode
-        # dict keys like {u'foo':'bar'}
-        q = json.dumps(nq)
         span.resource = '{} {} {}'.format(cmd.name, cmd.coll, q)
     else:
         span.resource = '{} {}'.format(cmd.name, cmd.coll)
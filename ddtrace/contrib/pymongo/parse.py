@@ -1,11 +1,5 @@
-import ctypes
 import struct
 
-# 3p
-import bson
-from bson.codec_options import CodecOptions
-from bson.son import SON
-
 # project
 from ...compat import to_unicode
 from ...ext import net as netx
@@ -36,6 +30,41 @@ OP_CODES = {
 MAX_MSG_PARSE_LEN = 1024 * 1024
 
 header_struct = struct.Struct('<iiii')
+byte_struct = struct.Struct('<B')
+int32_struct = struct.Struct('<i')
+int64_struct = struct.Struct('<q')
+double_struct = struct.Struct('<d')
+
+# BSON types: http://bsonspec.org/spec.html
+BSON_DOUBLE = 0x01
+BSON_STRING = 0x02
+BSON_DOCUMENT = 0x03
+BSON_ARRAY = 0x04
+BSON_BINARY = 0x05
+BSON_BOOLEAN = 0x08
+BSON_REGEX = 0x0B
+BSON_DBPOINTER = 0x0C
+BSON_CODE = 0x0D
+BSON_SYMBOL = 0x0E
+BSON_CODE_WITH_SCOPE = 0x0F
+BSON_INT32 = 0x10
+BSON_INT64 = 0x12
+
+# Size of the BSON values of fixed size
+BSON_FIXED_SIZES = {
+    BSON_DOUBLE: 8,
+    0x06: 0,  # undefined
+    0x07: 12,  # ObjectId
+    BSON_BOOLEAN: 1,
+    0x09: 8,  # UTC datetime
+    0x0A: 0,  # null
+    BSON_INT32: 4,
+    0x11: 8,  # timestamp
+    BSON_INT64: 8,
+    0x13: 16,  # decimal128
+    0x7F: 0,  # max key
+    0xFF: 0,  # min key
+}
 
 
 class Command(object):
@@ -88,8 +117,9 @@ def parse_msg(msg_bytes):
         # NOTE[matt] inserts, updates and queries can all use this opcode
 
         offset += 4  # skip flags
-        ns = _cstring(msg_bytes[offset:])
-        offset += len(ns) + 1  # include null terminator
+        ns_end = msg_bytes.index(b'\x00', offset)
+        ns = msg_bytes[offset:ns_end]
+        offset = ns_end + 1  # include null terminator
 
         # note: here coll could be '$cmd' because it can be overridden in the
         # query itself (like {'insert':'songs'})
@@ -98,13 +128,8 @@ def parse_msg(msg_bytes):
         offset += 8  # skip numberToSkip & numberToReturn
         if msg_len <= MAX_MSG_PARSE_LEN:
             # FIXME[matt] don't try to parse large messages for performance
-            # reasons. ideally we'd just peek at the first bytes to get
-            # the critical info (op type, collection, query, # of docs)
-            # rather than parse the whole thing. i suspect only massive
-            # inserts will be affected.
-            codec = CodecOptions(SON)
-            spec = next(bson.decode_iter(msg_bytes[offset:], codec_options=codec))
-            cmd = parse_spec(spec, db)
+            # reasons. only massive inserts will be affected.
+            cmd = _parse_document(msg_bytes, offset, db)
         else:
             # let's still note that a command happened.
             cmd = Command('command', db, 'untraced_message_too_large')
@@ -117,7 +142,7 @@ def parse_msg(msg_bytes):
         offset += 4
 
         # Parse the msg kind
-        kind = ord(msg_bytes[offset:offset + 1])
+        (kind,) = byte_struct.unpack_from(msg_bytes, offset)
         offset += 1
 
         # Kinds: https://docs.mongodb.com/manual/reference/mongodb-wire-protocol/#sections
@@ -125,9 +150,7 @@ def parse_msg(msg_bytes):
         #   - 1: Document Sequence
         if kind == 0:
             if msg_len <= MAX_MSG_PARSE_LEN:
-                codec = CodecOptions(SON)
-                spec = next(bson.decode_iter(msg_bytes[offset:], codec_options=codec))
-                cmd = parse_spec(spec, db)
+                cmd = _parse_document(msg_bytes, offset, db)
             else:
                 # let's still note that a command happened.
                 cmd = Command('command', db, 'untraced_message_too_large')
@@ -192,9 +215,137 @@ def parse_spec(spec, db=None):
     return cmd
 
 
-def _cstring(raw):
-    """ Return the first null terminated cstring from the bufffer. """
-    return ctypes.create_string_buffer(raw).value
+def _parse_document(msg_bytes, offset, db=None):
+    """ Return a Command from the BSON command document at the given offset of
+        a message, like `parse_spec` but reading only the elements it needs
+        instead of decoding the document.
+    """
+    elements = _iter_elements(msg_bytes, offset)
+    for bson_type, name, value, _ in elements:
+        break
+    else:
+        return None
+    cmd = Command(name, db, _read_value(msg_bytes, bson_type, value))
+
+    for bson_type, key, value, _ in elements:
+        if key == 'ordered':  # in insert and update
+            cmd.tags['mongodb.ordered'] = _read_value(msg_bytes, bson_type, value)
+        elif key == '$db':
+            cmd.db = db or _read_value(msg_bytes, bson_type, value)
+        elif bson_type != BSON_ARRAY:
+            continue
+        elif cmd.name == 'insert' and key == 'documents':
+            cmd.metrics['mongodb.documents'] = _count_elements(msg_bytes, value)
+        elif (cmd.name == 'update' and key == 'updates') or (cmd.name == 'delete' and key == 'deletes'):
+            # FIXME[matt] is there ever more than one here?
+            for item_type, _, item, _ in _iter_elements(msg_bytes, value):
+                if item_type == BSON_DOCUMENT:
+                    cmd.query = _find_filter(msg_bytes, item)
+                break
+
+    return cmd
+
+
+def _find_filter(msg_bytes, offset):
+    """ Return the normalized filter of the update or delete statement at the
+        given offset.
+    """
+    for bson_type, key, value, _ in _iter_elements(msg_bytes, offset):
+        if key == 'q':
+            if bson_type == BSON_DOCUMENT:
+                return _normalize_document(msg_bytes, value)
+            return None
+    return None
+
+
+def _normalize_document(msg_bytes, offset, array=False):
+    """ Return the BSON document or array at the given offset with its values
+        replaced by '?', like `ddtrace.contrib.pymongo.client.normalize_filter`
+        does with decoded documents.
+    """
+    if array:
+        return [
+            _normalize_document(msg_bytes, value, bson_type == BSON_ARRAY)
+            if bson_type in (BSON_DOCUMENT, BSON_ARRAY) else {}
+            for bson_type, _, value, _ in _iter_elements(msg_bytes, offset)
+        ]
+
+    out = {}
+    for bson_type, key, value, _ in _iter_elements(msg_bytes, offset):
+        if key != '$in' and key != '$nin' and bson_type in (BSON_DOCUMENT, BSON_ARRAY):
+            out[key] = _normalize_document(msg_bytes, value, bson_type == BSON_ARRAY)
+        else:
+            out[key] = '?'
+    return out
+
+
+def _iter_elements(msg_bytes, offset):
+    """ Yield the type, the name, the offset of the value and the offset of the
+        next element of each element of the BSON document at the given offset.
+    """
+    (size,) = int32_struct.unpack_from(msg_bytes, offset)
+    end = offset + size - 1  # documents end with a null byte
+    offset += 4
+    while offset < end:
+        (bson_type,) = byte_struct.unpack_from(msg_bytes, offset)
+        name_end = msg_bytes.index(b'\x00', offset + 1)
+        name = to_unicode(msg_bytes[offset + 1:name_end])
+        value = name_end + 1
+        offset = value + _value_size(msg_bytes, bson_type, value)
+        yield bson_type, name, value, offset
+
+
+def _count_elements(msg_bytes, offset):
+    """ Return the number of elements of the BSON document or array at the
+        given offset.
+    """
+    (size,) = int32_struct.unpack_from(msg_bytes, offset)
+    end = offset + size - 1
+    offset += 4
+    count = 0
+    while offset < end:
+        (bson_type,) = byte_struct.unpack_from(msg_bytes, offset)
+        value = msg_bytes.index(b'\x00', offset + 1) + 1
+        offset = value + _value_size(msg_bytes, bson_type, value)
+        count += 1
+    return count
+
+
+def _value_size(msg_bytes, bson_type, offset):
+    """ Return the size of the BSON value of the given type at the given offset. """
+    size = BSON_FIXED_SIZES.get(bson_type)
+    if size is not None:
+        return size
+    if bson_type in (BSON_STRING, BSON_CODE, BSON_SYMBOL):
+        return 4 + int32_struct.unpack_from(msg_bytes, offset)[0]
+    if bson_type in (BSON_DOCUMENT, BSON_ARRAY, BSON_CODE_WITH_SCOPE):
+        return int32_struct.unpack_from(msg_bytes, offset)[0]
+    if bson_type == BSON_BINARY:
+        return 5 + int32_struct.unpack_from(msg_bytes, offset)[0]
+    if bson_type == BSON_DBPOINTER:
+        return 16 + int32_struct.unpack_from(msg_bytes, offset)[0]
+    if bson_type == BSON_REGEX:
+        pattern_end = msg_bytes.index(b'\x00', offset)
+        return msg_bytes.index(b'\x00', pattern_end + 1) + 1 - offset
+    raise ValueError('unknown BSON type: %s' % bson_type)
+
+
+def _read_value(msg_bytes, bson_type, offset):
+    """ Return the BSON value of the given type at the given offset, for the
+        types of the values read by `_parse_document`.
+    """
+    if bson_type == BSON_STRING:
+        (size,) = int32_struct.unpack_from(msg_bytes, offset)
+        return to_unicode(msg_bytes[offset + 4:offset + 3 + size])
+    if bson_type == BSON_BOOLEAN:
+        return msg_bytes[offset:offset + 1] == b'\x01'
+    if bson_type == BSON_INT32:
+        return int32_struct.unpack_from(msg_bytes, offset)[0]
+    if bson_type == BSON_INT64:
+        return int64_struct.unpack_from(msg_bytes, offset)[0]
+    if bson_type == BSON_DOUBLE:
+        return double_struct.unpack_from(msg_bytes, offset)[0]
+    return None
 
 
 def _split_namespace(ns):
@@ -26,6 +26,29 @@ Global Configuration
 
    Default: ``"redis"``
 
+.. py:data:: ddtrace.config.redis["aggregate_pipelines"]
+
+   Whether to report the number of calls of each command of pipelines and the
+   size of their arguments as metrics of their spans, instead of formatting
+   the arguments of every command into their resource. The resource of the
+   spans is then the list of the distinct commands of the pipelines.
+
+   This option can also be set with the ``DD_REDIS_AGGREGATE_PIPELINES``
+   environment variable.
+
+   Default: ``False``
+
+.. py:data:: ddtrace.config.redis["raw_command_sample_rate"]
+
+   The proportion of commands, and of aggregated pipelines, whose arguments
+   are formatted into the ``redis.raw_command`` tag. The resource of the spans
+   of the other commands is the name of the command.
+
+   This option can also be set with the ``DD_REDIS_RAW_COMMAND_SAMPLE_RATE``
+   environment variable.
+
+   Default: ``1.0``
+
 
 Instance Configuration
 ~~~~~~~~~~~~~~~~~~~~~~
@@ -4,14 +4,30 @@ from ddtrace.vendor import wrapt
 from ddtrace import config
 
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
+from ...internal import compression
 from ...pin import Pin
 from ...ext import SpanTypes, redis as redisx
+from ...utils.formats import asbool, get_env
 from ...utils.wrappers import unwrap
 from .. import trace_utils
-from .util import format_command_args, _extract_conn_tags
-
-
-config._add("redis", dict(_default_service="redis"))
+from .util import (
+    format_command_args,
+    format_command_name,
+    is_raw_command_sampled,
+    set_pipeline_tags,
+    _extract_conn_tags,
+)
+
+
+config._add(
+    "redis",
+    dict(
+        _default_service="redis",
+        aggregate_pipelines=asbool(get_env("redis", "aggregate_pipelines", default=False)),
+        raw_command_sample_rate=float(get_env("redis", "raw_command_sample_rate", default=1.0)),
+    ),
+)
+compression.register(redisx.CMD, "redis")
 
 
 def patch():
@@ -65,19 +81,13 @@ def traced_execute_command(func, instance, args, kwargs):
     if not pin or not pin.enabled():
         return func(*args, **kwargs)
 
-    with pin.tracer.trace(
-        redisx.CMD, service=trace_utils.ext_service(pin, config.redis, pin), span_type=SpanTypes.REDIS
-    ) as s:
-        s.set_tag(SPAN_MEASURED_KEY)
-        query = format_command_args(args)
-        s.resource = query
-        s.set_tag(redisx.RAWCMD, query)
-        if pin.tags:
-            s.set_tags(pin.tags)
-        s.set_tags(_get_tags(instance))
+    template = trace_utils.get_span_template(pin, redisx.CMD, _build_span_template, instance)
+    # Only format the arguments of the sampled commands, the others are named after the command
+    query = format_command_args(args) if is_raw_command_sampled(config.redis) else None
+    with template.trace(pin.tracer, resource=format_command_name(args) if query is None else query) as s:
+        if query is not None:
+            s.set_tag(redisx.RAWCMD, query)
         s.set_metric(redisx.ARGS_LEN, len(args))
-        # set analytics sample rate if enabled
-        s.set_tag(ANALYTICS_SAMPLE_RATE_KEY, config.redis.get_analytics_sample_rate())
         # run the command
         return func(*args, **kwargs)
 
@@ -95,26 +105,22 @@ def traced_execute_pipeline(func, instance, args, kwargs):
     if not pin or not pin.enabled():
         return func(*args, **kwargs)
 
-    # FIXME[matt] done in the agent. worth it?
-    cmds = [format_command_args(c) for c, _ in instance.command_stack]
-    resource = "\n".join(cmds)
-    tracer = pin.tracer
-    with tracer.trace(
-        redisx.CMD,
-        resource=resource,
-        service=trace_utils.ext_service(pin, config.redis),
-        span_type=SpanTypes.REDIS,
-    ) as s:
-        s.set_tag(SPAN_MEASURED_KEY)
-        s.set_tag(redisx.RAWCMD, resource)
-        s.set_tags(_get_tags(instance))
-        s.set_metric(redisx.PIPELINE_LEN, len(instance.command_stack))
-
-        # set analytics sample rate if enabled
-        s.set_tag(ANALYTICS_SAMPLE_RATE_KEY, config.redis.get_analytics_sample_rate())
-
+    template = trace_utils.get_span_template(pin, redisx.CMD, _build_span_template, instance)
+    with template.trace(pin.tracer) as s:
+        # FIXME[matt] done in the agent. worth it?
+        set_pipeline_tags(s, [c for c, _ in instance.command_stack], config.redis)
         return func(*args, **kwargs)
 
 
+def _build_span_template(pin, name, instance):
+    tags = {SPAN_MEASURED_KEY: True}
+    if pin.tags:
+        tags.update(pin.tags)
+    tags.update(_get_tags(instance))
+    # set analytics sample rate if enabled
+    tags[ANALYTICS_SAMPLE_RATE_KEY] = config.redis.get_analytics_sample_rate()
+    return trace_utils.SpanTemplate(name, trace_utils.ext_service(pin, config.redis), SpanTypes.REDIS, tags)
+
+
 def _get_tags(conn):
     return _extract_conn_tags(conn.connection_pool.connection_kwargs)
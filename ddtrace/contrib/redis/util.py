@@ -1,14 +1,20 @@
 """
 Some utils used by the dogtrace redis integration
 """
+import random
+
 from ...compat import stringify
 from ...ext import redis as redisx, net
+from ...vendor import six
 
 VALUE_PLACEHOLDER = "?"
 VALUE_MAX_LEN = 100
 VALUE_TOO_LONG_MARK = "..."
 CMD_MAX_LEN = 1000
 
+# Types of the arguments whose size is their length
+SIZED_TYPES = frozenset([six.binary_type, six.text_type, bytearray])
+
 
 def _extract_conn_tags(conn_kwargs):
     """ Transform redis conn info into dogtrace metas """
@@ -50,3 +56,78 @@ def format_command_args(args):
             break
 
     return " ".join(out)
+
+
+def format_command_name(args):
+    """Return the name of a command, without its arguments"""
+    if not args:
+        return ""
+    try:
+        return stringify(args[0])
+    except Exception:
+        return VALUE_PLACEHOLDER
+
+
+def is_raw_command_sampled(int_config):
+    """Return whether the arguments of a command are formatted into its span, per the
+    ``raw_command_sample_rate`` setting of the integration.
+    """
+    rate = int_config.get("raw_command_sample_rate", 1.0)
+    return rate >= 1.0 or random.random() < rate
+
+
+def args_size(args):
+    """Return the approximate number of bytes of the arguments of a command.
+
+    Text is counted in characters and other values by the length of their string representation, like they are
+    encoded by the redis clients.
+    """
+    size = 0
+    for arg in args:
+        if type(arg) in SIZED_TYPES:
+            size += len(arg)
+        else:
+            try:
+                size += len(stringify(arg))
+            except Exception:
+                pass
+    return size
+
+
+def set_pipeline_tags(span, commands, int_config):
+    """Set the resource, the raw command and the metrics of the span of a pipeline.
+
+    With the ``aggregate_pipelines`` setting of the integration, the resource is the list of the distinct commands
+    of the pipeline and the arguments are only formatted into the raw command when it is sampled; the number of
+    calls of each command and the size of the arguments are reported as metrics instead.
+
+    :param commands: the arguments of each command of the pipeline.
+    """
+    span.set_metric(redisx.PIPELINE_LEN, len(commands))
+    if not int_config.get("aggregate_pipelines"):
+        resource = "\n".join(format_command_args(args) for args in commands)
+        span.resource = resource
+        span.set_tag(redisx.RAWCMD, resource)
+        return
+
+    # {command name: number of calls}, the names are only formatted once
+    counts = {}
+    size = 0
+    for args in commands:
+        name = args[0] if args else None
+        counts[name] = counts.get(name, 0) + 1
+        try:
+            # Fast path: all the arguments are strings
+            size += sum(map(len, args[1:]))
+        except TypeError:
+            size += args_size(args[1:])
+    names = {}
+    for name, count in counts.items():
+        name = format_command_name((name,)) if name is not None else ""
+        names[name] = names.get(name, 0) + count
+    span.resource = "\n".join(sorted(names))
+    for name, count in names.items():
+        span.set_metric(redisx.PIPELINE_COMMAND_COUNT % name, count)
+    span.set_metric(redisx.ARGS_SIZE, size)
+    if is_raw_command_sampled(int_config):
+        span.set_tag(redisx.RAWCMD, "\n".join(format_command_args(args) for args in commands))
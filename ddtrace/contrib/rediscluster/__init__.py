@@ -15,6 +15,12 @@
 
     # Use a pin to specify metadata related to this client
     Pin.override(client, service='redis-queue')
+
+The commands are traced like with the :ref:`redis<redis>` integration and its
+settings. Pipelines follow the ``aggregate_pipelines`` and
+``raw_command_sample_rate`` settings of ``ddtrace.config.rediscluster``, also
+set with the ``DD_REDISCLUSTER_AGGREGATE_PIPELINES`` and
+``DD_REDISCLUSTER_RAW_COMMAND_SAMPLE_RATE`` environment variables.
 """
 
 from ...utils.importlib import require_modules
@@ -7,15 +7,21 @@ from ddtrace import config
 from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
 from ...pin import Pin
 from ...ext import SpanTypes, redis as redisx
+from ...utils.formats import asbool, get_env
 from ...utils.wrappers import unwrap
 from ..redis.patch import traced_execute_command, traced_pipeline
-from ..redis.util import format_command_args
+from ..redis.util import set_pipeline_tags
 
 
 # DEV: In `2.0.0` `__version__` is a string and `VERSION` is a tuple,
 #      but in `1.x.x` `__version__` is a tuple annd `VERSION` does not exist
 REDISCLUSTER_VERSION = getattr(rediscluster, 'VERSION', rediscluster.__version__)
 
+config._add('rediscluster', dict(
+    aggregate_pipelines=asbool(get_env('rediscluster', 'aggregate_pipelines', default=False)),
+    raw_command_sample_rate=float(get_env('rediscluster', 'raw_command_sample_rate', default=1.0)),
+))
+
 
 def patch():
     """Patch the instrumented methods
@@ -60,13 +66,10 @@ def traced_execute_pipeline(func, instance, args, kwargs):
     if not pin or not pin.enabled():
         return func(*args, **kwargs)
 
-    cmds = [format_command_args(c.args) for c in instance.command_stack]
-    resource = '\n'.join(cmds)
     tracer = pin.tracer
-    with tracer.trace(redisx.CMD, resource=resource, service=pin.service, span_type=SpanTypes.REDIS) as s:
+    with tracer.trace(redisx.CMD, service=pin.service, span_type=SpanTypes.REDIS) as s:
         s.set_tag(SPAN_MEASURED_KEY)
-        s.set_tag(redisx.RAWCMD, resource)
-        s.set_metric(redisx.PIPELINE_LEN, len(instance.command_stack))
+        set_pipeline_tags(s, [c.args for c in instance.command_stack], config.rediscluster)
 
         # set analytics sample rate if enabled
         s.set_tag(
@@ -4,6 +4,7 @@ from ddtrace.vendor.wrapt import wrap_function_wrapper as _w
 
 from ddtrace import config
 
+from ...internal import compression
 from ...pin import Pin
 from ...utils.formats import asbool, get_env
 from ...utils.wrappers import unwrap as _u
@@ -15,6 +16,7 @@ config._add('requests', {
     'distributed_tracing': asbool(get_env('requests', 'distributed_tracing', default=True)),
     'split_by_domain': asbool(get_env('requests', 'split_by_domain', default=False)),
 })
+compression.register('requests.request', 'requests')
 
 
 def patch():
@@ -22,6 +22,7 @@ from ...constants import ANALYTICS_SAMPLE_RATE_KEY, SPAN_MEASURED_KEY
 from ...ext import SpanTypes, sql as sqlx, net as netx
 from ...pin import Pin
 from ...settings import config
+from ..trace_utils import sql_resource
 
 
 def trace_engine(engine, tracer=None, service=None):
@@ -87,7 +88,7 @@ class EngineTracer(object):
             self.name,
             service=pin.service,
             span_type=SpanTypes.SQL,
-            resource=statement,
+            resource=sql_resource(statement, self.vendor),
         )
         span.set_tag(SPAN_MEASURED_KEY)
 
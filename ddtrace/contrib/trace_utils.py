@@ -2,8 +2,13 @@
 This module contains utility functions for writing ddtrace integrations.
 """
 from ddtrace import Pin
+from ddtrace import config
+from ddtrace.compat import string_type
+from ddtrace.constants import MANUAL_DROP_KEY, MANUAL_KEEP_KEY
+from ddtrace.ext import sql
 import ddtrace.http
 from ddtrace.internal.logger import get_logger
+from ddtrace.span import Span
 import ddtrace.utils.wrappers
 from ddtrace.vendor import wrapt
 
@@ -103,3 +108,83 @@ def ext_service(pin, config, default=None):
 
     # A default is required since it's an external service.
     return default
+
+
+def sql_resource(query, vendor=None):
+    """Returns the resource of a span for a SQL query.
+
+    The query is normalized when SQL normalization is enabled, so that the
+    resource does not contain any literal. Otherwise it is obfuscated by the
+    agent.
+
+    :param query: The SQL query.
+    :param vendor: The vendor of the database, used to parse its string literals.
+    """
+    if config.sql_normalization_enabled and isinstance(query, string_type):
+        return sql.normalize_query(query, backslash_escapes=vendor in sql.BACKSLASH_ESCAPES_VENDORS)
+    return query
+
+
+class SpanTemplate(object):
+    """The attributes shared by the spans an integration creates for an instrumented object.
+
+    The tags are converted once to the meta and metrics of the spans, which are then copied to each span created
+    with :meth:`trace` instead of setting the tags one by one.
+    """
+
+    __slots__ = ("name", "service", "span_type", "meta", "metrics", "tags", "version")
+
+    def __init__(self, name, service=None, span_type=None, tags=None):
+        """
+        :param str name: The name of the spans.
+        :param str service: The service of the spans.
+        :param str span_type: The type of the spans.
+        :param dict tags: The tags of the spans.
+        """
+        span = Span(None, name, service=service, span_type=span_type)
+        # Tags changing the sampling priority of the trace are set on each span
+        self.tags = {}
+        if tags:
+            for key, value in tags.items():
+                if key in (MANUAL_KEEP_KEY, MANUAL_DROP_KEY):
+                    self.tags[key] = value
+                else:
+                    span.set_tag(key, value)
+        self.name = name
+        self.service = span.service
+        self.span_type = span.span_type
+        self.meta = span.meta
+        self.metrics = span.metrics
+        self.version = config._version
+
+    def trace(self, tracer, resource=None):
+        """Return a span from the template, like :meth:`ddtrace.Tracer.trace`."""
+        span = tracer.trace(self.name, service=self.service, resource=resource, span_type=self.span_type)
+        span.meta.update(self.meta)
+        span.metrics.update(self.metrics)
+        if self.tags:
+            span.set_tags(self.tags)
+        return span
+
+
+def get_span_template(pin, name, build, *args):
+    """Return the :class:`SpanTemplate` of the spans called `name` created with a pin.
+
+    The template is built with ``build(pin, name, *args)`` the first time, then kept on the pin until the
+    configuration changes or the pin is attached to another object with ``Pin.onto``. ``Pin.override`` sets a new
+    pin, which does not keep the templates either.
+
+    Usage::
+
+        def _build_span_template(pin, name, instance):
+            tags = dict(pin.tags or {}, **_get_tags(instance))
+            return SpanTemplate(name, ext_service(pin, config.myint), SpanTypes.CACHE, tags)
+
+        template = get_span_template(pin, "myint.command", _build_span_template, instance)
+        with template.trace(pin.tracer, resource=command) as span:
+            ...
+    """
+    template = pin._span_templates.get(name)
+    if template is None or template.version != config._version:
+        template = pin._span_templates[name] = build(pin, name, *args)
+    return template
@@ -20,11 +20,11 @@ _PATCHED = False
 
 
 def copy_span_start(instance, span, conf, *args, **kwargs):
-    span.resource = args[0]
+    span.resource = trace_utils.sql_resource(args[0])
 
 
 def execute_span_start(instance, span, conf, *args, **kwargs):
-    span.resource = args[0]
+    span.resource = trace_utils.sql_resource(args[0])
 
 
 def execute_span_end(instance, result, span, conf, *args, **kwargs):
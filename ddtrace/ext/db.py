@@ -2,3 +2,10 @@
 NAME = 'db.name'     # the database name (eg: dbname for pgsql)
 USER = 'db.user'     # the user connecting to the db
 ROWCOUNT = 'db.rowcount'  # the rowcount of a query
+
+# metrics of the spans summarizing repeated queries
+QUERY_COUNT = 'db.query.count'  # the number of executions of the query
+QUERY_TOTAL_NS = 'db.query.total_ns'  # the total duration of the executions
+QUERY_MIN_NS = 'db.query.min_ns'  # the duration of the fastest execution
+QUERY_MAX_NS = 'db.query.max_ns'  # the duration of the slowest execution
+N_PLUS_ONE = 'db.n_plus_one'  # the number of repeated queries aggregated in the trace, set on the root span
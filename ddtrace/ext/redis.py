@@ -17,3 +17,6 @@ CMD = "redis.command"
 ARGS_LEN = "redis.args_length"
 PIPELINE_LEN = "redis.pipeline_length"
 PIPELINE_AGE = "redis.pipeline_age"
+ARGS_SIZE = "redis.args_size"
+# Number of calls of a command in a pipeline, formatted with the name of the command
+PIPELINE_COMMAND_COUNT = "redis.pipeline.%s.count"
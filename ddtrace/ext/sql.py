@@ -1,4 +1,7 @@
+import re
+
 from . import SpanTypes
+from ..utils.cache import LRUCache
 
 # [TODO] Deprecated, remove when we remove AppTypes
 TYPE = SpanTypes.SQL
@@ -32,3 +35,75 @@ def parse_pg_dsn(dsn):
     # FIXME: replace by psycopg2.extensions.parse_dsn when available
     # https://github.com/psycopg/psycopg2/pull/321
     return {c.split('=')[0]: c.split('=')[1] for c in dsn.split() if '=' in c}
+
+
+# Tokens replaced while normalizing a query. Strings are matched first so that comments and numbers inside strings
+# are left alone, and numbers are only matched when they are not part of an identifier (e.g. `table1`).
+_NORMALIZE_TOKENS_PATTERN = r"""
+    (?P<string>%s)
+    | (?P<identifier>"(?:[^"]|"")*"|`[^`]*`)
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<number>(?<![\w$.])(?:0x[0-9a-fA-F]+|\d+(?:\.\d*)?(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)\b)
+"""
+# In standard SQL, a quote is escaped by doubling it and a backslash is a regular character
+_NORMALIZE_TOKENS_RE = re.compile(_NORMALIZE_TOKENS_PATTERN % r"'(?:[^']|'')*'", re.VERBOSE | re.DOTALL)
+# MySQL also escapes any character with a backslash by default
+_NORMALIZE_BACKSLASH_TOKENS_RE = re.compile(_NORMALIZE_TOKENS_PATTERN % r"'(?:[^'\\]|\\.|'')*'", re.VERBOSE | re.DOTALL)
+
+# The vendors of the databases where a backslash escapes the next character of a string literal
+BACKSLASH_ESCAPES_VENDORS = frozenset(["mysql", "pymysql"])
+
+# A list of literals or placeholders, e.g. `IN (?, ?, %s, %(name)s, $1, :name)`
+_NORMALIZE_IN_LIST_RE = re.compile(
+    r"\bIN\s*\(\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|\$\d+|:\w+))*\s*\)",
+    re.IGNORECASE,
+)
+
+_NORMALIZE_SPACES_RE = re.compile(r"\s+")
+
+
+def _normalize_token(match):
+    kind = match.lastgroup
+    if kind == "comment":
+        return " "
+    elif kind == "identifier":
+        return match.group()
+    return "?"
+
+
+# {(query, backslash escapes): normalized query}
+_normalized_queries = LRUCache(maxsize=1024)
+# Longer queries are not cached: the cache is bounded by its number of entries, not by their size
+_MAX_CACHED_QUERY_LENGTH = 4096
+
+
+def normalize_query(query, backslash_escapes=False):
+    """Return a normalized version of a SQL query, fit to be used as a span resource.
+
+    Literal strings and numbers are replaced with ``?``, lists of values in ``IN`` clauses are collapsed into a single
+    ``?``, comments are stripped and whitespace is collapsed. The results are cached by raw query, unless the query is
+    too long.
+
+    >>> normalize_query("SELECT * FROM users WHERE id IN (1, 2, 3) AND name = 'foo' -- lookup")
+    'SELECT * FROM users WHERE id IN ( ? ) AND name = ?'
+
+    :param query: The SQL query.
+    :param backslash_escapes: Whether a backslash escapes the next character of a string literal, as in MySQL.
+    """
+    if len(query) > _MAX_CACHED_QUERY_LENGTH:
+        return _normalize_query(query, backslash_escapes)
+
+    key = (query, backslash_escapes)
+    try:
+        return _normalized_queries[key]
+    except KeyError:
+        pass
+    normalized = _normalized_queries[key] = _normalize_query(query, backslash_escapes)
+    return normalized
+
+
+def _normalize_query(query, backslash_escapes):
+    tokens_re = _NORMALIZE_BACKSLASH_TOKENS_RE if backslash_escapes else _NORMALIZE_TOKENS_RE
+    query = tokens_re.sub(_normalize_token, query)
+    query = _NORMALIZE_IN_LIST_RE.sub("IN ( ? )", query)
+    return _NORMALIZE_SPACES_RE.sub(" ", query).strip()
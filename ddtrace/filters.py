@@ -1,6 +1,11 @@
 import re
 
+from .compat import string_type
+from .ext import SpanTypes
+from .ext import db
 from .ext import http
+from .ext import sql
+from .settings import config
 
 
 class FilterRequestsOnUrl(object):
@@ -47,3 +52,73 @@ class FilterRequestsOnUrl(object):
                     if regexp.match(url):
                         return None
         return trace
+
+
+class AggregateRepeatedQueries(object):
+    """Aggregate the database spans of a trace repeating the same query.
+
+    The SQL spans of a trace are grouped by parent, service, name and normalized
+    query. When a query is executed more than ``threshold`` times under the same
+    parent, which is the signature of the N+1 queries problem, the executions are
+    replaced by a single span covering them all, with the ``db.query.count``,
+    ``db.query.total_ns``, ``db.query.min_ns`` and ``db.query.max_ns`` metrics.
+    The local root span of the trace gets the number of aggregated queries as the
+    ``db.n_plus_one`` metric.
+
+    Spans with errors, with children or whose query is not a string are never aggregated.
+
+    The tracer applies this filter when ``DD_TRACE_SQL_AGGREGATION_THRESHOLD`` is set.
+
+    :param int threshold: the number of executions of a query over which they are
+                          aggregated. Defaults to ``config.sql_aggregation_threshold``.
+    """
+    def __init__(self, threshold=None):
+        self.threshold = threshold
+
+    def process_trace(self, trace):
+        threshold = config.sql_aggregation_threshold if self.threshold is None else self.threshold
+        if not threshold or len(trace) <= threshold:
+            return trace
+
+        parents = set(span.parent_id for span in trace)
+        groups = {}
+        for span in trace:
+            if (
+                span.span_type == SpanTypes.SQL.value
+                and isinstance(span.resource, string_type)
+                and span.duration_ns is not None
+                and not span.error
+                and span.span_id not in parents
+            ):
+                # The name of the spans of database integrations is prefixed by the vendor, e.g. `mysql.query`
+                backslash_escapes = span.name.split(".", 1)[0] in sql.BACKSLASH_ESCAPES_VENDORS
+                resource = sql.normalize_query(span.resource, backslash_escapes)
+                key = (span.parent_id, span.service, span.name, resource)
+                groups.setdefault(key, []).append(span)
+
+        aggregated = set()
+        n_plus_one = 0
+        for (_, _, _, resource), spans in groups.items():
+            if len(spans) <= threshold:
+                continue
+            n_plus_one += 1
+            spans.sort(key=lambda s: s.start_ns)
+            durations = [s.duration_ns for s in spans]
+            summary = spans[0]
+            summary.resource = resource
+            summary.duration_ns = max(s.start_ns + s.duration_ns for s in spans) - summary.start_ns
+            summary.set_metric(db.QUERY_COUNT, len(spans))
+            summary.set_metric(db.QUERY_TOTAL_NS, sum(durations))
+            summary.set_metric(db.QUERY_MIN_NS, min(durations))
+            summary.set_metric(db.QUERY_MAX_NS, max(durations))
+            aggregated.update(id(s) for s in spans[1:])
+
+        if not n_plus_one:
+            return trace
+
+        trace = [span for span in trace if id(span) not in aggregated]
+        for span in trace:
+            if span._parent is None:
+                span.set_metric(db.N_PLUS_ONE, (span.get_metric(db.N_PLUS_ONE) or 0) + n_plus_one)
+                break
+        return trace
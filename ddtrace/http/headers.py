@@ -49,20 +49,39 @@ def _store_headers(headers, span, integration_config, request_or_response):
     :param integration_config: An integration specific config object.
     :type integration_config: ddtrace.settings.IntegrationConfig
     """
+    if integration_config is None:
+        log.debug('Skipping headers tracing as no integration config was provided')
+        return
+
+    # {header spelling: tag name}
+    header_tags = integration_config._header_tags(request_or_response)
+    if not header_tags:
+        return
+
+    if not isinstance(headers, dict) and hasattr(headers, 'get'):
+        # Case-insensitive mappings, like the headers of Werkzeug, Django or requests: only look up the traced headers
+        stored = set()
+        for header_name, tag_name in header_tags.items():
+            if tag_name in stored:
+                continue
+            header_value = headers.get(header_name)
+            if header_value is not None:
+                span.set_tag(tag_name, header_value)
+                stored.add(tag_name)
+        return
+
     if not isinstance(headers, dict):
         try:
             headers = dict(headers)
         except Exception:
             return
 
-    if integration_config is None:
-        log.debug('Skipping headers tracing as no integration config was provided')
-        return
-
     for header_name, header_value in headers.items():
-        if not integration_config.header_is_traced(header_name):
-            continue
-        tag_name = _normalize_tag_name(request_or_response, header_name)
+        tag_name = header_tags.get(header_name)
+        if tag_name is None:
+            tag_name = header_tags.get(normalize_header_name(header_name))
+            if tag_name is None:
+                continue
         span.set_tag(tag_name, header_value)
 
 
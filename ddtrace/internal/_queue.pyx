@@ -1,6 +1,5 @@
 import threading
 
-from ddtrace.vendor import attr
 from ..internal.logger import get_logger
 from . import _rand
 
@@ -8,15 +7,21 @@ from . import _rand
 log = get_logger(__name__)
 
 
-@attr.s
 class TraceQueue(object):
-
-    maxsize = attr.ib(type=int, default=0)
-    _lock = attr.ib(init=False, factory=threading.Lock, repr=False)
-    _queue = attr.ib(init=False, factory=list, repr=False)
-    _accepted = attr.ib(init=False, type=int, default=0)
-    _accepted_lengths = attr.ib(init=False, type=int, default=0)
-    _dropped = attr.ib(init=False, type=int, default=0)
+    # DEV: A plain class rather than an attrs one, `attr` is expensive to import and this is imported with ddtrace
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._queue = []
+        self._accepted = 0
+        self._accepted_lengths = 0
+        self._dropped = 0
+
+    def __repr__(self):
+        return "{}(maxsize={!r}, _accepted={!r}, _accepted_lengths={!r}, _dropped={!r})".format(
+            self.__class__.__name__, self.maxsize, self._accepted, self._accepted_lengths, self._dropped
+        )
 
     def __len__(self):
         return len(self._queue)
@@ -0,0 +1,74 @@
+"""
+Compression of repetitive sibling spans.
+
+Loops calling a cache, a key-value store or an HTTP API produce many nearly identical sibling spans. When a span is
+closed right after a finished sibling with the same service, name, resource and type, the ``Context`` merges it into
+that sibling instead of keeping it in the trace. The remaining span covers all the merged executions and carries their
+number and the distribution of their durations as metrics.
+
+Integrations register the names of the spans they create for an integration configuration; the compression of these
+spans is then enabled with the ``span_compression`` setting of the integration::
+
+    from ddtrace import config
+
+    config.redis.span_compression = True
+
+or with the ``DD_<INTEGRATION>_SPAN_COMPRESSION_ENABLED`` environment variable (e.g.
+``DD_REDIS_SPAN_COMPRESSION_ENABLED``). Spans with errors or with children are never merged.
+"""
+from ..settings import config
+
+
+COUNT_KEY = "span.compressed.count"
+TOTAL_NS_KEY = "span.compressed.total_ns"
+MIN_NS_KEY = "span.compressed.min_ns"
+MAX_NS_KEY = "span.compressed.max_ns"
+
+# {span name: name of the integration configuration}
+_rules = {}
+
+
+def register(span_name, integration):
+    """Make the spans called ``span_name`` compressible when the integration enables ``span_compression``.
+
+    :param str span_name: The name of the spans.
+    :param str integration: The name of the integration configuration (e.g. ``redis`` for ``config.redis``).
+    """
+    _rules[span_name] = integration
+
+
+def is_compressible(span):
+    """Return whether the span can be merged into its siblings."""
+    integration = _rules.get(span.name)
+    if integration is None:
+        return False
+    return bool(getattr(config, integration).get("span_compression"))
+
+
+def can_merge(span, sibling):
+    """Return whether the span can be merged into a finished sibling closed right before."""
+    return (
+        span.name == sibling.name
+        and span.service == sibling.service
+        and span.resource == sibling.resource
+        and span.span_type == sibling.span_type
+        and not span.error
+        and not sibling.error
+        and is_compressible(span)
+    )
+
+
+def merge(span, sibling):
+    """Merge a finished span into a finished sibling that started before it."""
+    count = sibling.get_metric(COUNT_KEY)
+    if count is None:
+        count = 1
+        sibling.set_metric(TOTAL_NS_KEY, sibling.duration_ns)
+        sibling.set_metric(MIN_NS_KEY, sibling.duration_ns)
+        sibling.set_metric(MAX_NS_KEY, sibling.duration_ns)
+    duration = span.duration_ns
+    sibling.set_metric(COUNT_KEY, count + 1)
+    sibling.set_metric(TOTAL_NS_KEY, sibling.get_metric(TOTAL_NS_KEY) + duration)
+    sibling.set_metric(MIN_NS_KEY, min(sibling.get_metric(MIN_NS_KEY), duration))
+    sibling.set_metric(MAX_NS_KEY, max(sibling.get_metric(MAX_NS_KEY), duration))
+    sibling.duration_ns = max(sibling.start_ns + sibling.duration_ns, span.start_ns + duration) - sibling.start_ns
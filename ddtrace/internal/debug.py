@@ -25,18 +25,8 @@ def ping_agent(api=None, hostname=None, port=None, uds_path=None):
             uds_path=uds_path,
         )
 
-    # We can't use api.send_traces([]) since it'll shortcut
-    # if traces is falsy.
-    p = ddtrace.payload.Payload(encoder=api._encoder)
-
-    # We can't use payload.add_trace([]) for the same reason
-    # as api.send_trace([]).
-    encoded = p.encoder.encode_trace([])
-    p.traces.append(encoded)
-    p.size += len(encoded)
-
     try:
-        resp = api._flush(p)
+        resp = api.ping()
     except Exception as e:
         resp = e
 
@@ -0,0 +1,133 @@
+import random
+import threading
+
+from ..vendor.dogstatsd import DogStatsd
+
+
+# Maximum size of the datagrams: fits in the MTU of most networks for UDP, like the official clients do
+UDP_MAX_PACKET_SIZE = 1432
+UDS_MAX_PACKET_SIZE = 8192
+
+
+class AggregatingDogStatsd(DogStatsd):
+    """Thread-safe DogStatsd client aggregating metrics in memory before sending them.
+
+    Counters are summed and gauges keep their last value until the next flush. The values of histograms and
+    distributions are sampled into a reservoir of at most `MAX_SAMPLES_PER_CONTEXT` values for each metric and tags,
+    sent with the sample rate of the reservoir. The values of the other metric types, events and service checks are
+    kept as is, up to `MAX_PENDING_PACKETS`. Everything is sent packed into as few datagrams as possible when calling
+    `flush` or when leaving the client context manager: reporting metrics never sends them, so that only the workers
+    flushing the client do network I/O.
+    """
+
+    # Maximum number of pending values (not counting counters, gauges, histograms and distributions) before new ones
+    # are dropped
+    MAX_PENDING_PACKETS = 1000
+
+    # Maximum number of values of a histogram or distribution kept for each set of tags between flushes
+    MAX_SAMPLES_PER_CONTEXT = 64
+
+    def __init__(self, max_packet_size=None, **kwargs):
+        """
+        :param max_packet_size: The maximum size of a datagram. Defaults to the recommended size for UDP or UDS.
+        :param kwargs: The arguments of `DogStatsd`.
+        """
+        super(AggregatingDogStatsd, self).__init__(**kwargs)
+        if max_packet_size is None:
+            max_packet_size = UDP_MAX_PACKET_SIZE if self.socket_path is None else UDS_MAX_PACKET_SIZE
+        self.max_packet_size = max_packet_size
+        # DEV: DogStatsd.lock is held while opening the socket, which happens when flushing
+        self._buffer_lock = threading.Lock()
+        self._reset()
+        self._send = self._send_to_buffer
+
+    def _reset(self):
+        # {(metric, metric type, tags): value}
+        self._aggregates = {}
+        # {(metric, metric type, tags): (number of values reported, sampled values)}
+        self._samples = {}
+        self._packets = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def open_buffer(self, max_buffer_size=50):
+        """Metrics are always buffered: this does nothing."""
+
+    def close_buffer(self):
+        """Flush the buffered metrics."""
+        self.flush()
+
+    def _report(self, metric, metric_type, value, tags, sample_rate):
+        if value is None:
+            return
+
+        if sample_rate != 1 or metric_type not in ("c", "g", "h", "d"):
+            return super(AggregatingDogStatsd, self)._report(metric, metric_type, value, tags, sample_rate)
+
+        key = (metric, metric_type, tuple(self._add_constant_tags(tags) or ()))
+        with self._buffer_lock:
+            if metric_type == "c":
+                self._aggregates[key] = self._aggregates.get(key, 0) + value
+            elif metric_type == "g":
+                self._aggregates[key] = value
+            else:
+                self._sample(key, value)
+
+    def _sample(self, key, value):
+        """Add a value to the reservoir of a histogram or distribution."""
+        count, values = self._samples.get(key, (0, []))
+        count += 1
+        if len(values) < self.MAX_SAMPLES_PER_CONTEXT:
+            values.append(value)
+        else:
+            # Reservoir sampling: each value reported has the same chance to be sent
+            index = random.randrange(count)
+            if index < self.MAX_SAMPLES_PER_CONTEXT:
+                values[index] = value
+        self._samples[key] = (count, values)
+
+    def _send_to_buffer(self, packet):
+        with self._buffer_lock:
+            if len(self._packets) < self.MAX_PENDING_PACKETS:
+                self._packets.append(packet)
+
+    def flush(self):
+        """Send all the buffered metrics."""
+        with self._buffer_lock:
+            aggregates, samples, packets = self._aggregates, self._samples, self._packets
+            self._reset()
+
+        namespace = (self.namespace + ".") if self.namespace else ""
+        for (metric, metric_type, tags), value in aggregates.items():
+            packets.append(
+                "%s%s:%s|%s%s" % (namespace, metric, value, metric_type, ("|#" + ",".join(tags)) if tags else "")
+            )
+        for (metric, metric_type, tags), (count, values) in samples.items():
+            rate = ("|@%s" % (float(len(values)) / count)) if len(values) < count else ""
+            packets.extend(
+                "%s%s:%s|%s%s%s"
+                % (namespace, metric, value, metric_type, rate, ("|#" + ",".join(tags)) if tags else "")
+                for value in values
+            )
+
+        for datagram in self._pack(packets):
+            self._send_to_server(datagram)
+
+    def _pack(self, packets):
+        """Join the packets with newlines into datagrams of at most `max_packet_size` bytes."""
+        datagram = []
+        size = 0
+        for packet in packets:
+            packet_size = len(packet.encode(self.encoding))
+            if datagram and size + 1 + packet_size > self.max_packet_size:
+                yield "\n".join(datagram)
+                datagram = []
+                size = 0
+            size += packet_size + (1 if datagram else 0)
+            datagram.append(packet)
+        if datagram:
+            yield "\n".join(datagram)
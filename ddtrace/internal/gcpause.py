@@ -0,0 +1,97 @@
+"""
+Time garbage collector pauses using `gc.callbacks`.
+
+The pauses are aggregated per generation in a `DurationHistogram`, and can be dispatched to listeners (e.g. the
+profiler or the tracer) as they happen. `gc.callbacks` is not available on Python 2, where this does nothing.
+"""
+import gc
+import sys
+
+from .. import compat
+from .histogram import DurationHistogram
+
+
+GENERATIONS = (0, 1, 2)
+
+
+class GCPauseTracker(object):
+    """Time every garbage collection and dispatch the pauses to listeners."""
+
+    def __init__(self):
+        self.stats = {generation: DurationHistogram() for generation in GENERATIONS}
+        self._listeners = []
+        self._start_ns = None
+        self._installed = False
+
+    def install(self):
+        """Start timing garbage collections."""
+        if self._installed or not hasattr(gc, "callbacks"):
+            return
+        gc.callbacks.append(self._callback)
+        self._installed = True
+
+    def uninstall(self):
+        """Stop timing garbage collections."""
+        if not self._installed:
+            return
+        try:
+            gc.callbacks.remove(self._callback)
+        except ValueError:
+            pass
+        self._installed = False
+        self._start_ns = None
+
+    def register(self, listener):
+        """Register a function to call after each garbage collection.
+
+        The function is called with the generation collected, the pause duration in nanoseconds and the frame that
+        triggered the collection. It runs from the garbage collector: it must be fast and must not acquire any lock
+        the interrupted code might hold.
+        """
+        if listener not in self._listeners:
+            # Replace the list so the callback never iterates over a list being modified
+            self._listeners = self._listeners + [listener]
+        self.install()
+
+    def unregister(self, listener):
+        """Unregister a function registered with `register`.
+
+        Garbage collections are not timed anymore once the last listener is unregistered.
+        """
+        self._listeners = [registered for registered in self._listeners if registered != listener]
+        if not self._listeners:
+            self.uninstall()
+
+    def snapshot(self):
+        """Return a copy of the statistics of each generation."""
+        return {generation: stats.copy() for generation, stats in self.stats.items()}
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start_ns = compat.monotonic_ns()
+            return
+
+        if self._start_ns is None:
+            return
+
+        duration_ns = compat.monotonic_ns() - self._start_ns
+        self._start_ns = None
+        generation = info["generation"]
+        self.stats[generation].add(duration_ns)
+
+        listeners = self._listeners
+        if listeners:
+            try:
+                frame = sys._getframe(1)
+            except ValueError:
+                # The collection was not triggered by Python code
+                frame = None
+            for listener in listeners:
+                try:
+                    listener(generation, duration_ns, frame)
+                except Exception:
+                    # Do not log: the logging module's locks might be held by the interrupted code
+                    pass
+
+
+tracker = GCPauseTracker()
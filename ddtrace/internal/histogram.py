@@ -0,0 +1,56 @@
+"""
+Fixed-bucket histogram of durations, cheap enough to be updated on hot paths.
+
+Values are counted in power-of-two buckets, so percentiles are approximated by the upper bound of the bucket they fall
+in.
+"""
+
+# Upper bounds of the histogram buckets in nanoseconds: from ~1 microsecond to ~17 seconds
+BUCKETS = tuple(2 ** i for i in range(10, 35))
+
+
+class DurationHistogram(object):
+    """Cumulative statistics about durations in nanoseconds."""
+
+    __slots__ = ("count", "total_ns", "buckets")
+
+    def __init__(self, count=0, total_ns=0, buckets=None):
+        self.count = count
+        self.total_ns = total_ns
+        # One more bucket for durations above the last bound
+        self.buckets = [0] * (len(BUCKETS) + 1) if buckets is None else buckets
+
+    def copy(self):
+        return self.__class__(self.count, self.total_ns, list(self.buckets))
+
+    def __sub__(self, other):
+        return self.__class__(
+            self.count - other.count,
+            self.total_ns - other.total_ns,
+            [a - b for a, b in zip(self.buckets, other.buckets)],
+        )
+
+    def add(self, duration_ns):
+        self.count += 1
+        self.total_ns += duration_ns
+        for i, bound in enumerate(BUCKETS):
+            if duration_ns <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, pct):
+        """Return the upper bound in nanoseconds of the bucket containing the given percentile of durations.
+
+        :param pct: The percentile, between 0 and 100.
+        """
+        if not self.count:
+            return 0
+        threshold = self.count * pct / 100.0
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= threshold:
+                return BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1] * 2
+        return BUCKETS[-1] * 2
@@ -1,16 +1,10 @@
 """
 Module for patching Python's internal import system for import hooks.
 
-There are a few ways to monitor Python imports, but we have found the following method
-of patching internal Python functions and builtin functions the most reliable and
-least invasive process.
-
-Given the challenges faced by implementing PEP 302, and our experience with monkey patching
-and wrapping internal Python functions was an easier and more reliable way
-of implementing this feature in a way that has little effect on other packages.
-
 For us to successfully use import hooks, we need to ensure that the hooks are always called
-regardless of the condition or means of importing the module.
+regardless of the condition or means of importing the module, without slowing down the
+imports of the modules we have no hooks for: large applications import thousands of modules
+when they start.
 
 
 PEP 302 defines a process for adding import "hooks".
@@ -22,32 +16,29 @@ for example: `sys.meta_path.append(MyFinder)`
 Finders are a way for users to customize the way the Python import system
 finds and loads modules.
 
-This approach has a few flaws
-
-1) Finders are called in order. In order for us to always ensure we are able to capture
-every import we would need to make sure that our Finder is always first in `sys.meta_path`.
-
-This can become tricky when the user uses another package that adds to `sys.meta_path`
-(e.g. `six`, or `newrelic`).
+On Python 3 we add a finder in front of `sys.meta_path`, it returns right away for the modules
+without hooks and takes no further part in their import. For the modules with hooks, it asks the
+finders following it for the spec of the module and wraps the loader of this spec, so that the
+hooks are called once the module was executed. The module never sees our loader: the original
+loader is put back on the module and its spec before the module is executed.
 
-If another Finder runs before ours and finds the module they are looking for, then ours will
-never get called.
+This approach has a few caveats
 
-2) Finders were never meant to be used this way. An example of a good finder is a custom
-finder that looks for and loads a module off of a shared central server instead of a
-location on the existing Python path, or one that knows how to load modules from a `.zip`
-or another file format.
+1) Finders are called in order. If another finder is added in front of ours later on and finds a
+module we have hooks for, then ours will never get called for this module.
 
-3) The code is a little complex. In order to write a no-op finder we need to ensure
-other finders are called by us, and then at the end we look if they found a module and return it.
+In practice the finders added by other packages (e.g. `six`, or `newrelic`) only find their own
+modules, or defer to the following finders like we do.
 
-This is the approach `wrapt` went for and requires locking and keeping the state of the current module
-being loaded and re-calling `__import__` for the module to trigger the other finders.
+2) Finders deferring to the import system (e.g. `wrapt`) call back into our finder for the same
+module. We keep track of the modules being found to not wrap their loader twice.
 
-4) Reloading a module is a weird case that doesn't always trigger a module finder.
+3) Reloading a module goes through `sys.meta_path` too since Python 3.4, the hooks are called
+again after a module is reloaded.
 
 
-For these reasons we have decided to patch Python's internal module loading functions instead.
+Python 2 does not have module specs, so there we patch the `__import__` and `reload` builtin
+functions instead.
 """
 import threading
 import sys
@@ -145,12 +136,15 @@ class ModuleHookRegistry(object):
                 log.warning("Tried to call hooks for unloaded module %r", name)
                 return
 
-            # Call all hooks for this module
-            for hook in self.hooks[name]:
-                try:
-                    hook(module)
-                except Exception:
-                    log.warning("Failed to call hook %r for module %r", hook, name, exc_info=True)
+            # DEV: Call the hooks without holding the lock, they can import modules with hooks
+            module_hooks = list(self.hooks[name])
+
+        # Call all hooks for this module
+        for hook in module_hooks:
+            try:
+                hook(module)
+            except Exception:
+                log.warning("Failed to call hook %r for module %r", hook, name, exc_info=True)
 
     def reset(self):
         """Reset/remove all registered hooks"""
@@ -180,39 +174,91 @@ def exec_and_call_hooks(module_name, wrapped, args, kwargs):
 
 def wrapped_reload(wrapped, instance, args, kwargs):
     """
-    Wrapper for `importlib.reload` to we can trigger hooks on a module reload
+    Wrapper for the `reload` builtin function of Python 2 so we can trigger hooks on a module reload
     """
     module_name = None
     try:
-        # Python 3 added specs, no need to even check for `__spec__` if we are in Python 2
-        if PY3:
-            try:
-                module_name = args[0].__spec__.name
-            except AttributeError:
-                module_name = args[0].__name__
-        else:
-            module_name = args[0].__name__
+        module_name = args[0].__name__
     except Exception:
         log.debug("Failed to determine module name when calling `reload`: %r", args, exc_info=True)
 
     return exec_and_call_hooks(module_name, wrapped, args, kwargs)
 
 
-def wrapped_find_and_load_unlocked(wrapped, instance, args, kwargs):
+class _ImportHookLoader(object):
     """
-    Wrapper for `importlib._bootstrap._find_and_load_unlocked` so we can trigger
-      hooks on module loading
+    Loader calling the hooks of a module once it was executed by the loader found for it
 
-    NOTE: This code does not get called for module reloading
+    The other attributes are the ones of the original loader.
     """
-    module_name = None
-    try:
-        module_name = args[0]
-    except Exception:
-        log.debug("Failed to determine module name when importing module: %r", args, exc_info=True)
-        return wrapped(*args, **kwargs)
 
-    return exec_and_call_hooks(module_name, wrapped, args, kwargs)
+    def __init__(self, loader, registry):
+        self._loader = loader
+        self._registry = registry
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # DEV: `create_module` is optional for loaders before Python 3.6
+        create_module = getattr(self._loader, "create_module", None)
+        return create_module(spec) if create_module is not None else None
+
+    def exec_module(self, module):
+        # Do not let the module see our loader
+        module.__loader__ = self._loader
+        spec = getattr(module, "__spec__", None)
+        if spec is not None and spec.loader is self:
+            spec.loader = self._loader
+        module_name = spec.name if spec is not None else module.__name__
+
+        self._loader.exec_module(module)
+        try:
+            self._registry.call(module_name, module)
+        except Exception:
+            log.debug("Failed to call hooks for module %r", module_name, exc_info=True)
+
+
+class ModuleHookFinder(object):
+    """
+    Finder wrapping the loader of the modules with hooks, see :class:`_ImportHookLoader`
+
+    The finder returns right away for the modules without hooks: importing them is not slowed down.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        # The modules being found, when another finder calls back into the import system
+        # DEV: The import system holds a lock per module while finding it
+        self._in_progress = set()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not self.registry.hooks.get(fullname) or fullname in self._in_progress:
+            return None
+
+        self._in_progress.add(fullname)
+        try:
+            spec = self._find_spec(fullname, path, target)
+        finally:
+            self._in_progress.discard(fullname)
+
+        # DEV: Loaders without `exec_module` are deprecated and would not get the module from us
+        if spec is not None and spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _ImportHookLoader(spec.loader, self.registry)
+        return spec
+
+    def _find_spec(self, fullname, path, target):
+        # Find the spec with the finders following us, like the import system would have without us
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                return spec
+        return None
 
 
 def wrapped_import(*args, **kwargs):
@@ -232,6 +278,9 @@ def wrapped_import(*args, **kwargs):
 # Keep track of whether we have patched or not
 _patched = False
 
+# The finder of the modules with hooks in `sys.meta_path`, on Python 3
+_finder = ModuleHookFinder(hooks)
+
 
 def _patch():
     # Only patch once
@@ -241,24 +290,11 @@ def _patch():
 
     # 3.x
     if PY3:
-        # 3.4: https://github.com/python/cpython/blob/3.4/Lib/importlib/_bootstrap.py#L2207-L2231
-        # 3.5: https://github.com/python/cpython/blob/3.5/Lib/importlib/_bootstrap.py#L938-L962
-        # 3.6: https://github.com/python/cpython/blob/3.6/Lib/importlib/_bootstrap.py#L936-L960
-        # 3.7: https://github.com/python/cpython/blob/3.7/Lib/importlib/_bootstrap.py#L948-L972
-        # 3.8: https://github.com/python/cpython/blob/3.8/Lib/importlib/_bootstrap.py#L956-L980
-        # DEV: Python 3 has multiple entrypoints for importing a module, but `_find_and_load_unlocked`
-        #   is a common base/required function needed by anyone to import a module.
-        #   e.g. `__import__` which calls `importlib._bootstrap._find_and_load()`
-        #        `importlib.__import__/importlib._bootstrap.__import__` which calls `importlib._bootstrap._gcd_import()`
-        #        `importlib.import_module` which calls `importliob._bootstrap._gcd_import()`
-        wrapt.wrap_function_wrapper("importlib._bootstrap", "_find_and_load_unlocked", wrapped_find_and_load_unlocked)
-
-        # 3.4: https://github.com/python/cpython/blob/3.4/Lib/importlib/__init__.py#L115-L156
-        # 3.5: https://github.com/python/cpython/blob/3.5/Lib/importlib/__init__.py#L132-L173
-        # 3.6: https://github.com/python/cpython/blob/3.6/Lib/importlib/__init__.py#L132-L173
-        # 3.7: https://github.com/python/cpython/blob/3.7/Lib/importlib/__init__.py#L133-L176
-        # 3.8: https://github.com/python/cpython/blob/3.8/Lib/importlib/__init__.py#L133-L176
-        wrapt.wrap_function_wrapper("importlib", "reload", wrapped_reload)
+        # DEV: Python 3 has multiple entrypoints for importing and reloading a module, e.g. `__import__`,
+        #   `importlib.import_module` or `importlib.reload`, all of them find the spec of the module with
+        #   `sys.meta_path`
+        if _finder not in sys.meta_path:
+            sys.meta_path.insert(0, _finder)
 
     # 2.7
     # DEV: Slightly more direct approach of patching `__import__` and `reload` functions
@@ -298,20 +334,9 @@ def unpatch():
         return
     _patched = False
 
-    # 3.4 -> 3.8
-    # DEV: Explicitly stop at 3.8 in case the functions we are patching change in any way,
-    #      we need to validate them before adding support here
-    if (3, 4) <= sys.version_info <= (3, 8):
-        import importlib
-
-        if isinstance(importlib._bootstrap._find_and_load_unlocked, wrapt.FunctionWrapper):
-            setattr(
-                importlib._bootstrap,
-                "_find_and_load_unlocked",
-                importlib._bootstrap._find_and_load_unlocked.__wrapped__,
-            )
-        if isinstance(importlib.reload, wrapt.FunctionWrapper):
-            setattr(importlib, "reload", importlib.reload.__wrapped__)
+    if PY3:
+        if _finder in sys.meta_path:
+            sys.meta_path.remove(_finder)
 
     # 2.7
     # DEV: Slightly more direct approach
@@ -1,12 +1,7 @@
 import os
+import sys
 import uuid
 
-from .runtime_metrics import (
-    RuntimeTags,
-    RuntimeMetrics,
-    RuntimeWorker,
-)
-
 
 __all__ = [
     "RuntimeTags",
@@ -16,6 +11,25 @@ __all__ = [
 ]
 
 
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        # DEV: The runtime metrics and their collectors are only imported when they are enabled
+        if name in ("RuntimeTags", "RuntimeMetrics", "RuntimeWorker"):
+            from . import runtime_metrics
+
+            return getattr(runtime_metrics, name)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+else:
+    from .runtime_metrics import (
+        RuntimeTags,
+        RuntimeMetrics,
+        RuntimeWorker,
+    )
+
+
 def _generate_runtime_id():
     return uuid.uuid4().hex
 
@@ -29,7 +29,8 @@ class ValueCollector(object):
         self.required_modules = self.required_modules if required_modules is None else required_modules
 
         self._modules_successfully_loaded = False
-        self.modules = self._load_modules()
+        # DEV: do not import the modules of disabled collectors, nor run their hook
+        self.modules = self._load_modules() if self.enabled else None
         if self._modules_successfully_loaded:
             self._on_modules_load()
 
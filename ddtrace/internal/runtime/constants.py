@@ -2,6 +2,26 @@ GC_COUNT_GEN0 = "runtime.python.gc.count.gen0"
 GC_COUNT_GEN1 = "runtime.python.gc.count.gen1"
 GC_COUNT_GEN2 = "runtime.python.gc.count.gen2"
 
+GC_PAUSE_COUNT_GEN0 = "runtime.python.gc.pause.count.gen0"
+GC_PAUSE_COUNT_GEN1 = "runtime.python.gc.pause.count.gen1"
+GC_PAUSE_COUNT_GEN2 = "runtime.python.gc.pause.count.gen2"
+GC_PAUSE_TIME_GEN0 = "runtime.python.gc.pause.time.gen0"
+GC_PAUSE_TIME_GEN1 = "runtime.python.gc.pause.time.gen1"
+GC_PAUSE_TIME_GEN2 = "runtime.python.gc.pause.time.gen2"
+GC_PAUSE_P95_GEN0 = "runtime.python.gc.pause.p95.gen0"
+GC_PAUSE_P95_GEN1 = "runtime.python.gc.pause.p95.gen1"
+GC_PAUSE_P95_GEN2 = "runtime.python.gc.pause.p95.gen2"
+GC_PAUSE_MAX_GEN0 = "runtime.python.gc.pause.max.gen0"
+GC_PAUSE_MAX_GEN1 = "runtime.python.gc.pause.max.gen1"
+GC_PAUSE_MAX_GEN2 = "runtime.python.gc.pause.max.gen2"
+
+ASYNCIO_LOOP_LAG_P95 = "runtime.python.asyncio.loop_lag.p95"
+ASYNCIO_LOOP_LAG_MAX = "runtime.python.asyncio.loop_lag.max"
+ASYNCIO_SLOW_CALLBACK_COUNT = "runtime.python.asyncio.slow_callbacks.count"
+ASYNCIO_SLOW_CALLBACK_TIME = "runtime.python.asyncio.slow_callbacks.time"
+ASYNCIO_TASK_DELAY_P95 = "runtime.python.asyncio.task_delay.p95"
+ASYNCIO_TASK_DELAY_MAX = "runtime.python.asyncio.task_delay.max"
+
 THREAD_COUNT = "runtime.python.thread_count"
 MEM_RSS = "runtime.python.mem.rss"
 CPU_TIME_SYS = "runtime.python.cpu.time.sys"
@@ -10,14 +30,60 @@ CPU_PERCENT = "runtime.python.cpu.percent"
 CTX_SWITCH_VOLUNTARY = "runtime.python.cpu.ctx_switch.voluntary"
 CTX_SWITCH_INVOLUNTARY = "runtime.python.cpu.ctx_switch.involuntary"
 
+SELF_TIME_PREFIX = "runtime.python.ddtrace.self_time."
+SELF_TIME_STACK = SELF_TIME_PREFIX + "stack"
+SELF_TIME_THREADING = SELF_TIME_PREFIX + "threading"
+SELF_TIME_IOWAIT = SELF_TIME_PREFIX + "iowait"
+SELF_TIME_GC = SELF_TIME_PREFIX + "gc"
+SELF_TIME_MEMORY = SELF_TIME_PREFIX + "memory"
+SELF_TIME_MEMALLOC = SELF_TIME_PREFIX + "memalloc"
+SELF_TIME_RECORDER = SELF_TIME_PREFIX + "recorder"
+SELF_TIME_EXPORTER = SELF_TIME_PREFIX + "exporter"
+
 GC_RUNTIME_METRICS = set([GC_COUNT_GEN0, GC_COUNT_GEN1, GC_COUNT_GEN2])
 
+# {generation: (count, time, p95, max)}
+GC_PAUSE_METRICS_BY_GENERATION = {
+    0: (GC_PAUSE_COUNT_GEN0, GC_PAUSE_TIME_GEN0, GC_PAUSE_P95_GEN0, GC_PAUSE_MAX_GEN0),
+    1: (GC_PAUSE_COUNT_GEN1, GC_PAUSE_TIME_GEN1, GC_PAUSE_P95_GEN1, GC_PAUSE_MAX_GEN1),
+    2: (GC_PAUSE_COUNT_GEN2, GC_PAUSE_TIME_GEN2, GC_PAUSE_P95_GEN2, GC_PAUSE_MAX_GEN2),
+}
+
+GC_PAUSE_RUNTIME_METRICS = set(key for keys in GC_PAUSE_METRICS_BY_GENERATION.values() for key in keys)
+
+ASYNCIO_RUNTIME_METRICS = set(
+    [
+        ASYNCIO_LOOP_LAG_P95,
+        ASYNCIO_LOOP_LAG_MAX,
+        ASYNCIO_SLOW_CALLBACK_COUNT,
+        ASYNCIO_SLOW_CALLBACK_TIME,
+        ASYNCIO_TASK_DELAY_P95,
+        ASYNCIO_TASK_DELAY_MAX,
+    ]
+)
+
 PSUTIL_RUNTIME_METRICS = set(
     [THREAD_COUNT, MEM_RSS, CTX_SWITCH_VOLUNTARY, CTX_SWITCH_INVOLUNTARY, CPU_TIME_SYS, CPU_TIME_USER, CPU_PERCENT]
 )
 
+SELF_TIME_RUNTIME_METRICS = set(
+    [
+        SELF_TIME_STACK,
+        SELF_TIME_THREADING,
+        SELF_TIME_IOWAIT,
+        SELF_TIME_GC,
+        SELF_TIME_MEMORY,
+        SELF_TIME_MEMALLOC,
+        SELF_TIME_RECORDER,
+        SELF_TIME_EXPORTER,
+    ]
+)
+
 DEFAULT_RUNTIME_METRICS = GC_RUNTIME_METRICS | PSUTIL_RUNTIME_METRICS
 
+# Metrics only reported when the feature they measure is used or enabled
+OPTIONAL_RUNTIME_METRICS = GC_PAUSE_RUNTIME_METRICS | ASYNCIO_RUNTIME_METRICS | SELF_TIME_RUNTIME_METRICS
+
 SERVICE = "service"
 ENV = "env"
 LANG_INTERPRETER = "lang_interpreter"
@@ -1,10 +1,20 @@
 import os
+import sys
 
+from ...utils.formats import asbool, get_env
+from ..histogram import DurationHistogram
 from .collector import ValueCollector
 from .constants import (
+    ASYNCIO_LOOP_LAG_MAX,
+    ASYNCIO_LOOP_LAG_P95,
+    ASYNCIO_SLOW_CALLBACK_COUNT,
+    ASYNCIO_SLOW_CALLBACK_TIME,
+    ASYNCIO_TASK_DELAY_MAX,
+    ASYNCIO_TASK_DELAY_P95,
     GC_COUNT_GEN0,
     GC_COUNT_GEN1,
     GC_COUNT_GEN2,
+    GC_PAUSE_METRICS_BY_GENERATION,
     THREAD_COUNT,
     MEM_RSS,
     CTX_SWITCH_VOLUNTARY,
@@ -12,6 +22,8 @@ from .constants import (
     CPU_TIME_SYS,
     CPU_TIME_USER,
     CPU_PERCENT,
+    SELF_TIME_PREFIX,
+    SELF_TIME_RUNTIME_METRICS,
 )
 
 
@@ -41,6 +53,75 @@ class GCRuntimeMetricCollector(RuntimeMetricCollector):
         return metrics
 
 
+class GCPauseRuntimeMetricCollector(RuntimeMetricCollector):
+    """Collector for garbage collection pauses
+
+    Each collection is timed using `gc.callbacks`. For each generation, the number of collections, the total pause time
+    and the 95th percentile and maximum pause times since the last collection are reported, in seconds. The percentile
+    and maximum are the upper bounds of the histogram buckets they fall in.
+
+    Disabled unless ``DD_RUNTIME_METRICS_GC_PAUSE_ENABLED`` is set. When disabled, no garbage collector callback is
+    installed.
+    """
+
+    enabled = asbool(get_env("runtime_metrics", "gc_pause_enabled", default=False))
+    required_modules = ["ddtrace.internal.gcpause"]
+
+    def _on_modules_load(self):
+        tracker = self.modules["ddtrace.internal.gcpause"].tracker
+        tracker.install()
+        self._last_stats = tracker.snapshot()
+
+    def collect_fn(self, keys):
+        stats = self.modules["ddtrace.internal.gcpause"].tracker.snapshot()
+
+        metrics = []
+        for generation, (count_key, time_key, p95_key, max_key) in GC_PAUSE_METRICS_BY_GENERATION.items():
+            window = stats[generation] - self._last_stats[generation]
+            metrics.extend(
+                [
+                    (count_key, window.count),
+                    (time_key, window.total_ns / 1e9),
+                    (p95_key, window.percentile(95) / 1e9),
+                    (max_key, window.percentile(100) / 1e9),
+                ]
+            )
+
+        self._last_stats = stats
+        return metrics
+
+
+class AsyncioRuntimeMetricCollector(RuntimeMetricCollector):
+    """Collector for the asyncio event loop monitor
+
+    The event loop lag and task delay percentiles and the slow callbacks since the last collection are reported, in
+    seconds. This does not import the monitor: nothing is reported until the application starts it.
+    """
+
+    def _on_modules_load(self):
+        self._last_stats = None
+
+    def collect_fn(self, keys):
+        loop_monitor = getattr(sys.modules.get("ddtrace.contrib.asyncio.monitor"), "loop_monitor", None)
+        if loop_monitor is None or not loop_monitor.running:
+            self._last_stats = None
+            return []
+
+        stats = loop_monitor.snapshot()
+        last_stats = self._last_stats or (DurationHistogram(),) * len(stats)
+        lag, slow_callbacks, task_delay = (current - last for current, last in zip(stats, last_stats))
+        self._last_stats = stats
+
+        return [
+            (ASYNCIO_LOOP_LAG_P95, lag.percentile(95) / 1e9),
+            (ASYNCIO_LOOP_LAG_MAX, lag.percentile(100) / 1e9),
+            (ASYNCIO_SLOW_CALLBACK_COUNT, slow_callbacks.count),
+            (ASYNCIO_SLOW_CALLBACK_TIME, slow_callbacks.total_ns / 1e9),
+            (ASYNCIO_TASK_DELAY_P95, task_delay.percentile(95) / 1e9),
+            (ASYNCIO_TASK_DELAY_MAX, task_delay.percentile(100) / 1e9),
+        ]
+
+
 class PSUtilRuntimeMetricCollector(RuntimeMetricCollector):
     """Collector for psutil metrics.
 
@@ -92,3 +173,28 @@ class PSUtilRuntimeMetricCollector(RuntimeMetricCollector):
             ]
 
             return metrics
+
+
+class SelfTimeRuntimeMetricCollector(RuntimeMetricCollector):
+    """Collector for the CPU time used by ddtrace components (e.g. the profiler collectors and exporter).
+
+    The values are the CPU time in seconds used since the last collection. Only the components which accounted for
+    CPU time are reported: nothing is reported unless the profiler runs.
+    """
+
+    required_modules = ["ddtrace.internal.selftime"]
+
+    def _on_modules_load(self):
+        self._last_self_time = {}
+
+    def collect_fn(self, keys):
+        self_time = self.modules["ddtrace.internal.selftime"].snapshot()
+
+        metrics = []
+        for component, cpu_time_ns in self_time.items():
+            key = SELF_TIME_PREFIX + component
+            if key in SELF_TIME_RUNTIME_METRICS:
+                metrics.append((key, (cpu_time_ns - self._last_self_time.get(component, 0)) / 1e9))
+
+        self._last_self_time = self_time
+        return metrics
@@ -6,10 +6,14 @@ from ..logger import get_logger
 from .constants import (
     DEFAULT_RUNTIME_METRICS,
     DEFAULT_RUNTIME_TAGS,
+    OPTIONAL_RUNTIME_METRICS,
 )
 from .metric_collectors import (
+    AsyncioRuntimeMetricCollector,
+    GCPauseRuntimeMetricCollector,
     GCRuntimeMetricCollector,
     PSUtilRuntimeMetricCollector,
+    SelfTimeRuntimeMetricCollector,
 )
 from .tag_collectors import (
     PlatformTagCollector,
@@ -45,10 +49,13 @@ class RuntimeTags(RuntimeCollectorsIterable):
 
 
 class RuntimeMetrics(RuntimeCollectorsIterable):
-    ENABLED = DEFAULT_RUNTIME_METRICS
+    ENABLED = DEFAULT_RUNTIME_METRICS | OPTIONAL_RUNTIME_METRICS
     COLLECTORS = [
         GCRuntimeMetricCollector,
+        GCPauseRuntimeMetricCollector,
+        AsyncioRuntimeMetricCollector,
         PSUtilRuntimeMetricCollector,
+        SelfTimeRuntimeMetricCollector,
     ]
 
 
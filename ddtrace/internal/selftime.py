@@ -0,0 +1,99 @@
+"""
+Accounting of the CPU time spent by ddtrace itself.
+
+Components (e.g. the profiler stack collector or exporter) report how much CPU time they used, measured with the
+thread CPU clock of the thread doing the work. The totals can then be exported with profiles and runtime metrics to
+show the real overhead of the library.
+"""
+import threading
+import weakref
+
+from .. import compat
+
+
+__all__ = [
+    "add",
+    "reset",
+    "snapshot",
+    "thread_time_ns",
+]
+
+
+thread_time_ns = compat.thread_time_ns
+
+# DEV: Each thread accumulates the CPU time it used in its own dict, without any lock, so that the accounting does
+#   not add contention to the code it measures. The lock is only taken to read the totals and when a thread exits.
+_local = threading.local()
+# {weak reference to the key of a thread: {component: cumulative CPU time in nanoseconds}}
+_threads = {}
+# {component: cumulative CPU time in nanoseconds} of the threads that exited
+_exited = {}
+_lock = None
+
+
+class _ThreadKey(object):
+    """Object only referenced by the thread-local storage, collected when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _get_lock():
+    global _lock
+
+    if _lock is None:
+        # DEV: Only the profiler accounts for CPU time: this does not import it when there is nothing to read. Its
+        #   locks are neither patched by gevent nor profiled.
+        from ddtrace.profiling import _nogevent
+
+        _lock = _nogevent.Lock()
+    return _lock
+
+
+def _register():
+    key = _local.key = _ThreadKey()
+    counts = _local.counts = {}
+    _threads[weakref.ref(key, _unregister)] = counts
+    return counts
+
+
+def _unregister(ref):
+    with _get_lock():
+        for component, cpu_time_ns in _threads.pop(ref, {}).items():
+            _exited[component] = _exited.get(component, 0) + cpu_time_ns
+
+
+def add(component, cpu_time_ns):
+    """Account for CPU time spent by a component in the current thread.
+
+    :param component: The name of the component that used the CPU time.
+    :param cpu_time_ns: The CPU time used, in nanoseconds.
+    """
+    try:
+        counts = _local.counts
+    except AttributeError:
+        counts = _register()
+    counts[component] = counts.get(component, 0) + cpu_time_ns
+
+
+def snapshot():
+    """Return the cumulative CPU time used by each component.
+
+    :return: A dict of {component: CPU time in nanoseconds}.
+    """
+    if not _threads and not _exited:
+        return {}
+
+    with _get_lock():
+        self_time = _exited.copy()
+        for counts in list(_threads.values()):
+            for component, cpu_time_ns in counts.copy().items():
+                self_time[component] = self_time.get(component, 0) + cpu_time_ns
+    return self_time
+
+
+def reset():
+    """Forget all the CPU time accounted so far."""
+    with _get_lock():
+        _exited.clear()
+        for counts in list(_threads.values()):
+            counts.clear()
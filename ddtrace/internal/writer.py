@@ -1,6 +1,8 @@
 # stdlib
+import collections
 import itertools
 import os
+import random
 import sys
 import threading
 import time
@@ -13,7 +15,9 @@ from ..sampler import BasePrioritySampler
 from ..settings import config
 from ..encoding import JSONEncoderV2
 from ..payload import PayloadFull
+from ..utils.formats import get_env
 from . import _queue
+from .rate_limiter import RateLimiter
 
 log = get_logger(__name__)
 
@@ -21,6 +25,30 @@ log = get_logger(__name__)
 DEFAULT_TIMEOUT = 5
 LOG_ERR_INTERVAL = 60
 
+# Status codes of the responses of an agent which could accept the payload later
+RETRYABLE_STATUSES = (408, 429)
+
+
+def _retryable(response):
+    """Return whether sending the payload of a response again could succeed."""
+    if isinstance(response, PayloadFull):
+        return False
+    if isinstance(response, Exception):
+        return True
+    return response.status in RETRYABLE_STATUSES or response.status >= 500
+
+
+class _Retry(object):
+    """A payload waiting to be sent again."""
+
+    __slots__ = ("payload", "attempts", "due")
+
+    def __init__(self, payload, attempts, due):
+        self.payload = payload
+        self.attempts = attempts
+        # The monotonic time after which the payload can be sent again
+        self.due = due
+
 
 class LogWriter:
     def __init__(self, out=sys.stdout, sampler=None, priority_sampler=None):
@@ -53,6 +81,16 @@ class AgentWriter(_worker.PeriodicWorkerThread):
     QUEUE_PROCESSING_INTERVAL = 1
     QUEUE_MAX_TRACES_DEFAULT = 1000
 
+    # Delays, in seconds, before sending a failed payload again: the first one, doubled after each attempt, up to the
+    # maximum. Half of each delay is random so that the writers of many processes do not retry at the same time.
+    RETRY_BACKOFF_BASE = 1
+    RETRY_BACKOFF_MAX = 10
+
+    # Delays, in seconds, before probing the agent once the circuit breaker is open: the first one, doubled after each
+    # failed probe, up to the maximum
+    CIRCUIT_BREAKER_PROBE_BASE = 1
+    CIRCUIT_BREAKER_PROBE_MAX = 30
+
     def __init__(
         self,
         hostname="localhost",
@@ -70,6 +108,22 @@ class AgentWriter(_worker.PeriodicWorkerThread):
         # DEV: provide a _temporary_ solution to allow users to specify a custom max
         maxsize = int(os.getenv("DD_TRACE_MAX_TPS", self.QUEUE_MAX_TRACES_DEFAULT))
         self._trace_queue = _queue.TraceQueue(maxsize=maxsize)
+        # The payloads which failed to be sent, in the order they failed, kept encoded to be sent again
+        # DEV: They are only used by the writer thread, the producers of traces never wait for them
+        self._retries = collections.deque()
+        self._retries_size = 0
+        self._max_retries = int(get_env("trace", "writer_max_retries", default=3))
+        self._max_retries_size = int(get_env("trace", "writer_max_retry_bytes", default=10 * 1000000))
+        self._retry_budget = RateLimiter(int(get_env("trace", "writer_retry_budget", default=10)))
+        self._retries_dropped = 0
+        self._retries_throttled = 0
+        # The circuit breaker opens after consecutive connection failures: nothing is encoded nor sent until a probe
+        # of the agent succeeds
+        self._circuit_breaker_threshold = int(get_env("trace", "writer_circuit_breaker_threshold", default=3))
+        self._circuit_open = False
+        self._connection_failures = 0
+        self._probe_delay = 0
+        self._next_probe = 0
         self._sampler = sampler
         self._priority_sampler = priority_sampler
         self._last_error_ts = 0
@@ -116,10 +170,144 @@ class AgentWriter(_worker.PeriodicWorkerThread):
         if spans:
             self._trace_queue.put(spans)
 
+    def _send_retries(self):
+        """Send again the payloads due for a retry, and return the responses."""
+        if not self._retries:
+            return []
+
+        now = compat.monotonic()
+        responses = []
+        # DEV: The payloads waiting are put back at the end of the queue, which keeps them in order
+        for _ in range(len(self._retries)):
+            # The oldest payloads can be given up to make room for the ones failing again
+            if not self._retries:
+                break
+            retry = self._retries.popleft()
+            # DEV: Once a retry failed, the agent is likely still unavailable: the other payloads wait for their
+            #   next attempt rather than for the timeout of each request
+            if retry.due > now or (responses and _retryable(responses[-1])):
+                self._retries.append(retry)
+                continue
+            if not self._retry_budget.is_allowed():
+                self._retries_throttled += 1
+                self._retries.append(retry)
+                continue
+            self._retries_size -= retry.payload.size
+            response = self.api.send_payload(retry.payload)
+            responses.append(response)
+            self._retry(response, retry.attempts)
+        return responses
+
+    def _retry(self, response, attempts=0):
+        """Schedule another attempt at sending the payload of a failed response, if it can be retried."""
+        if not _retryable(response):
+            return
+        payload = getattr(response, "payload", None)
+        if payload is None:
+            return
+
+        if attempts >= self._max_retries or payload.size > self._max_retries_size:
+            self._retries_dropped += payload.length
+            return
+
+        # Make room for the payload by giving up on the oldest ones
+        while self._retries_size + payload.size > self._max_retries_size:
+            dropped = self._retries.popleft()
+            self._retries_size -= dropped.payload.size
+            self._retries_dropped += dropped.payload.length
+
+        backoff = min(self.RETRY_BACKOFF_MAX, self.RETRY_BACKOFF_BASE * 2 ** attempts)
+        due = compat.monotonic() + backoff / 2.0 + random.uniform(0, backoff / 2.0)
+        self._retries.append(_Retry(payload, attempts + 1, due))
+        self._retries_size += payload.size
+
+    def _record_connection(self, response):
+        """Count the consecutive connection failures, and open the circuit breaker past the threshold."""
+        if not isinstance(response, Exception):
+            self._connection_failures = 0
+            return
+
+        self._connection_failures += 1
+        if (
+            self._circuit_open
+            or self._circuit_breaker_threshold <= 0
+            or self._connection_failures < self._circuit_breaker_threshold
+        ):
+            return
+
+        log.warning(
+            "Failed to connect to Datadog Agent at %s %d times in a row, "
+            "traces are kept in the queue until it is reachable again",
+            self.api,
+            self._connection_failures,
+        )
+        self._circuit_open = True
+        self._probe_delay = self.CIRCUIT_BREAKER_PROBE_BASE
+        self._next_probe = compat.monotonic() + self._probe_delay
+        if self._send_stats:
+            self.dogstatsd.increment("datadog.tracer.circuit_breaker.opened")
+
+    def _probe(self):
+        """Probe the agent if it is time to, and return whether the circuit breaker closed."""
+        now = compat.monotonic()
+        if now < self._next_probe:
+            return False
+
+        response = self.api.ping()
+        if self._send_stats:
+            self.dogstatsd.increment(
+                "datadog.tracer.circuit_breaker.probes",
+                tags=["result:%s" % ("failure" if isinstance(response, Exception) else "success")],
+            )
+        if isinstance(response, Exception):
+            self._probe_delay = min(self.CIRCUIT_BREAKER_PROBE_MAX, self._probe_delay * 2)
+            self._next_probe = now + self._probe_delay
+            return False
+
+        log.debug("Datadog Agent at %s is reachable again", self.api)
+        self._circuit_open = False
+        self._connection_failures = 0
+        return True
+
+    def _handle_response(self, response):
+        if isinstance(response, PayloadFull):
+            return
+        self._record_connection(response)
+        if isinstance(response, Exception) or response.status >= 400:
+            self._log_error_status(response)
+        elif self._priority_sampler or isinstance(self._sampler, BasePrioritySampler):
+            result_traces_json = response.get_json()
+            if result_traces_json and "rate_by_service" in result_traces_json:
+                if self._priority_sampler:
+                    self._priority_sampler.update_rate_by_service_sample_rates(
+                        result_traces_json["rate_by_service"],
+                    )
+                if isinstance(self._sampler, BasePrioritySampler):
+                    self._sampler.update_rate_by_service_sample_rates(
+                        result_traces_json["rate_by_service"],
+                    )
+
     def flush_queue(self):
+        if self._circuit_open and not self._probe():
+            # DEV: The traces are left in the queue, which drops traces once full, rather than encoded for nothing
+            if self._trace_queue.maxsize <= 0:
+                dropped = len(self._trace_queue.get())
+                if self._send_stats:
+                    self.dogstatsd.increment("datadog.tracer.circuit_breaker.dropped.traces", dropped)
+            if self._send_stats:
+                self._retries_stats([])
+            return
+
+        # The payloads which failed before are sent first, even when there are no new traces
+        retries_responses = self._send_retries()
+        for response in retries_responses:
+            self._handle_response(response)
+
         traces = self._trace_queue.get()
 
         if not traces:
+            if self._send_stats:
+                self._retries_stats(retries_responses)
             return
 
         if self._send_stats:
@@ -129,24 +317,11 @@ class AgentWriter(_worker.PeriodicWorkerThread):
         # If we have data, let's try to send it.
         traces_responses = self.api.send_traces(traces)
         for response in traces_responses:
-            if not isinstance(response, PayloadFull):
-                if isinstance(response, Exception) or response.status >= 400:
-                    self._log_error_status(response)
-                elif self._priority_sampler or isinstance(self._sampler, BasePrioritySampler):
-                    result_traces_json = response.get_json()
-                    if result_traces_json and "rate_by_service" in result_traces_json:
-                        if self._priority_sampler:
-                            self._priority_sampler.update_rate_by_service_sample_rates(
-                                result_traces_json["rate_by_service"],
-                            )
-                        if isinstance(self._sampler, BasePrioritySampler):
-                            self._sampler.update_rate_by_service_sample_rates(
-                                result_traces_json["rate_by_service"],
-                            )
+            self._handle_response(response)
+            self._retry(response)
 
         # Dump statistics
-        # NOTE: Do not use the buffering of dogstatsd as it's not thread-safe
-        # https://github.com/DataDog/datadogpy/issues/439
+        # NOTE: The metrics are aggregated by the client and sent at the end of `run_periodic`
         if self._send_stats:
             # Statistics about the queue length, size and number of spans
             self.dogstatsd.increment("datadog.tracer.flushes")
@@ -181,6 +356,25 @@ class AgentWriter(_worker.PeriodicWorkerThread):
                 self._last_thread_time = new_thread_time
                 self.dogstatsd.histogram("datadog.tracer.writer.cpu_time", diff)
 
+            self._retries_stats(retries_responses)
+
+    def _retries_stats(self, retries_responses):
+        # DEV: Only reported once a payload failed to be sent, retries are unused while the agent is available
+        if not (retries_responses or self._retries or self._retries_dropped or self._retries_throttled):
+            return
+
+        self._histogram_with_total("datadog.tracer.api.retries", len(retries_responses))
+        self._histogram_with_total(
+            "datadog.tracer.api.retries.errors",
+            len(list(r for r in retries_responses if isinstance(r, Exception) or r.status >= 400)),
+        )
+        self.dogstatsd.gauge("datadog.tracer.retries.pending.payloads", len(self._retries))
+        self.dogstatsd.gauge("datadog.tracer.retries.pending.bytes", self._retries_size)
+        self.dogstatsd.increment("datadog.tracer.retries.dropped.traces", self._retries_dropped)
+        self.dogstatsd.increment("datadog.tracer.retries.throttled", self._retries_throttled)
+        self._retries_dropped = 0
+        self._retries_throttled = 0
+
     def _histogram_with_total(self, name, value, tags=None):
         """Helper to add metric as a histogram and with a `.total` counter"""
         self.dogstatsd.histogram(name, value, tags=tags)
@@ -199,9 +393,11 @@ class AgentWriter(_worker.PeriodicWorkerThread):
             # Statistics about the rate at which spans are inserted in the queue
             dropped, enqueued, enqueued_lengths = self._trace_queue.pop_stats()
             self.dogstatsd.gauge("datadog.tracer.queue.max_length", self._trace_queue.maxsize)
+            self.dogstatsd.gauge("datadog.tracer.circuit_breaker.open", int(self._circuit_open))
             self.dogstatsd.increment("datadog.tracer.queue.dropped.traces", dropped)
             self.dogstatsd.increment("datadog.tracer.queue.enqueued.traces", enqueued)
             self.dogstatsd.increment("datadog.tracer.queue.enqueued.spans", enqueued_lengths)
+            self._flush_stats()
 
     def on_shutdown(self):
         try:
@@ -211,6 +407,13 @@ class AgentWriter(_worker.PeriodicWorkerThread):
                 return
 
             self.dogstatsd.increment("datadog.tracer.shutdown")
+            self._flush_stats()
+
+    def _flush_stats(self):
+        # Only the aggregating client buffers the metrics, a user-provided DogStatsd client sends them right away
+        flush = getattr(self.dogstatsd, "flush", None)
+        if flush is not None:
+            flush()
 
     def _log_error_status(self, response):
         log_level = log.debug
@@ -11,8 +11,8 @@ import os
 import sys
 import threading
 
-from ddtrace.vendor.wrapt.importer import when_imported
-
+from . import compat
+from .internal import import_hooks
 from .internal.logger import get_logger
 from .settings import config
 from .utils import formats
@@ -71,22 +71,59 @@ PATCH_MODULES = {
 
 _LOCK = threading.Lock()
 _PATCHED_MODULES = set()
+# Modules which will be patched when one of their trigger modules is imported, see `_PATCH_ON_IMPORT`
+_PENDING_MODULES = set()
 
 # Modules which are patched on first use
 # DEV: These modules are patched when the user first imports them, rather than
 #      explicitly importing and patching them on application startup `ddtrace.patch_all(module=True)`
-# DEV: This ensures we do not patch a module until it is needed
+# DEV: This ensures we do not patch a module until it is needed, and that neither the integration nor the library
+#      are imported by `patch_all` when the application does not use them
 # DEV: <contrib name> => <list of module names that trigger a patch>
 _PATCH_ON_IMPORT = {
+    "aiobotocore": ("aiobotocore.client",),
     "aiohttp": ("aiohttp",),
-    "aiobotocore": ("aiobotocore",),
+    "aiopg": ("aiopg",),
+    "algoliasearch": ("algoliasearch",),
+    "asyncio": ("asyncio",),
+    "boto": ("boto.connection",),
+    "botocore": ("botocore.client",),
+    "bottle": ("bottle",),
+    "cassandra": ("cassandra.cluster",),
     "celery": ("celery",),
-    "flask": ("flask, "),
+    "consul": ("consul",),
+    "django": ("django",),
+    "elasticsearch": ("elasticsearch", "elasticsearch1", "elasticsearch2", "elasticsearch5", "elasticsearch6"),
+    "falcon": ("falcon",),
+    "flask": ("flask",),
+    "futures": ("concurrent.futures",),
     "gevent": ("gevent",),
+    "grpc": ("grpc",),
+    "httplib": ("httplib", "http.client"),
+    "jinja2": ("jinja2",),
+    "kombu": ("kombu.messaging",),
+    "mako": ("mako",),
+    "molten": ("molten",),
+    "mongoengine": ("mongoengine",),
+    "mysql": ("mysql.connector",),
+    "mysqldb": ("MySQLdb",),
+    "psycopg": ("psycopg2",),
+    "pylibmc": ("pylibmc",),
+    "pylons": ("pylons.wsgiapp",),
+    "pymemcache": ("pymemcache",),
+    "pymongo": ("pymongo",),
+    "pymysql": ("pymysql",),
+    "pynamodb": ("pynamodb.connection.base",),
+    "pyodbc": ("pyodbc",),
+    "pyramid": ("pyramid",),
+    "redis": ("redis",),
+    "rediscluster": ("rediscluster",),
     "requests": ("requests",),
-    "botocore": ("botocore",),
-    "elasticsearch": ("elasticsearch",),
-    "pynamodb": ("pynamodb",),
+    "sanic": ("sanic",),
+    "sqlalchemy": ("sqlalchemy",),
+    "sqlite3": ("sqlite3",),
+    "starlette": ("starlette",),
+    "vertica": ("vertica_python",),
 }
 
 
@@ -104,14 +141,33 @@ def _on_import_factory(module, raise_errors=True):
     """Factory to create an import hook for the provided module name"""
 
     def on_import(hook):
+        with _LOCK:
+            _PENDING_MODULES.discard(module)
         # Import and patch module
-        path = "ddtrace.contrib.%s" % module
-        imported_module = importlib.import_module(path)
-        imported_module.patch()
+        patch_module(module, raise_errors=raise_errors)
 
     return on_import
 
 
+def _is_importable(name):
+    """Return whether a module can be imported, only importing its parent packages."""
+    if compat.PY2:
+        # DEV: Python 2 has no way to find a submodule without importing its parent packages either
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            return False
+        return True
+
+    from importlib.util import find_spec
+
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        # A parent package is missing
+        return False
+
+
 def patch_all(**patch_modules):
     """Automatically patches all available modules.
 
@@ -152,27 +208,38 @@ def patch(raise_errors=True, **patch_modules):
     modules = [m for (m, should_patch) in patch_modules.items() if should_patch]
     for module in modules:
         if module in _PATCH_ON_IMPORT:
+            trigger_modules = _PATCH_ON_IMPORT[module]
             # If the module has already been imported then patch immediately
-            if module in sys.modules:
+            if any(name in sys.modules for name in trigger_modules):
+                patch_module(module, raise_errors=raise_errors)
+
+            # Raise right away if the library is not installed, instead of never patching it
+            elif raise_errors and not any(_is_importable(name) for name in trigger_modules):
                 patch_module(module, raise_errors=raise_errors)
 
             # Otherwise, add a hook to patch when it is imported for the first time
             else:
                 # Use factory to create handler to close over `module` and `raise_errors` values from this loop
-                when_imported(module)(_on_import_factory(module, raise_errors))
-
-                # manually add module to patched modules
+                # DEV: Only the imports of the modules with hooks go through the import hooks
+                import_hooks.patch()
+                on_import = _on_import_factory(module, raise_errors)
                 with _LOCK:
-                    _PATCHED_MODULES.add(module)
+                    _PENDING_MODULES.add(module)
+                for name in trigger_modules:
+                    import_hooks.register_module_hook(name, on_import)
         else:
             patch_module(module, raise_errors=raise_errors)
 
     patched_modules = get_patched_modules()
+    with _LOCK:
+        pending_modules = sorted(_PENDING_MODULES)
     log.info(
-        "patched %s/%s modules (%s)",
+        "patched %s/%s modules (%s), %s to patch on import (%s)",
         len(patched_modules),
         len(modules),
         ",".join(patched_modules),
+        len(pending_modules),
+        ",".join(pending_modules),
     )
 
 
@@ -208,7 +275,7 @@ def _patch_module(module):
     """
     path = "ddtrace.contrib.%s" % module
     with _LOCK:
-        if module in _PATCHED_MODULES and module not in _PATCH_ON_IMPORT:
+        if module in _PATCHED_MODULES:
             log.debug("already patched: %s", path)
             return False
 
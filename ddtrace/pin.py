@@ -26,7 +26,7 @@ class Pin(object):
         >>> pin = Pin.override(conn, service='user-db')
         >>> conn = sqlite.connect('/tmp/image.db')
     """
-    __slots__ = ['app', 'tags', 'tracer', '_target', '_config', '_initialized']
+    __slots__ = ['app', 'tags', 'tracer', '_target', '_config', '_span_templates', '_initialized']
 
     @debtcollector.removals.removed_kwarg("app_type")
     def __init__(self, service=None, app=None, app_type=None, tags=None, tracer=None, _config=None):
@@ -40,6 +40,8 @@ class Pin(object):
         self._config = _config or {}
         # [Backward compatibility]: service argument updates the `Pin` config
         self._config['service_name'] = service
+        # {span name: SpanTemplate}, see `ddtrace.contrib.trace_utils.get_span_template`
+        self._span_templates = {}
         self._initialized = True
 
     @property
@@ -136,6 +138,9 @@ class Pin(object):
         """Patch this pin onto the given object. If send is true, it will also
         queue the metadata to be sent to the server.
         """
+        # The span templates may hold tags of the object the pin was attached to, like the host of a client
+        self._span_templates.clear()
+
         # Actually patch it on the object.
         try:
             if hasattr(obj, '__setddpin__'):
@@ -1,4 +1,5 @@
 # -*- encoding: utf-8 -*-
+from ddtrace.internal import selftime
 from ddtrace.profiling import _attr
 from ddtrace.profiling import _periodic
 from ddtrace.profiling import _service
@@ -18,9 +19,17 @@ class PeriodicCollector(Collector, _periodic.PeriodicService):
 
     def periodic(self):
         """Collect events and push them into the recorder."""
-        for events in self.collect():
+        start = selftime.thread_time_ns()
+        all_events = self.collect()
+        selftime.add(self._self_time_component, selftime.thread_time_ns() - start)
+        for events in all_events:
             self.recorder.push_events(events)
 
+    @property
+    def _self_time_component(self):
+        """The name used to account for the CPU time used by this collector."""
+        return self.__class__.__module__.rsplit(".", 1)[-1]
+
     @staticmethod
     def collect():
         """Collect the actual data.
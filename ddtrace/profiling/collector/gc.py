@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+
+from ddtrace.internal import gcpause
+from ddtrace.internal import selftime
+from ddtrace.profiling import _attr
+from ddtrace.profiling import collector
+from ddtrace.profiling import event
+from ddtrace.profiling.collector import _traceback
+from ddtrace.profiling.collector import threading
+from ddtrace.vendor import attr
+
+
+@event.event_class
+class GCPauseEvent(event.StackBasedEvent):
+    """A garbage collection happened."""
+
+    generation = attr.ib(default=None)
+    duration_ns = attr.ib(default=None)
+    sampling_pct = attr.ib(default=None)
+
+
+@attr.s
+class GCCollector(collector.PeriodicCollector):
+    """Record garbage collector pauses and the stacks that triggered them.
+
+    Collections of the youngest generation are frequent and cheap, so they are sampled using `capture_pct`. The other
+    generations are always recorded.
+    """
+
+    # Arbitrary interval to move the events buffered by the garbage collector callback into the recorder
+    _interval = attr.ib(default=0.5, repr=False)
+
+    capture_pct = attr.ib(factory=_attr.from_env("DD_PROFILING_CAPTURE_PCT", 2, float))
+    nframes = attr.ib(factory=_attr.from_env("DD_PROFILING_MAX_FRAMES", 64, int))
+    tracer = attr.ib(default=None)
+    _capture_sampler = attr.ib(
+        default=attr.Factory(collector._create_capture_sampler, takes_self=True), init=False, repr=False
+    )
+    _events = attr.ib(init=False, repr=False, factory=list)
+
+    def start(self):
+        """Start collecting garbage collector pauses."""
+        super(GCCollector, self).start()
+        gcpause.tracker.register(self._on_gc_pause)
+
+    def stop(self):
+        """Stop collecting garbage collector pauses."""
+        gcpause.tracker.unregister(self._on_gc_pause)
+        super(GCCollector, self).stop()
+
+    def _get_trace_and_span_ids(self):
+        """Return current trace and span ids."""
+        if self.tracer is None or not self.tracer.context_provider._has_active_context():
+            return (None, None)
+
+        # DEV: do not use the Context properties, they acquire the context lock which might be held by the code
+        # interrupted by the garbage collector
+        ctxt = self.tracer.context_provider.active()
+        return (
+            None if ctxt._parent_trace_id is None else {ctxt._parent_trace_id},
+            None if ctxt._parent_span_id is None else {ctxt._parent_span_id},
+        )
+
+    def _on_gc_pause(self, generation, duration_ns, frame):
+        if generation == 0:
+            if not self._capture_sampler.capture():
+                return
+            sampling_pct = self.capture_pct
+        else:
+            sampling_pct = 100
+
+        cpu_start = selftime.thread_time_ns()
+        if frame is None:
+            frames, nframes = [], 0
+        else:
+            frames, nframes = _traceback.pyframe_to_frames(frame, self.nframes)
+        thread_id, thread_name = threading._current_thread()
+        trace_ids, span_ids = self._get_trace_and_span_ids()
+        # This runs from the garbage collector: buffer the event rather than pushing it to the recorder, which would
+        # need to acquire its lock
+        self._events.append(
+            GCPauseEvent(
+                generation=generation,
+                duration_ns=duration_ns,
+                frames=frames,
+                nframes=nframes,
+                thread_id=thread_id,
+                thread_name=thread_name,
+                trace_ids=trace_ids,
+                span_ids=span_ids,
+                sampling_pct=sampling_pct,
+            )
+        )
+        selftime.add("gc", selftime.thread_time_ns() - cpu_start)
+
+    def collect(self):
+        events, self._events = self._events, []
+        return (events,)
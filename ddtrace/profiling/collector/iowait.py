@@ -0,0 +1,179 @@
+from __future__ import absolute_import
+
+import os
+import select
+import socket
+import subprocess
+import sys
+import time
+
+from ddtrace.vendor.six.moves import _thread
+
+from ddtrace.vendor import wrapt
+
+from ddtrace import compat
+from ddtrace.internal import selftime
+from ddtrace.profiling import _attr
+from ddtrace.profiling import _periodic
+from ddtrace.profiling import collector
+from ddtrace.profiling import event
+from ddtrace.profiling.collector import _traceback
+from ddtrace.profiling.collector import threading
+from ddtrace.utils import formats
+from ddtrace.vendor import attr
+
+
+@event.event_class
+class IOWaitEvent(event.StackBasedEvent):
+    """A blocking I/O call has returned."""
+
+    io_call = attr.ib(default=None)
+    """The name of the blocking call, e.g. `socket.recv`."""
+
+    wait_time_ns = attr.ib(default=None)
+    sampling_pct = attr.ib(default=None)
+
+
+# Number of frames between `_record` and the code calling the blocking function: our wrapper function and, if wrapt is
+# not compiled, the `FunctionWrapper.__call__` method.
+_CALLER_FRAME_DEPTH = 2 if threading.WRAPT_C_EXT else 3
+
+
+_SOCKET_METHODS = (
+    "accept",
+    "connect",
+    "recv",
+    "recv_into",
+    "recvfrom",
+    "recvfrom_into",
+    "send",
+    "sendall",
+    "sendto",
+)
+
+
+class _ProfiledPoll(wrapt.ObjectProxy):
+    """Proxy for `select.poll` objects, whose `poll` method cannot be patched."""
+
+    def __init__(self, wrapped, wrapper):
+        wrapt.ObjectProxy.__init__(self, wrapped)
+        self._self_poll = wrapt.FunctionWrapper(wrapped.poll, wrapper)
+
+    # Use a property rather than a method so there is no extra frame between the caller and the wrapper
+    @property
+    def poll(self):
+        return self._self_poll
+
+
+@attr.s
+class IOWaitCollector(collector.CaptureSamplerCollector):
+    """Record time spent waiting on blocking calls.
+
+    This covers socket operations, `select.select` and `select.poll`, reads and writes on file descriptors with
+    `os.read` and `os.write`, waiting for subprocesses and `time.sleep`.
+    """
+
+    nframes = attr.ib(factory=_attr.from_env("DD_PROFILING_MAX_FRAMES", 64, int))
+    ignore_profiler = attr.ib(factory=_attr.from_env("DD_PROFILING_IGNORE_PROFILER", True, formats.asbool))
+    tracer = attr.ib(default=None)
+    _originals = attr.ib(init=False, repr=False, factory=list)
+
+    def start(self):
+        """Start collecting blocking calls."""
+        super(IOWaitCollector, self).start()
+        self.patch()
+
+    def stop(self):
+        """Stop collecting blocking calls."""
+        self.unpatch()
+        super(IOWaitCollector, self).stop()
+
+    @staticmethod
+    def _targets():
+        """Return the list of (owner, attribute name, call name) to patch."""
+        targets = [(socket.socket, name, "socket." + name) for name in _SOCKET_METHODS]
+        targets.extend(
+            (
+                (select, "select", "select.select"),
+                (os, "read", "os.read"),
+                (os, "write", "os.write"),
+                (subprocess.Popen, "wait", "subprocess.wait"),
+                (time, "sleep", "time.sleep"),
+            )
+        )
+        return targets
+
+    def patch(self):
+        """Patch the blocking functions."""
+        for owner, name, io_call in self._targets():
+            # Keep what the owner defines itself: socket methods are inherited from `_socket.socket` and
+            # must be restored by deleting the attribute.
+            self._originals.append((owner, name, owner.__dict__.get(name)))
+            setattr(owner, name, wrapt.FunctionWrapper(getattr(owner, name), self._make_wrapper(io_call)))
+
+        if hasattr(select, "poll"):
+            poll_wrapper = self._make_wrapper("select.poll")
+
+            def _poll(wrapped, instance, args, kwargs):
+                return _ProfiledPoll(wrapped(*args, **kwargs), poll_wrapper)
+
+            self._originals.append((select, "poll", select.poll))
+            select.poll = wrapt.FunctionWrapper(select.poll, _poll)
+
+    def unpatch(self):
+        """Unpatch the blocking functions."""
+        for owner, name, original in reversed(self._originals):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._originals = []
+
+    def _get_trace_and_span_ids(self):
+        """Return current trace and span ids."""
+        if self.tracer is None:
+            return (None, None)
+
+        ctxt = self.tracer.get_call_context()
+        return (
+            None if ctxt.trace_id is None else {ctxt.trace_id},
+            None if ctxt.span_id is None else {ctxt.span_id},
+        )
+
+    def _record(self, io_call, start):
+        end = compat.monotonic_ns()
+        cpu_start = selftime.thread_time_ns()
+        thread_id, thread_name = threading._current_thread()
+        frames, nframes = _traceback.pyframe_to_frames(sys._getframe(_CALLER_FRAME_DEPTH), self.nframes)
+        trace_ids, span_ids = self._get_trace_and_span_ids()
+        io_event = IOWaitEvent(
+            io_call=io_call,
+            frames=frames,
+            nframes=nframes,
+            thread_id=thread_id,
+            thread_name=thread_name,
+            trace_ids=trace_ids,
+            span_ids=span_ids,
+            wait_time_ns=end - start,
+            sampling_pct=self.capture_pct,
+        )
+        selftime.add("iowait", selftime.thread_time_ns() - cpu_start)
+        self.recorder.push_event(io_event)
+
+    def _make_wrapper(self, io_call):
+        def _wrapper(wrapped, instance, args, kwargs):
+            if not self._capture_sampler.capture() or (
+                self.ignore_profiler and _thread.get_ident() in _periodic.PERIODIC_THREADS
+            ):
+                return wrapped(*args, **kwargs)
+
+            start = compat.monotonic_ns()
+            try:
+                return wrapped(*args, **kwargs)
+            finally:
+                try:
+                    self._record(io_call, start)
+                except Exception:
+                    pass
+
+        return _wrapper
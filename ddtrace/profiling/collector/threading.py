@@ -9,6 +9,7 @@ from ddtrace.vendor.six.moves import _thread
 from ddtrace.vendor import wrapt
 
 from ddtrace import compat
+from ddtrace.internal import selftime
 from ddtrace.profiling import _attr
 from ddtrace.profiling import collector
 from ddtrace.profiling import event
@@ -97,22 +98,23 @@ class _ProfiledLock(wrapt.ObjectProxy):
         finally:
             try:
                 end = self._self_acquired_at = compat.monotonic_ns()
+                cpu_start = selftime.thread_time_ns()
                 thread_id, thread_name = _current_thread()
                 frames, nframes = _traceback.pyframe_to_frames(sys._getframe(1), self._self_max_nframes)
                 trace_ids, span_ids = self._get_trace_and_span_ids()
-                self._self_recorder.push_event(
-                    LockAcquireEvent(
-                        lock_name=self._self_name,
-                        frames=frames,
-                        nframes=nframes,
-                        thread_id=thread_id,
-                        thread_name=thread_name,
-                        trace_ids=trace_ids,
-                        span_ids=span_ids,
-                        wait_time_ns=end - start,
-                        sampling_pct=self._self_capture_sampler.capture_pct,
-                    )
+                event = LockAcquireEvent(
+                    lock_name=self._self_name,
+                    frames=frames,
+                    nframes=nframes,
+                    thread_id=thread_id,
+                    thread_name=thread_name,
+                    trace_ids=trace_ids,
+                    span_ids=span_ids,
+                    wait_time_ns=end - start,
+                    sampling_pct=self._self_capture_sampler.capture_pct,
                 )
+                selftime.add("threading", selftime.thread_time_ns() - cpu_start)
+                self._self_recorder.push_event(event)
             except Exception:
                 pass
 
@@ -124,22 +126,23 @@ class _ProfiledLock(wrapt.ObjectProxy):
                 if hasattr(self, "_self_acquired_at"):
                     try:
                         end = compat.monotonic_ns()
+                        cpu_start = selftime.thread_time_ns()
                         frames, nframes = _traceback.pyframe_to_frames(sys._getframe(1), self._self_max_nframes)
                         thread_id, thread_name = _current_thread()
                         trace_ids, span_ids = self._get_trace_and_span_ids()
-                        self._self_recorder.push_event(
-                            LockReleaseEvent(
-                                lock_name=self._self_name,
-                                frames=frames,
-                                nframes=nframes,
-                                thread_id=thread_id,
-                                thread_name=thread_name,
-                                trace_ids=trace_ids,
-                                span_ids=span_ids,
-                                locked_for_ns=end - self._self_acquired_at,
-                                sampling_pct=self._self_capture_sampler.capture_pct,
-                            )
+                        event = LockReleaseEvent(
+                            lock_name=self._self_name,
+                            frames=frames,
+                            nframes=nframes,
+                            thread_id=thread_id,
+                            thread_name=thread_name,
+                            trace_ids=trace_ids,
+                            span_ids=span_ids,
+                            locked_for_ns=end - self._self_acquired_at,
+                            sampling_pct=self._self_capture_sampler.capture_pct,
                         )
+                        selftime.add("threading", selftime.thread_time_ns() - cpu_start)
+                        self._self_recorder.push_event(event)
                     finally:
                         del self._self_acquired_at
             except Exception:
@@ -12,8 +12,11 @@ from ddtrace.vendor import six
 
 from ddtrace.profiling import _line2def
 from ddtrace.profiling import exporter
+from ddtrace.profiling import scheduler
 from ddtrace.vendor import attr
 from ddtrace.profiling.collector import exceptions
+from ddtrace.profiling.collector import gc
+from ddtrace.profiling.collector import iowait
 from ddtrace.profiling.collector import memalloc
 from ddtrace.profiling.collector import memory
 from ddtrace.profiling.collector import stack
@@ -206,6 +209,41 @@ class _PprofConverter(object):
             sum(e.locked_for_ns for e in events) / sampling_ratio
         )
 
+    def convert_io_wait_event(
+        self, io_call, thread_id, thread_name, trace_id, span_id, frames, nframes, events, sampling_ratio
+    ):
+        location_key = (
+            self._to_locations(frames, nframes),
+            (
+                ("thread id", str(thread_id)),
+                ("thread name", thread_name),
+                ("trace id", trace_id),
+                ("span id", span_id),
+                ("io call", io_call),
+            ),
+        )
+
+        self._location_values[location_key]["io-wait"] = len(events)
+        self._location_values[location_key]["io-wait-time"] = int(sum(e.wait_time_ns for e in events) / sampling_ratio)
+
+    def convert_gc_pause_event(self, generation, thread_id, thread_name, trace_id, span_id, frames, nframes, events):
+        location_key = (
+            self._to_locations(frames, nframes),
+            (
+                ("thread id", str(thread_id)),
+                ("thread name", thread_name),
+                ("trace id", trace_id),
+                ("span id", span_id),
+                ("gc generation", str(generation)),
+            ),
+        )
+
+        self._location_values[location_key]["gc-pauses"] = len(events)
+        # Young generation pauses are sampled: scale each of them with its own sampling ratio
+        self._location_values[location_key]["gc-pause-time"] = int(
+            sum(e.duration_ns * 100.0 / e.sampling_pct for e in events)
+        )
+
     def convert_stack_exception_event(
         self, thread_id, thread_native_id, thread_name, trace_id, span_id, frames, nframes, exc_type_name, events
     ):
@@ -229,7 +267,7 @@ class _PprofConverter(object):
         self._location_values[location_key]["alloc-samples"] = int(stats.count / sampling_ratio)
         self._location_values[location_key]["alloc-space"] = int(stats.size / sampling_ratio)
 
-    def _build_profile(self, start_time_ns, duration_ns, period, sample_types, program_name):
+    def _build_profile(self, start_time_ns, duration_ns, period, sample_types, program_name, comments=()):
         pprof_sample_type = [
             pprof_pb2.ValueType(type=self._str(type_), unit=self._str(unit)) for type_, unit in sample_types
         ]
@@ -245,6 +283,8 @@ class _PprofConverter(object):
 
         period_type = pprof_pb2.ValueType(type=self._str("time"), unit=self._str("nanoseconds"))
 
+        comment = [self._str(c) for c in comments]
+
         # WARNING: no code should use _str() here as once the _string_table is serialized below,
         # it won't be updated if you call _str later in the code here
         return pprof_pb2.Profile(
@@ -264,6 +304,7 @@ class _PprofConverter(object):
             duration_nanos=duration_ns,
             period=period,
             period_type=period_type,
+            comment=comment,
         )
 
 
@@ -334,6 +375,40 @@ class PprofExporter(exporter.Exporter):
             key=self._lock_event_group_key,
         )
 
+    def _io_wait_event_group_key(self, event):
+        return (
+            event.io_call,
+            event.thread_id,
+            str(event.thread_name),
+            self._get_trace_id(event),
+            self._get_span_id(event),
+            tuple(event.frames),
+            event.nframes,
+        )
+
+    def _group_io_wait_events(self, events):
+        return itertools.groupby(
+            sorted(events, key=self._io_wait_event_group_key),
+            key=self._io_wait_event_group_key,
+        )
+
+    def _gc_pause_event_group_key(self, event):
+        return (
+            event.generation,
+            event.thread_id,
+            str(event.thread_name),
+            self._get_trace_id(event),
+            self._get_span_id(event),
+            tuple(event.frames),
+            event.nframes,
+        )
+
+    def _group_gc_pause_events(self, events):
+        return itertools.groupby(
+            sorted(events, key=self._gc_pause_event_group_key),
+            key=self._gc_pause_event_group_key,
+        )
+
     def _stack_exception_group_key(self, event):
         exc_type = event.exc_type
         exc_type_name = exc_type.__module__ + "." + exc_type.__name__
@@ -446,6 +521,35 @@ class PprofExporter(exporter.Exporter):
                         sampling_ratio_avg,
                     )
 
+        # Handle IOWaitEvent
+        io_wait_events = events.get(iowait.IOWaitEvent, [])
+        if io_wait_events:
+            sampling_ratio_avg = sum(event.sampling_pct for event in io_wait_events) / (len(io_wait_events) * 100.0)
+            for (
+                (io_call, thread_id, thread_name, trace_id, span_id, frames, nframes),
+                iow_events,
+            ) in self._group_io_wait_events(io_wait_events):
+                converter.convert_io_wait_event(
+                    io_call,
+                    thread_id,
+                    thread_name,
+                    trace_id,
+                    span_id,
+                    frames,
+                    nframes,
+                    list(iow_events),
+                    sampling_ratio_avg,
+                )
+
+        # Handle GCPauseEvent
+        for (
+            (generation, thread_id, thread_name, trace_id, span_id, frames, nframes),
+            gc_events,
+        ) in self._group_gc_pause_events(events.get(gc.GCPauseEvent, [])):
+            converter.convert_gc_pause_event(
+                generation, thread_id, thread_name, trace_id, span_id, frames, nframes, list(gc_events)
+            )
+
         # Handle UncaughtExceptionEvent
         for (
             (thread_id, thread_name, frames, nframes, exc_type_name),
@@ -505,6 +609,14 @@ class PprofExporter(exporter.Exporter):
                     list(memalloc_events),
                 )
 
+        # Handle SelfTimeEvent: export the profiler overhead as metadata
+        self_time = collections.defaultdict(int)
+        for event in events.get(scheduler.SelfTimeEvent, []):
+            self_time[event.component] += event.cpu_time_ns
+        comments = [
+            "self-cpu-time-ns.%s=%d" % (component, cpu_time_ns) for component, cpu_time_ns in sorted(self_time.items())
+        ]
+
         # Compute some metadata
         if nb_event:
             period = int(sum_period / nb_event)
@@ -525,6 +637,10 @@ class PprofExporter(exporter.Exporter):
             ("lock-release-hold", "nanoseconds"),
             ("alloc-samples", "count"),
             ("alloc-space", "bytes"),
+            ("io-wait", "count"),
+            ("io-wait-time", "nanoseconds"),
+            ("gc-pauses", "count"),
+            ("gc-pause-time", "nanoseconds"),
         )
 
         return converter._build_profile(
@@ -533,4 +649,5 @@ class PprofExporter(exporter.Exporter):
             period=period,
             sample_types=sample_types,
             program_name=program_name,
+            comments=comments,
         )
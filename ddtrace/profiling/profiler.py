@@ -10,6 +10,8 @@ from ddtrace.utils import deprecation
 from ddtrace.utils import formats
 from ddtrace.vendor import attr
 from ddtrace.profiling.collector import exceptions
+from ddtrace.profiling.collector import gc
+from ddtrace.profiling.collector import iowait
 from ddtrace.profiling.collector import memalloc
 from ddtrace.profiling.collector import memory
 from ddtrace.profiling.collector import stack
@@ -197,6 +199,12 @@ class _ProfilerInstance(object):
             threading.LockCollector(r, tracer=self.tracer),
         ]
 
+        if formats.asbool(os.environ.get("DD_PROFILING_IO_WAIT_ENABLED", "false")):
+            self._collectors.append(iowait.IOWaitCollector(r, tracer=self.tracer))
+
+        if formats.asbool(os.environ.get("DD_PROFILING_GC_ENABLED", "false")):
+            self._collectors.append(gc.GCCollector(r, tracer=self.tracer))
+
         exporters = self._build_default_exporters(self.service, self.env, self.version)
 
         if exporters:
@@ -2,6 +2,7 @@
 import collections
 import os
 
+from ddtrace.internal import selftime
 from ddtrace.profiling import _nogevent
 from ddtrace.vendor import attr
 
@@ -58,10 +59,12 @@ class Recorder(object):
         # 1. the process has forked
         # 2. we don't know the state of _events_lock and it might be unusable — we'd deadlock
         if events and os.getpid() == self._pid:
+            start = selftime.thread_time_ns()
             event_type = events[0].__class__
             with self._events_lock:
                 q = self.events[event_type]
                 q.extend(events)
+            selftime.add("recorder", selftime.thread_time_ns() - start)
 
     def _get_deque_for_event_type(self, event_type):
         return collections.deque(maxlen=self.max_events.get(event_type, self.default_max_events))
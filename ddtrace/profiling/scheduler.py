@@ -2,15 +2,25 @@
 import logging
 
 from ddtrace import compat
+from ddtrace.internal import selftime
 from ddtrace.profiling import _attr
 from ddtrace.profiling import _periodic
 from ddtrace.profiling import _traceback
+from ddtrace.profiling import event
 from ddtrace.profiling import exporter
 from ddtrace.vendor import attr
 
 LOG = logging.getLogger(__name__)
 
 
+@event.event_class
+class SelfTimeEvent(event.Event):
+    """CPU time used by a profiler component since the last export."""
+
+    component = attr.ib(default=None)
+    cpu_time_ns = attr.ib(default=0)
+
+
 @attr.s
 class Scheduler(_periodic.PeriodicService):
     """Schedule export of recorded data."""
@@ -20,6 +30,7 @@ class Scheduler(_periodic.PeriodicService):
     _interval = attr.ib(factory=_attr.from_env("DD_PROFILING_UPLOAD_INTERVAL", 60, float))
     _configured_interval = attr.ib(init=False)
     _last_export = attr.ib(init=False, default=None)
+    _last_self_time = attr.ib(init=False, factory=dict, repr=False)
 
     def __attrs_post_init__(self):
         # Copy the value to use it later since we're going to adjust the real interval
@@ -36,10 +47,12 @@ class Scheduler(_periodic.PeriodicService):
         """Flush events from recorder to exporters."""
         LOG.debug("Flushing events")
         if self.exporters:
+            self._push_self_time_events()
             events = self.recorder.reset()
             start = self._last_export
             self._last_export = compat.time_ns()
             for exp in self.exporters:
+                cpu_start = selftime.thread_time_ns()
                 try:
                     exp.export(events, start, self._last_export)
                 except exporter.ExportError as e:
@@ -49,6 +62,19 @@ class Scheduler(_periodic.PeriodicService):
                         "Unexpected error while exporting events. "
                         "Please report this bug to https://github.com/DataDog/dd-trace-py/issues"
                     )
+                finally:
+                    selftime.add("exporter", selftime.thread_time_ns() - cpu_start)
+
+    def _push_self_time_events(self):
+        """Record the CPU time used by each profiler component since the last flush."""
+        self_time = selftime.snapshot()
+        self.recorder.push_events(
+            [
+                SelfTimeEvent(component=component, cpu_time_ns=cpu_time_ns - self._last_self_time.get(component, 0))
+                for component, cpu_time_ns in self_time.items()
+            ]
+        )
+        self._last_self_time = self_time
 
     def periodic(self):
         start_time = compat.monotonic()
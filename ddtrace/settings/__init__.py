@@ -2,7 +2,7 @@ from .config import Config
 from .exceptions import ConfigException
 from .http import HttpConfig
 from .._hooks import Hooks
-from .integration import IntegrationConfig
+from .integration import IntegrationConfig, IntegrationSettings
 
 # Default global config
 config = Config()
@@ -14,4 +14,5 @@ __all__ = [
     "HttpConfig",
     "Hooks",
     "IntegrationConfig",
+    "IntegrationSettings",
 ]
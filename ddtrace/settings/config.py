@@ -39,6 +39,9 @@ class Config(object):
     available and can be updated by users.
     """
 
+    # Incremented on every change of the configuration, see `_bump_version`
+    _version = 0
+
     def __init__(self):
         # use a dict as underlying storing mechanism
         self._config = {}
@@ -73,12 +76,27 @@ class Config(object):
 
         self.health_metrics_enabled = asbool(get_env("trace", "health_metrics_enabled", default=False))
 
+        self.sql_normalization_enabled = asbool(get_env("trace", "sql_normalization_enabled", default=False))
+
+        self.sql_aggregation_threshold = int(get_env("trace", "sql_aggregation_threshold", default=0))
+
     def __getattr__(self, name):
         if name not in self._config:
             self._config[name] = IntegrationConfig(self, name)
 
         return self._config[name]
 
+    def __setattr__(self, name, value):
+        super(Config, self).__setattr__(name, value)
+        self._bump_version()
+
+    def _bump_version(self):
+        """Invalidate the values computed from the configuration, like the span templates of the integrations.
+
+        Users of these values store the version they were computed with and compute them again when it changes.
+        """
+        object.__setattr__(self, "_version", self._version + 1)
+
     def get_from(self, obj):
         """Retrieves the configuration for the given object.
         Any object that has an attached `Pin` must have a configuration
@@ -120,6 +138,7 @@ class Config(object):
             self._config[integration] = IntegrationConfig(self, integration, _deepmerge(existing, settings))
         else:
             self._config[integration] = IntegrationConfig(self, integration, settings)
+        self._bump_version()
 
     def trace_headers(self, whitelist):
         """
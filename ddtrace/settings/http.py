@@ -1,8 +1,26 @@
+from ..http.headers import REQUEST, RESPONSE, _normalize_tag_name
 from ..internal.logger import get_logger
 from ..utils.http import normalize_header_name
 
 log = get_logger(__name__)
 
+# Spellings of the headers in the WSGI environ not prefixed with HTTP_
+WSGI_UNPREFIXED_HEADERS = {"content-type": "CONTENT_TYPE", "content-length": "CONTENT_LENGTH"}
+
+
+def _header_spellings(header_name):
+    """
+    Returns the usual spellings of a normalized header name, e.g. for 'content-type':
+    'content-type', 'Content-Type', 'CONTENT-TYPE', 'HTTP_CONTENT_TYPE' and 'CONTENT_TYPE'.
+    :param header_name: the normalized header name
+    :type header_name: str
+    :rtype: list of str
+    """
+    spellings = [header_name, header_name.title(), header_name.upper(), "HTTP_" + header_name.upper().replace("-", "_")]
+    if header_name in WSGI_UNPREFIXED_HEADERS:
+        spellings.append(WSGI_UNPREFIXED_HEADERS[header_name])
+    return spellings
+
 
 class HttpConfig(object):
     """
@@ -10,10 +28,19 @@ class HttpConfig(object):
     related to the http context.
     """
 
+    # Incremented on every change of the configuration, see `IntegrationConfig.snapshot`
+    _version = 0
+
     def __init__(self):
         self._whitelist_headers = set()
+        # {request|response: {header spelling: tag name}}, see `_build_header_tags`
+        self._header_tags = {REQUEST: {}, RESPONSE: {}}
         self.trace_query_string = None
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_version", self._version + 1)
+
     @property
     def is_header_tracing_configured(self):
         return len(self._whitelist_headers) > 0
@@ -36,8 +63,33 @@ class HttpConfig(object):
                 continue
             self._whitelist_headers.add(normalized_header_name)
 
+        self._build_header_tags()
         return self
 
+    def _build_header_tags(self):
+        """
+        Precomputes the tag names of the traced headers for each of their usual spellings, so that the headers of
+        requests and responses are looked up instead of normalizing the name of each of them.
+        """
+        header_tags = {REQUEST: {}, RESPONSE: {}}
+        if not self._whitelist_headers:
+            self._header_tags = header_tags
+            return
+
+        for request_or_response in (REQUEST, RESPONSE):
+            tags = header_tags[request_or_response] = {}
+            spellings = [
+                (_normalize_tag_name(request_or_response, header_name), _header_spellings(header_name))
+                for header_name in sorted(self._whitelist_headers)
+            ]
+            # Spelling by spelling, so that the whitelisted names are never shadowed by the WSGI spelling of another
+            # header, e.g. 'HTTP_X_FOO' for 'x-foo' and 'http_x_foo'
+            for i in range(max(len(s) for _, s in spellings)):
+                for tag_name, header_spellings in spellings:
+                    if i < len(header_spellings):
+                        tags.setdefault(header_spellings[i], tag_name)
+        self._header_tags = header_tags
+
     def header_is_traced(self, header_name):
         """
         Returns whether or not the current header should be traced.
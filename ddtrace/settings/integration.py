@@ -1,11 +1,61 @@
 from copy import deepcopy
+import keyword
 import os
+import re
 
 from ..utils.attrdict import AttrDict
 from ..utils.formats import asbool, get_env
 from .http import HttpConfig
 from .._hooks import Hooks
 
+# The settings of an integration stored in the attributes of its snapshots
+SETTING_NAME_REGEXP = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# {names of the settings: class of the snapshots}
+_snapshot_classes = {}
+
+
+class IntegrationSettings(object):
+    """
+    Snapshot of the effective settings of an integration, see :meth:`IntegrationConfig.snapshot`.
+
+    Besides the settings of the integration, it holds the values resolved with the global configuration:
+
+    - ``analytics_sample_rate``: the sample rate returned by ``get_analytics_sample_rate(use_global_config=True)``
+    - ``trace_query_string``: whether the query strings are traced, by the integration or globally
+    """
+
+    __slots__ = ("_versions", "analytics_sample_rate", "trace_query_string")
+
+    def __repr__(self):
+        return "<{} {}>".format(
+            self.__class__.__name__,
+            ", ".join("{}={!r}".format(name, getattr(self, name, None)) for name in self._setting_names()),
+        )
+
+    @classmethod
+    def _setting_names(cls):
+        return [name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ()) if name != "_versions"]
+
+
+def _snapshot_class(names):
+    """Returns the class of the snapshots of the given settings, with a slot for each of them."""
+    names = tuple(
+        sorted(
+            name
+            for name in names
+            if SETTING_NAME_REGEXP.match(name)
+            and not name.startswith("__")
+            and not keyword.iskeyword(name)
+            and name not in IntegrationSettings.__slots__
+        )
+    )
+    try:
+        return _snapshot_classes[names]
+    except KeyError:
+        cls = _snapshot_classes[names] = type("IntegrationSettings", (IntegrationSettings,), {"__slots__": names})
+        return cls
+
 
 class IntegrationConfig(AttrDict):
     """
@@ -38,6 +88,7 @@ class IntegrationConfig(AttrDict):
         object.__setattr__(self, "integration_name", name)
         object.__setattr__(self, "hooks", Hooks())
         object.__setattr__(self, "http", HttpConfig())
+        object.__setattr__(self, "_snapshot", None)
 
         # Set default analytics configuration, default is disabled
         # DEV: Default to `None` which means do not set this key
@@ -61,6 +112,40 @@ class IntegrationConfig(AttrDict):
         # unified.
         self.setdefault("service_name", service)
 
+        # Merge consecutive sibling spans of the integration, see `ddtrace.internal.compression`
+        self.setdefault("span_compression", asbool(get_env(name, "span_compression_enabled", default=False)))
+
+    def _bump_version(self):
+        object.__setattr__(self, "_snapshot", None)
+        # DEV: Only changes of the registered configurations invalidate the values computed from the configuration, not
+        #   the changes of their copies. `global_config` is not always a `Config`, e.g. when it is replaced in tests.
+        global_config = self.global_config
+        if getattr(global_config, "_config", {}).get(self.integration_name) is self:
+            global_config._bump_version()
+
+    def __setitem__(self, key, value):
+        super(IntegrationConfig, self).__setitem__(key, value)
+        self._bump_version()
+
+    def __delitem__(self, key):
+        super(IntegrationConfig, self).__delitem__(key)
+        self._bump_version()
+
+    def update(self, *args, **kwargs):
+        super(IntegrationConfig, self).update(*args, **kwargs)
+        self._bump_version()
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, *args):
+        value = super(IntegrationConfig, self).pop(*args)
+        self._bump_version()
+        return value
+
     def __deepcopy__(self, memodict=None):
         new = IntegrationConfig(self.global_config, self.integration_name, deepcopy(dict(self), memodict))
         new.hooks = deepcopy(self.hooks, memodict)
@@ -92,6 +177,44 @@ class IntegrationConfig(AttrDict):
             else self.global_config.header_is_traced(header_name)
         )
 
+    def _header_tags(self, request_or_response):
+        """
+        Returns the tag names of the traced headers by spelling of the header names, see
+        :meth:`HttpConfig._build_header_tags`.
+        :param request_or_response: The context of the headers: request|response
+        :rtype: dict
+        """
+        http = self.http if self.http.is_header_tracing_configured else self.global_config.http
+        return http._header_tags[request_or_response]
+
+    def snapshot(self):
+        """
+        Returns the effective settings of the integration as the attributes of an :class:`IntegrationSettings`.
+
+        The snapshot is computed again only after the configuration changed, making it cheaper to read than the
+        integration configuration on the hot paths::
+
+            settings = config.flask.snapshot()
+            if settings.distributed_tracing_enabled:
+                ...
+
+        :rtype: IntegrationSettings
+        """
+        global_config = self.global_config
+        versions = (getattr(global_config, "_version", None), self.http._version, global_config.http._version)
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot._versions == versions:
+            return snapshot
+
+        snapshot = _snapshot_class(self.keys())()
+        for name in snapshot.__slots__:
+            setattr(snapshot, name, self[name])
+        snapshot.analytics_sample_rate = self.get_analytics_sample_rate(use_global_config=True)
+        snapshot.trace_query_string = self.trace_query_string
+        snapshot._versions = versions
+        object.__setattr__(self, "_snapshot", snapshot)
+        return snapshot
+
     def _is_analytics_enabled(self, use_global_config):
         # DEV: analytics flag can be None which should not be taken as
         # enabled when global flag is disabled
@@ -6,12 +6,13 @@ import sys
 
 from ddtrace.vendor import debtcollector
 
-from .constants import FILTERS_KEY, SAMPLE_RATE_METRIC_KEY, VERSION_KEY, ENV_KEY
+from .constants import FILTERS_KEY, SAMPLE_RATE_METRIC_KEY, VERSION_KEY, ENV_KEY, GC_PAUSE_KEY
 from .ext import system
 from .ext.priority import AUTO_REJECT, AUTO_KEEP
-from .internal import debug
+from .filters import AggregateRepeatedQueries
+from .internal import gcpause
 from .internal.logger import get_logger, hasHandlers
-from .internal.runtime import RuntimeTags, RuntimeWorker, get_runtime_id
+from .internal.runtime import get_runtime_id
 from .internal.writer import AgentWriter, LogWriter
 from .internal import _rand
 from .provider import DefaultContextProvider
@@ -21,7 +22,6 @@ from .settings import config
 from .span import Span
 from .utils.formats import asbool, get_env
 from .utils.deprecation import deprecated, RemovedInDDTrace10Warning
-from .vendor.dogstatsd import DogStatsd
 from . import compat
 from . import _hooks
 
@@ -103,6 +103,7 @@ class Tracer(object):
         self.priority_sampler = None
         self._runtime_worker = None
         self._filters = []
+        self._query_aggregator = AggregateRepeatedQueries()
 
         uds_path = None
         https = None
@@ -285,9 +286,11 @@ class Tracer(object):
             dogstatsd_url = 'udp://{}:{}'.format(dogstatsd_host, dogstatsd_port or self.DEFAULT_DOGSTATSD_PORT)
 
         if dogstatsd_url is not None:
+            from .internal.dogstatsd import AggregatingDogStatsd
+
             dogstatsd_kwargs = _parse_dogstatsd_url(dogstatsd_url)
             self.log.debug('Connecting to DogStatsd(%s)', dogstatsd_url)
-            self._dogstatsd_client = DogStatsd(**dogstatsd_kwargs)
+            self._dogstatsd_client = AggregatingDogStatsd(**dogstatsd_kwargs)
 
         if writer:
             self.writer = writer
@@ -338,6 +341,7 @@ class Tracer(object):
             self._runtime_worker.stop()
             self._runtime_worker.join()
             self._runtime_worker = None
+            gcpause.tracker.unregister(self._on_gc_pause)
         else:
             runtime_metrics_was_running = False
 
@@ -345,6 +349,8 @@ class Tracer(object):
             self._start_runtime_worker()
 
         if debug_mode or asbool(environ.get("DD_TRACE_STARTUP_LOGS", True)):
+            from .internal import debug
+
             try:
                 info = debug.collect(self)
             except Exception as e:
@@ -519,6 +525,8 @@ class Tracer(object):
     def _update_dogstatsd_constant_tags(self):
         """ Prepare runtime tags for ddstatsd.
         """
+        from .internal.runtime.runtime_metrics import RuntimeTags
+
         # DEV: ddstatsd expects tags in the form ['key1:value1', 'key2:value2', ...]
         tags = [
             '{}:{}'.format(k, v)
@@ -528,8 +536,23 @@ class Tracer(object):
         self._dogstatsd_client.constant_tags = tags
 
     def _start_runtime_worker(self):
+        from .internal.runtime.metric_collectors import GCPauseRuntimeMetricCollector
+        from .internal.runtime.runtime_metrics import RuntimeWorker
+
         self._runtime_worker = RuntimeWorker(self._dogstatsd_client, self._RUNTIME_METRICS_INTERVAL)
         self._runtime_worker.start()
+        if GCPauseRuntimeMetricCollector.enabled:
+            gcpause.tracker.register(self._on_gc_pause)
+
+    def _on_gc_pause(self, generation, duration_ns, frame):
+        """Add the garbage collection pause time to the span active in the current thread."""
+        # DEV: this is called by the garbage collector while this thread might hold the context lock: read the
+        # current span without locking and do not create a new context
+        if not self.context_provider._has_active_context():
+            return
+        span = self.context_provider.active()._current_span
+        if span is not None and not span.finished:
+            span.set_metric(GC_PAUSE_KEY, (span.get_metric(GC_PAUSE_KEY) or 0) + duration_ns)
 
     def _check_new_process(self):
         """ Checks if the tracer is in a new process (was forked) and performs
@@ -690,7 +713,11 @@ class Tracer(object):
                 self.log.debug('\n%s', span.pprint())
 
         if self.enabled and self.writer:
-            for filtr in self._filters:
+            filters = self._filters
+            if config.sql_aggregation_threshold:
+                filters = [self._query_aggregator] + filters
+
+            for filtr in filters:
                 try:
                     spans = filtr.process_trace(spans)
                 except Exception:
@@ -0,0 +1,91 @@
+import collections
+import functools
+import threading
+
+
+class LRUCache(object):
+    """A thread-safe mapping keeping the most recently used items.
+
+    Example::
+
+       cache = LRUCache(maxsize=2)
+       cache['a'] = 1
+       cache['b'] = 2
+       cache['a']
+       cache['c'] = 3  # 'b' is evicted
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._data = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                # Move the item to the end: `OrderedDict.move_to_end` does not exist on Python 2
+                value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                raise
+            self._data[key] = value
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def cached(maxsize=256):
+    """Decorator caching the results of a function taking a single hashable argument in a :class:`LRUCache`.
+
+    The cache is available as the ``cache`` attribute of the decorated function.
+
+    Example::
+
+       @cached(maxsize=1024)
+       def normalize(query):
+           return query.lower()
+    """
+
+    def decorator(f):
+        cache = LRUCache(maxsize)
+
+        @functools.wraps(f)
+        def wrapper(arg):
+            try:
+                return cache[arg]
+            except KeyError:
+                pass
+            # DEV: compute the value outside of the lock, another thread might do the same work meanwhile
+            value = cache[arg] = f(arg)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -79,6 +79,8 @@ def override_global_config(values):
         "analytics_enabled",
         "report_hostname",
         "health_metrics_enabled",
+        "sql_normalization_enabled",
+        "sql_aggregation_threshold",
         "env",
         "version",
         "service",
@@ -0,0 +1,163 @@
+"""An in-process stand-in for the trace agent, for benchmarks going through the real ``AgentWriter`` and ``API``."""
+import json
+import os
+import random
+import threading
+import time
+
+import msgpack
+
+from ddtrace import Tracer
+from ddtrace.compat import time_ns
+from ddtrace.vendor.six.moves import BaseHTTPServer
+from ddtrace.vendor.six.moves import socketserver
+
+
+class Payload(object):
+    """A payload of traces received by the agent."""
+
+    __slots__ = ("received", "endpoint", "content_type", "body")
+
+    def __init__(self, received, endpoint, content_type, body):
+        # DEV: In nanoseconds since the epoch, like the start of the spans
+        self.received = received
+        self.endpoint = endpoint
+        self.content_type = content_type
+        self.body = body
+
+    def traces(self):
+        # DEV: Decoded after the measurements, the agent only stores the bodies so that it costs as little CPU as
+        #   possible to the process being measured
+        if self.content_type == "application/json":
+            return json.loads(self.body.decode())
+        return msgpack.unpackb(self.body, raw=False)
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    def do_PUT(self):
+        agent = self.server.agent
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        received = time_ns()
+
+        if agent.latency:
+            time.sleep(agent.latency)
+
+        if self.path in agent.unsupported_endpoints:
+            status = 404
+        elif agent.error_rate and random.random() < agent.error_rate:
+            status = 500
+        else:
+            status = 200
+        agent._received(status, Payload(received, self.path, self.headers.get("Content-Type"), body))
+
+        response = json.dumps({"rate_by_service": agent.rate_by_service}).encode() if status == 200 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    do_POST = do_PUT
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+class _Quiet(object):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # DEV: The writer closes the connection when it times out before the agent answers
+        pass
+
+
+class _Server(_Quiet, socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    pass
+
+
+class _UDSServer(_Quiet, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    pass
+
+
+class FakeAgent(object):
+    """A trace agent recording the payloads it receives.
+
+    It listens on a random port of localhost, or on a Unix Domain Socket if ``uds_path`` is given. It can be used as a
+    context manager, which starts and stops it.
+
+    :param float latency: The time, in seconds, the agent takes to answer.
+    :param float error_rate: The ratio of payloads answered with a 500 error.
+    :param rate_by_service: The ``rate_by_service`` of the responses.
+    :param unsupported_endpoints: The endpoints answered with a 404 error, like an old agent would.
+    :param str uds_path: The path of the Unix Domain Socket to listen on.
+    """
+
+    def __init__(self, latency=0, error_rate=0, rate_by_service=None, unsupported_endpoints=(), uds_path=None):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_by_service = rate_by_service if rate_by_service is not None else {"service:,env:": 1}
+        self.unsupported_endpoints = unsupported_endpoints
+        self.uds_path = uds_path
+        self.payloads = []
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        if self.uds_path is None:
+            self._server = _Server(("127.0.0.1", 0), _Handler)
+        else:
+            self._server = _UDSServer(self.uds_path, _Handler)
+        self._server.agent = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="FakeAgent")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if self.uds_path is not None:
+            os.unlink(self.uds_path)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _received(self, status, payload):
+        with self._lock:
+            if status == 200:
+                self.payloads.append(payload)
+            else:
+                self.errors += 1
+
+    def reset(self):
+        """Forgets the payloads received so far."""
+        with self._lock:
+            self.payloads = []
+            self.errors = 0
+
+    def tracer(self):
+        """Returns a new tracer sending its traces to this agent."""
+        tracer = Tracer()
+        if self.uds_path is None:
+            tracer.configure(hostname="127.0.0.1", port=self.port, priority_sampling=True)
+        else:
+            tracer.configure(uds_path=self.uds_path, priority_sampling=True)
+        return tracer
+
+    def received_bytes(self):
+        """Returns the number of bytes of the payloads accepted."""
+        return sum(len(p.body) for p in self.payloads)
+
+    def received_spans(self):
+        """Returns the spans of the payloads accepted."""
+        return [span for p in self.payloads for trace in p.traces() for span in trace]
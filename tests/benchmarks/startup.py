@@ -0,0 +1,212 @@
+"""Measures the wall time and the memory of each phase of the startup of an application run with ``ddtrace-run``.
+
+The phases are measured in the order ``ddtrace/bootstrap/sitecustomize.py`` runs them, in a fresh interpreter.
+``ddtrace`` must not be imported before this script runs it, so this module is run as a script rather than with
+``-m tests.benchmarks.startup``, which would import ``tests/__init__.py`` and ``ddtrace`` with it.
+
+Usage::
+
+    python tests/benchmarks/startup.py [configuration ...]
+
+prints the results of each configuration as a JSON object on its own line::
+
+    {"configuration": "tracing", "phases": [{"name": "import", "wall_time": 0.05, "rss": 1234, "rss_delta": 42}, ...]}
+
+where ``wall_time`` is in seconds and ``rss`` and ``rss_delta`` are in bytes.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+
+try:
+    clock = time.perf_counter
+except AttributeError:
+    # Python 2
+    clock = time.time
+
+
+# Environment variables of each configuration, on top of the ones disabling what requires an agent
+CONFIGURATIONS = {
+    "tracing": {},
+    # DEV: The profiles are written to files rather than sent to the agent, which would be retried on stop
+    "profiling": {
+        "DD_PROFILING_ENABLED": "true",
+        "DD_PROFILING_OUTPUT_PPROF": os.path.join(tempfile.gettempdir(), "ddtrace-startup-benchmark.pprof"),
+    },
+    "logs_injection": {"DD_LOGS_INJECTION": "true"},
+    # DEV: Only used by the phases: ddtrace-run patches the integrations when their library is imported
+    "all_integrations": {"DD_BENCHMARK_ALL_INTEGRATIONS": "true"},
+}
+
+BASE_ENV = {
+    # DEV: The startup logs ping the agent, the time it takes depends on the network rather than on ddtrace
+    "DD_TRACE_STARTUP_LOGS": "false",
+    # DEV: Nothing should be sent to an agent while measuring, in case one runs locally
+    "DD_AGENT_HOST": "127.0.0.1",
+    "DATADOG_TRACE_AGENT_PORT": "9",
+}
+# The root of the repository
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# `EXTRA_PATCHED_MODULES` of `ddtrace/bootstrap/sitecustomize.py`, which cannot be imported without running it
+SITECUSTOMIZE_PATCHED_MODULES = {
+    "bottle": True,
+    "django": True,
+    "falcon": True,
+    "flask": True,
+    "pylons": True,
+    "pyramid": True,
+}
+
+
+def _env(configuration):
+    env = os.environ.copy()
+    env.update(BASE_ENV)
+    env.update(CONFIGURATIONS[configuration])
+    # DEV: Measure the ddtrace of this repository, whether it is installed or not
+    env["PYTHONPATH"] = os.path.pathsep.join(p for p in (ROOT, env.get("PYTHONPATH")) if p)
+    return env
+
+
+def _rss():
+    """Returns the resident set size of the process, in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError):
+        # Not Linux: fall back on the peak resident set size
+        import resource
+
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # DEV: ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+class Phases(object):
+    """Records the wall time and the resident set size after each phase."""
+
+    def __init__(self):
+        self.phases = []
+        self._rss = _rss()
+
+    def run(self, name, func, *args, **kwargs):
+        start = clock()
+        result = func(*args, **kwargs)
+        wall_time = clock() - start
+        rss = _rss()
+        self.phases.append({"name": name, "wall_time": wall_time, "rss": rss, "rss_delta": rss - self._rss})
+        self._rss = rss
+        return result
+
+
+def _import_ddtrace():
+    # DEV: This creates the global tracer as well, as importing the sitecustomize of ddtrace-run does
+    import ddtrace
+
+    return ddtrace
+
+
+def _start_profiler():
+    from ddtrace.profiling import profiler
+
+    p = profiler.Profiler()
+    p.start()
+    return p
+
+
+def _patch_all():
+    from ddtrace import monkey
+
+    if os.environ.get("DD_BENCHMARK_ALL_INTEGRATIONS"):
+        # Every integration, imported and patched now rather than when the library is imported
+        for module in monkey.PATCH_MODULES:
+            monkey.patch_module(module, raise_errors=False)
+    else:
+        monkey.patch_all(**SITECUSTOMIZE_PATCHED_MODULES)
+
+
+def measure():
+    """Runs the phases of the startup in this interpreter and returns them."""
+    phases = Phases()
+
+    ddtrace = phases.run("import", _import_ddtrace)
+
+    from ddtrace.internal import hostname
+    from ddtrace.internal.runtime import container
+    from ddtrace.utils.formats import asbool
+
+    if ddtrace.config.logs_injection:
+        phases.run("logs_injection", ddtrace.patch, logging=True)
+
+    # DEV: The phases below are already part of the import, they are measured again on their own
+    phases.run("container_info", container.get_container_info)
+    # DEV: Bypass the cache of the hostname, functools.wraps does not set __wrapped__ on Python 2
+    phases.run("hostname", getattr(hostname.get_hostname, "__wrapped__", socket.gethostname))
+    tracer = phases.run("tracer", ddtrace.Tracer)
+
+    profiler = None
+    if asbool(os.environ.get("DD_PROFILING_ENABLED", False)):
+        profiler = phases.run("profiler", _start_profiler)
+
+    phases.run("patch_all", _patch_all)
+
+    if profiler is not None:
+        profiler.stop(flush=False)
+    tracer.shutdown()
+    return phases.phases
+
+
+def measure_ddtrace_run(configuration):
+    """Returns the wall time, in seconds, and the peak resident set size, in bytes, of an empty program run with
+    ``ddtrace-run`` and the configuration, and whether the sitecustomize of ddtrace-run was loaded.
+
+    It includes the ``exec`` of the interpreter by ``ddtrace-run``.
+    """
+    env = _env(configuration)
+    program = (
+        "import json, sys, resource; import sitecustomize; "
+        "maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; "
+        "json.dump({'rss': maxrss if sys.platform == 'darwin' else maxrss * 1024, "
+        "'loaded': getattr(sitecustomize, 'loaded', False)}, sys.stdout)"
+    )
+    ddtrace_run = "from ddtrace.commands.ddtrace_run import main; main()"
+
+    start = clock()
+    output = subprocess.check_output([sys.executable, "-c", ddtrace_run, sys.executable, "-c", program], env=env)
+    wall_time = clock() - start
+
+    result = json.loads(output.decode())
+    result["wall_time"] = wall_time
+    return result
+
+
+def measure_phases(configuration):
+    """Returns the phases of the startup with the configuration, measured in a new interpreter."""
+    env = _env(configuration)
+    # DEV: __file__ is the compiled module on Python 2 when imported by the tests
+    script = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+    output = subprocess.check_output([sys.executable, script, "--in-process"], env=env)
+    return json.loads(output.decode())
+
+
+def main(argv):
+    if argv == ["--in-process"]:
+        json.dump(measure(), sys.stdout)
+        return
+
+    for configuration in argv or sorted(CONFIGURATIONS):
+        result = {
+            "configuration": configuration,
+            "ddtrace_run": measure_ddtrace_run(configuration),
+            "phases": measure_phases(configuration),
+        }
+        print(json.dumps(result, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
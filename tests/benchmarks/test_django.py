@@ -0,0 +1,78 @@
+import importlib
+
+import pytest
+
+django = pytest.importorskip("django")
+
+from django.conf import settings  # noqa: E402
+
+if not settings.configured:
+    settings.configure()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.urls import path  # noqa: E402
+
+from ddtrace import Pin, Tracer  # noqa: E402
+
+from .test_integrations import NoopWriter  # noqa: E402
+
+
+# DEV: `ddtrace.contrib.django.patch` is the `patch` function when imported from its package
+django_patch = importlib.import_module("ddtrace.contrib.django.patch")
+
+
+def view(request, pk):
+    return HttpResponse()
+
+
+# The urlconf of the benchmarks: a large application with 1000 patterns
+urlpatterns = [path("app-{0}/items/<int:pk>/".format(i), view, name="view-{0}".format(i)) for i in range(1000)]
+
+
+class Request(object):
+    urlconf = __name__
+    method = "GET"
+
+    def __init__(self, path_info):
+        self.path_info = path_info
+
+
+# Paths resolved by the last patterns of the urlconf, the worst case for Django
+REQUESTS = [Request("/app-{0}/items/42/".format(i)) for i in range(990, 1000)] + [Request("/unknown/")]
+
+
+@pytest.mark.benchmark(group="django.resolve", min_time=0.005)
+def test_resolve(benchmark):
+    def resolve():
+        django_patch._resolutions.clear()
+        for request in REQUESTS:
+            django_patch._resolve(django, request)
+
+    benchmark(resolve)
+
+
+@pytest.mark.benchmark(group="django.resolve", min_time=0.005)
+def test_resolve_cached(benchmark):
+    def resolve():
+        for request in REQUESTS:
+            django_patch._resolve(django, request)
+
+    benchmark(resolve)
+
+
+@pytest.mark.benchmark(group="django.request", min_time=0.005)
+def test_get_response(benchmark):
+    tracer = Tracer()
+    tracer.writer = NoopWriter()
+    Pin(service="django", tracer=tracer).onto(django)
+    get_response = django_patch.traced_get_response(django)
+
+    request = RequestFactory().get("/app-999/items/42/", {"page": 2}, HTTP_USER_AGENT="bench")
+    request.urlconf = __name__
+    response = HttpResponse()
+
+    def handler_get_response(request):
+        return response
+
+    benchmark(get_response, handler_get_response, None, (request,), {})
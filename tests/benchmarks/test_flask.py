@@ -0,0 +1,30 @@
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from werkzeug.test import EnvironBuilder  # noqa: E402
+
+from ddtrace import Pin, Tracer  # noqa: E402
+from ddtrace.contrib.flask.patch import traced_wsgi_app  # noqa: E402
+
+from .test_integrations import NoopWriter  # noqa: E402
+
+
+def wsgi_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"OK"]
+
+
+@pytest.mark.benchmark(group="flask.request", min_time=0.005)
+def test_wsgi_app(benchmark):
+    tracer = Tracer()
+    tracer.writer = NoopWriter()
+    app = flask.Flask(__name__)
+    Pin(service="flask", tracer=tracer).onto(app)
+
+    environ = EnvironBuilder(path="/users/42", query_string="page=2", headers={"User-Agent": "bench"}).get_environ()
+
+    def start_response(status, headers):
+        pass
+
+    benchmark(traced_wsgi_app, wsgi_app, app, (environ, start_response), {})
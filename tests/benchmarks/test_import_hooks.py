@@ -0,0 +1,59 @@
+import sys
+
+import pytest
+
+from ddtrace.internal import import_hooks
+
+
+# A large application: 20 packages of 50 modules
+PACKAGES = 20
+MODULES = 50
+
+
+@pytest.fixture(scope="module")
+def package_tree(tmp_path_factory):
+    root = tmp_path_factory.mktemp("imports")
+    names = []
+    for p in range(PACKAGES):
+        package = root / "bench_package_{}".format(p)
+        package.mkdir()
+        (package / "__init__.py").write_text(u"")
+        for m in range(MODULES):
+            (package / "module_{}.py".format(m)).write_text(u"import os\n\nVALUE = {}\n".format(m))
+            names.append("bench_package_{}.module_{}".format(p, m))
+
+    sys.path.insert(0, str(root))
+    try:
+        yield names
+    finally:
+        sys.path.remove(str(root))
+
+
+def _unload():
+    for name in list(sys.modules):
+        if name.startswith("bench_package_"):
+            del sys.modules[name]
+
+
+@pytest.mark.parametrize("patched", [False, True])
+@pytest.mark.benchmark(group="import_hooks.startup")
+def test_import_package_tree(benchmark, package_tree, patched):
+    import importlib
+
+    if patched:
+        import_hooks.patch()
+        # Hooks for modules which are not imported, like the integrations patched on import
+        for name in ("flask", "requests", "botocore", "celery", "elasticsearch"):
+            import_hooks.register_module_hook(name, lambda module: None)
+
+    def import_tree():
+        for name in package_tree:
+            importlib.import_module(name)
+
+    try:
+        benchmark.pedantic(import_tree, setup=_unload, rounds=20)
+    finally:
+        _unload()
+        if patched:
+            import_hooks.hooks.reset()
+            import_hooks.unpatch()
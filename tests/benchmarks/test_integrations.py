@@ -0,0 +1,140 @@
+import sqlite3
+
+import pytest
+
+from ddtrace import Pin, Tracer
+from ddtrace.contrib.dbapi import TracedConnection
+from tests import override_config
+
+
+class NoopWriter(object):
+    """Writer dropping the traces, to only measure the overhead of the integrations."""
+
+    def write(self, spans=None, services=None):
+        pass
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.writer = NoopWriter()
+    return tracer
+
+
+@pytest.fixture
+def connection(tracer):
+    conn = TracedConnection(sqlite3.connect(":memory:"), Pin(service="db", app="sqlite", tags={"env": "bench"}))
+    Pin.override(conn, tracer=tracer)
+    return conn
+
+
+@pytest.mark.benchmark(group="dbapi.execute", min_time=0.005)
+def test_dbapi_execute_untraced(benchmark):
+    cursor = sqlite3.connect(":memory:").cursor()
+    benchmark(cursor.execute, "SELECT 1")
+
+
+@pytest.mark.benchmark(group="dbapi.execute", min_time=0.005)
+def test_dbapi_execute(benchmark, connection):
+    cursor = connection.cursor()
+    benchmark(cursor.execute, "SELECT 1")
+
+
+@pytest.mark.benchmark(group="dbapi.execute", min_time=0.005)
+def test_dbapi_cursor_execute(benchmark, connection):
+    # A new cursor for each query, like Django does
+    def execute():
+        connection.cursor().execute("SELECT 1")
+
+    benchmark(execute)
+
+
+@pytest.mark.benchmark(group="redis.execute_command", min_time=0.005)
+def test_redis_execute_command(benchmark, tracer):
+    redis = pytest.importorskip("redis")
+    from ddtrace.contrib.redis.patch import traced_execute_command
+
+    client = redis.Redis(host="localhost", port=6379, db=0)
+    Pin(service="redis", tags={"env": "bench"}, tracer=tracer).onto(client)
+
+    def execute_command(*args, **kwargs):
+        pass
+
+    benchmark(traced_execute_command, execute_command, client, ("GET", "foo"), {})
+
+
+@pytest.mark.benchmark(group="redis.execute_command", min_time=0.005)
+def test_redis_execute_pipeline(benchmark, tracer):
+    redis = pytest.importorskip("redis")
+    from ddtrace.contrib.redis.patch import traced_execute_pipeline
+
+    pipeline = redis.Redis(host="localhost", port=6379, db=0).pipeline()
+    pipeline.get("foo")
+    pipeline.set("bar", 1)
+    Pin(service="redis", tags={"env": "bench"}, tracer=tracer).onto(pipeline)
+
+    def execute(*args, **kwargs):
+        pass
+
+    benchmark(traced_execute_pipeline, execute, pipeline, (), {})
+
+
+@pytest.mark.parametrize("aggregate_pipelines", [False, True])
+@pytest.mark.benchmark(group="redis.execute_pipeline", min_time=0.005)
+def test_redis_execute_large_pipeline(benchmark, tracer, aggregate_pipelines):
+    redis = pytest.importorskip("redis")
+    from ddtrace.contrib.redis.patch import traced_execute_pipeline
+
+    pipeline = redis.Redis(host="localhost", port=6379, db=0).pipeline()
+    for i in range(1000):
+        pipeline.hset("user:{}".format(i), "last_seen", "2020-10-01T12:34:56.789")
+    Pin(service="redis", tracer=tracer).onto(pipeline)
+
+    def execute(*args, **kwargs):
+        pass
+
+    with override_config("redis", dict(aggregate_pipelines=aggregate_pipelines, raw_command_sample_rate=0.0)):
+        benchmark(traced_execute_pipeline, execute, pipeline, (), {})
+
+
+@pytest.mark.benchmark(group="elasticsearch.perform_request", min_time=0.005)
+def test_elasticsearch_perform_request(benchmark, tracer):
+    elasticsearch = pytest.importorskip("elasticsearch")
+    from ddtrace.contrib.elasticsearch.patch import _get_perform_request
+
+    transport = elasticsearch.Transport([{"host": "localhost", "port": 9200}])
+    Pin(service="elasticsearch", tracer=tracer).onto(transport)
+    perform_request = _get_perform_request(elasticsearch)
+
+    def bulk(*args, **kwargs):
+        return {"took": 3}
+
+    urls = ["/logs-2020.10.{:02d}/_bulk".format(day) for day in range(1, 8)]
+
+    def index():
+        for url in urls:
+            perform_request(bulk, transport, ("POST", url), {"body": "", "params": {"refresh": "false"}})
+
+    benchmark(index)
+
+
+@pytest.mark.parametrize("whitelist", [[], ["X-Request-Id", "User-Agent"]])
+@pytest.mark.benchmark(group="http.store_request_headers", min_time=0.005)
+def test_store_request_headers(benchmark, tracer, whitelist):
+    django = pytest.importorskip("django")
+    from django.http.request import HttpHeaders
+    from ddtrace.http import store_request_headers
+    from ddtrace.settings import Config, IntegrationConfig
+
+    if django.VERSION < (2, 2, 0):
+        pytest.skip("HttpHeaders requires Django 2.2")
+
+    # The WSGI environ of a request with 60 headers, like the ones going through several proxies
+    environ = {"HTTP_X_CUSTOM_{}".format(i): "value" for i in range(58)}
+    environ.update(HTTP_X_REQUEST_ID="1234", HTTP_USER_AGENT="bench")
+    headers = HttpHeaders(environ)
+    integration_config = IntegrationConfig(Config(), "bench")
+    integration_config.http.trace_headers(whitelist)
+    span = tracer.trace("bench")
+
+    benchmark(store_request_headers, headers, span, integration_config)
@@ -0,0 +1,168 @@
+"""Memory used by the tracer and the profiler, measured with tracemalloc.
+
+The memory measured is reported in the ``extra_info`` of the JSON report of pytest-benchmark. Each measurement has a
+budget, the baseline of the current implementation with some headroom: exceeding it is a regression, and lowering
+the baseline should come with a lower budget.
+"""
+import gc
+import os
+import sys
+
+import pytest
+
+from ddtrace import Tracer
+from ddtrace.context import Context
+from ddtrace.internal import _queue
+from ddtrace.internal.writer import AgentWriter
+from ddtrace.profiling import recorder
+from ddtrace.profiling.collector import stack
+from ddtrace.span import Span
+
+from .test_integrations import NoopWriter
+
+
+tracemalloc = pytest.importorskip("tracemalloc")
+
+
+# DEV: The budgets hold with CPython 3.6 to 3.9. Dictionaries are not compact before 3.6: only report the memory used
+ENFORCE_BUDGETS = sys.version_info >= (3, 6)
+
+# Budgets, in bytes, about 1.5 times the baselines measured with CPython 3.8
+# DEV: 1010 bytes per span
+SPAN_BUDGET = 1500
+# DEV: 840 bytes per span of a context with 10 spans, 740 with 1000 spans
+CONTEXT_SPAN_BUDGET = 1300
+# DEV: 9860 bytes per trace of 10 spans
+TRACE_QUEUE_TRACE_BUDGET = 15000
+# DEV: 3780 bytes per stack sample of 30 frames
+RECORDER_EVENT_BUDGET = 5700
+
+# A trace as queued by the writer: a web request with a few database queries
+TRACE_SPANS = 10
+
+
+def _allocated(build):
+    """Returns what ``build`` returns, and the memory it allocated and still used."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        gc.collect()
+        return obj, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(benchmark, build, budget, count=1):
+    """Measures the memory used by what ``build`` returns, per object if it holds ``count`` of them."""
+    results = []
+
+    def measure():
+        # DEV: Keep the objects alive until the memory is measured
+        obj, allocated = _allocated(build)
+        results.append(allocated)
+        del obj
+
+    benchmark.pedantic(measure, rounds=3)
+
+    per_object = min(results) / count
+    benchmark.extra_info["bytes"] = per_object
+    if ENFORCE_BUDGETS:
+        assert per_object <= budget, "{} bytes exceed the budget of {} bytes".format(per_object, budget)
+
+
+def _span(tracer, name, parent=None, i=0):
+    """Returns a finished span with the tags of a typical web or database span."""
+    span = Span(
+        tracer,
+        name,
+        service="web",
+        resource="GET /users/<int:pk>",
+        span_type="web",
+        trace_id=parent.trace_id if parent else None,
+        parent_id=parent.span_id if parent else None,
+    )
+    span.set_tag("http.method", "GET")
+    span.set_tag("http.url", "http://localhost:8080/users/{}".format(i))
+    span.set_tag("http.status_code", "200")
+    span.set_tag("component", "flask")
+    span.set_tag("span.kind", "server")
+    span.set_tag("env", "prod")
+    span.set_tag("version", "1.2.3")
+    span.set_metric("_dd.measured", 1)
+    span.set_metric("_sampling_priority_v1", 1)
+    span.set_metric("_dd.agent_psr", 1.0)
+    span.set_metric("system.pid", os.getpid())
+    span.finish()
+    return span
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.writer = NoopWriter()
+    return tracer
+
+
+@pytest.mark.benchmark(group="memory.span")
+def test_span(benchmark, tracer):
+    _measure(benchmark, lambda: [_span(tracer, "flask.request", i=i) for i in range(1000)], SPAN_BUDGET, 1000)
+
+
+@pytest.mark.parametrize("nspans", [10, 100, 1000])
+@pytest.mark.benchmark(group="memory.context")
+def test_context(benchmark, tracer, nspans):
+    def build():
+        ctx = Context()
+        root = tracer.start_span("flask.request", child_of=ctx)
+        # The finished children are kept by the context until the root span finishes
+        for i in range(nspans - 1):
+            child = tracer.start_span("sqlite.query", child_of=root)
+            child.set_tag("sql.query", "SELECT name FROM users WHERE id = ?")
+            child.set_metric("db.rowcount", 1)
+            child.finish()
+        return ctx
+
+    _measure(benchmark, build, CONTEXT_SPAN_BUDGET, nspans)
+
+
+@pytest.mark.benchmark(group="memory.trace_queue")
+def test_trace_queue(benchmark, tracer):
+    maxsize = int(os.getenv("DD_TRACE_MAX_TPS", AgentWriter.QUEUE_MAX_TRACES_DEFAULT))
+
+    def build():
+        queue = _queue.TraceQueue(maxsize=maxsize)
+        for i in range(maxsize):
+            root = _span(tracer, "flask.request", i=i)
+            queue.put([root] + [_span(tracer, "sqlite.query", parent=root, i=i) for _ in range(TRACE_SPANS - 1)])
+        return queue
+
+    _measure(benchmark, build, TRACE_QUEUE_TRACE_BUDGET, maxsize)
+
+
+@pytest.mark.benchmark(group="memory.recorder")
+def test_recorder(benchmark):
+    # The frames of a typical stack, the strings are shared by the events as they come from the code objects
+    stack_frames = [("/app/module_{}.py".format(i), 10 * i + 300, "function_{}".format(i)) for i in range(30)]
+
+    def build():
+        r = recorder.Recorder()
+        for i in range(recorder.Recorder._DEFAULT_MAX_EVENTS):
+            r.push_event(
+                stack.StackSampleEvent(
+                    thread_id=140000000 + i % 8,
+                    thread_native_id=1000 + i % 8,
+                    thread_name="MainThread",
+                    trace_ids={i},
+                    span_ids={i},
+                    frames=[(filename, lineno + i % 7, function) for filename, lineno, function in stack_frames],
+                    nframes=len(stack_frames),
+                    wall_time_ns=10000000,
+                    cpu_time_ns=9000000,
+                    sampling_period=10000000,
+                )
+            )
+        return r
+
+    _measure(benchmark, build, RECORDER_EVENT_BUDGET, recorder.Recorder._DEFAULT_MAX_EVENTS)
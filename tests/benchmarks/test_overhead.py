@@ -0,0 +1,253 @@
+"""Per-request overhead of the integrations, traced through the real ``AgentWriter`` and ``API``.
+
+Each workload is run untraced, then traced with a tracer sending its traces to an in-process :class:`FakeAgent`.
+The percentiles of the latency overhead, the CPU time per span and the bytes sent per span are reported in the
+``extra_info`` of the JSON report of pytest-benchmark.
+"""
+import contextlib
+import os
+import sqlite3
+
+import pytest
+
+from ddtrace import Pin
+from ddtrace.contrib.sqlite3.patch import patch_conn
+
+from .agent import FakeAgent
+
+
+# The number of requests measured, after as many warm up requests
+REQUESTS = 500
+
+PERCENTILES = (50, 90, 99)
+
+try:
+    from time import perf_counter as clock
+except ImportError:
+    # Python 2
+    from time import time as clock
+
+
+def _cpu_time():
+    """Returns the user and system CPU time of the process, of all its threads."""
+    times = os.times()
+    return times[0] + times[1]
+
+
+def _percentile(sorted_values, percentile):
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * percentile // 100)]
+
+
+def _run(request):
+    """Runs the requests and returns the sorted latencies, in seconds, of the requests after the warm up."""
+    for _ in range(REQUESTS):
+        request()
+
+    latencies = []
+    for _ in range(REQUESTS):
+        start = clock()
+        request()
+        latencies.append(clock() - start)
+    return sorted(latencies)
+
+
+@pytest.fixture
+def agent():
+    with FakeAgent() as agent:
+        yield agent
+
+
+def measure_overhead(benchmark, agent, workload):
+    """Measures the overhead of tracing the workload.
+
+    :param workload: A context manager factory taking a tracer, or ``None`` to run untraced, and yielding the
+        function making one request
+    """
+    cpu_time = _cpu_time()
+    with workload(None) as request:
+        untraced = _run(request)
+    untraced_cpu_time = _cpu_time() - cpu_time
+
+    tracer = agent.tracer()
+    # DEV: The requests are faster than the 1000 traces per second the queue keeps by default, the dropped traces
+    #   would not be accounted for
+    tracer.writer._trace_queue.maxsize = 0
+    results = {}
+
+    def traced():
+        cpu_time = _cpu_time()
+        with workload(tracer) as request:
+            results["latencies"] = _run(request)
+        # Send the traces left: the CPU time includes the encoding of the traces and the writer thread
+        tracer.shutdown()
+        results["cpu_time"] = _cpu_time() - cpu_time
+
+    benchmark.pedantic(traced, setup=agent.reset, rounds=1)
+
+    # DEV: The spans of the warm up requests are sent too
+    spans = agent.received_spans()
+    assert spans, "No spans received by the agent"
+
+    latencies = results["latencies"]
+    for p in PERCENTILES:
+        benchmark.extra_info["p{}_overhead".format(p)] = _percentile(latencies, p) - _percentile(untraced, p)
+    benchmark.extra_info["spans_per_request"] = len(spans) / (2.0 * REQUESTS)
+    benchmark.extra_info["cpu_time_per_span"] = (results["cpu_time"] - untraced_cpu_time) / len(spans)
+    benchmark.extra_info["bytes_per_span"] = agent.received_bytes() / float(len(spans))
+
+
+@contextlib.contextmanager
+def sqlite3_workload(tracer):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.executemany("INSERT INTO users (name) VALUES (?)", [("user-{}".format(i),) for i in range(100)])
+    if tracer is not None:
+        conn = patch_conn(conn)
+        Pin.override(conn, tracer=tracer)
+
+    def request():
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM users WHERE id = ?", (42,))
+        cursor.fetchall()
+
+    try:
+        yield request
+    finally:
+        conn.close()
+
+
+@contextlib.contextmanager
+def flask_workload(tracer):
+    flask = pytest.importorskip("flask")
+
+    if tracer is not None:
+        from ddtrace.contrib.flask import patch, unpatch
+
+        patch()
+    try:
+        app = flask.Flask(__name__)
+        if tracer is not None:
+            Pin.override(app, tracer=tracer)
+
+        @app.route("/users/<int:pk>")
+        def user(pk):
+            return "user {}".format(pk)
+
+        client = app.test_client()
+        yield lambda: client.get("/users/42?page=2")
+    finally:
+        if tracer is not None:
+            unpatch()
+
+
+@contextlib.contextmanager
+def django_workload(tracer):
+    django = pytest.importorskip("django")
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure()
+    django.setup()
+
+    from django.http import HttpResponse
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.urls import path
+
+    # DEV: Django is left patched, ``ddtrace.contrib.django.unpatch`` does not restore every function it wraps
+    if tracer is not None:
+        from ddtrace.contrib.django import patch
+
+        patch()
+        Pin.override(django, tracer=tracer)
+
+    def view(request, pk):
+        return HttpResponse("user {}".format(pk))
+
+    urlconf = type("urlconf", (object,), {"urlpatterns": [path("users/<int:pk>", view)]})
+
+    with override_settings(ROOT_URLCONF=urlconf, ALLOWED_HOSTS=["testserver"], MIDDLEWARE=[]):
+        client = Client()
+        yield lambda: client.get("/users/42", {"page": 2})
+
+
+@contextlib.contextmanager
+def falcon_workload(tracer):
+    falcon = pytest.importorskip("falcon")
+    from falcon import testing
+
+    from ddtrace.contrib.falcon import TraceMiddleware
+
+    class UserResource(object):
+        def on_get(self, req, resp, pk):
+            resp.body = "user {}".format(pk)
+
+    middleware = [TraceMiddleware(tracer)] if tracer is not None else []
+    app = falcon.API(middleware=middleware)
+    app.add_route("/users/{pk}", UserResource())
+
+    client = testing.TestClient(app)
+    yield lambda: client.simulate_get("/users/42", query_string="page=2")
+
+
+@contextlib.contextmanager
+def starlette_workload(tracer):
+    pytest.importorskip("starlette")
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+    from starlette.testclient import TestClient
+
+    from ddtrace.contrib.asgi import TraceMiddleware
+
+    def user(request):
+        return PlainTextResponse("user {}".format(request.path_params["pk"]))
+
+    app = Starlette(routes=[Route("/users/{pk:int}", user)])
+    if tracer is not None:
+        app = TraceMiddleware(app, tracer=tracer)
+
+    with TestClient(app) as client:
+        yield lambda: client.get("/users/42?page=2")
+
+
+@contextlib.contextmanager
+def grpc_workload(tracer):
+    grpc = pytest.importorskip("grpc")
+    from concurrent import futures
+
+    from ddtrace.contrib.grpc import constants, patch, unpatch
+
+    # The servers and channels are only traced when created after patching
+    if tracer is not None:
+        patch()
+        Pin.override(constants.GRPC_PIN_MODULE_SERVER, tracer=tracer)
+        Pin.override(constants.GRPC_PIN_MODULE_CLIENT, tracer=tracer)
+
+    # A service without protobuf messages: the requests and responses are bytes
+    handler = grpc.method_handlers_generic_handler(
+        "bench.Users", {"Get": grpc.unary_unary_rpc_method_handler(lambda request, context: b"user " + request)}
+    )
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+    server.add_generic_rpc_handlers((handler,))
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    channel = grpc.insecure_channel("127.0.0.1:{}".format(port))
+    get = channel.unary_unary("/bench.Users/Get")
+    try:
+        yield lambda: get(b"42")
+    finally:
+        channel.close()
+        server.stop(None)
+        if tracer is not None:
+            unpatch()
+
+
+@pytest.mark.parametrize(
+    "workload",
+    [sqlite3_workload, flask_workload, django_workload, falcon_workload, starlette_workload, grpc_workload],
+    ids=["sqlite3", "flask", "django", "falcon", "starlette", "grpc"],
+)
+@pytest.mark.benchmark(group="overhead")
+def test_overhead(benchmark, agent, workload):
+    measure_overhead(benchmark, agent, workload)
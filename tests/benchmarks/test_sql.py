@@ -0,0 +1,36 @@
+import pytest
+
+from ddtrace.ext import sql
+
+
+# Queries as issued by ORMs and hand-written code, with and without literals
+QUERIES = [
+    "SELECT auth_user.id, auth_user.username, auth_user.email FROM auth_user WHERE auth_user.id = %s LIMIT 21",
+    "SELECT * FROM orders WHERE customer_id = 1234 AND status IN ('pending', 'paid', 'shipped') ORDER BY created_at",
+    "UPDATE sessions SET last_seen = '2020-10-01 12:34:56.789', hits = hits + 1 WHERE session_key = 'a8f5f167f44f4964'",
+    'INSERT INTO events (name, payload, created_at) VALUES (\'signup\', \'{"plan": "pro", "seats": 5}\', NOW())',
+    "SELECT p.id, p.name, COUNT(c.id) FROM products p LEFT JOIN comments c ON c.product_id = p.id "
+    "WHERE p.price BETWEEN 10.5 AND 99.99 GROUP BY p.id, p.name HAVING COUNT(c.id) > 3",
+    "/* controller:users,action:show */ SELECT users.* FROM users WHERE users.id IN (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)",
+    "DELETE FROM cache_entries WHERE expires_at < 1601554496 -- cleanup job",
+    'SELECT "accounts"."id" FROM "accounts" WHERE "accounts"."email" = \'john.doe@example.com\' LIMIT 1',
+]
+
+
+@pytest.mark.benchmark(group="sql.normalize", min_time=0.005)
+def test_normalize_query(benchmark):
+    def normalize():
+        sql._normalized_queries.clear()
+        for query in QUERIES:
+            sql.normalize_query(query)
+
+    benchmark(normalize)
+
+
+@pytest.mark.benchmark(group="sql.normalize", min_time=0.005)
+def test_normalize_query_cached(benchmark):
+    def normalize():
+        for query in QUERIES:
+            sql.normalize_query(query)
+
+    benchmark(normalize)
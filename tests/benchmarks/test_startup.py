@@ -0,0 +1,92 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from tests.benchmarks import startup
+
+
+# Regression budget of the import time, in microseconds, of what is imported in addition to the interpreter startup
+STARTUP_BUDGET = 100000
+
+# The lines of `python -X importtime`: "import time: <self us> | <cumulative us> | <indentation><module name>"
+IMPORT_TIME_REGEXP = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+def _import_times(code):
+    """Returns the cumulative import time of the modules imported at the top level when running the code."""
+    env = os.environ.copy()
+    # DEV: The startup logs ping the agent, which is not an import
+    env["DD_TRACE_STARTUP_LOGS"] = "0"
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", code], env=env, stderr=subprocess.STDOUT
+    )
+
+    import_times = {}
+    for line in output.decode().splitlines():
+        match = IMPORT_TIME_REGEXP.match(line)
+        if match and len(match.group(3)) == 1:
+            import_times[match.group(4)] = int(match.group(2))
+    return import_times
+
+
+def _startup_time(code):
+    """Returns the import time of the code, not counting the modules imported by the interpreter startup."""
+    interpreter = _import_times("pass")
+    return sum(t for name, t in _import_times(code).items() if name not in interpreter)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="-X importtime requires Python 3.7")
+@pytest.mark.parametrize(
+    "code",
+    ["import ddtrace", "import ddtrace; ddtrace.patch_all()"],
+    ids=["import", "patch_all"],
+)
+@pytest.mark.benchmark(group="startup")
+def test_startup(benchmark, code):
+    startup_times = []
+
+    def startup():
+        startup_times.append(_startup_time(code))
+
+    benchmark.pedantic(startup, rounds=5)
+
+    # DEV: The fastest run is the least affected by the noise of the machine
+    assert min(startup_times) < STARTUP_BUDGET
+
+
+@pytest.mark.parametrize("configuration", sorted(startup.CONFIGURATIONS))
+@pytest.mark.benchmark(group="startup.ddtrace_run")
+def test_ddtrace_run(benchmark, configuration):
+    runs = []
+
+    def ddtrace_run():
+        runs.append(startup.measure_ddtrace_run(configuration))
+
+    benchmark.pedantic(ddtrace_run, rounds=5)
+
+    assert all(run["loaded"] for run in runs)
+    # DEV: The peak memory ends up in the JSON report of pytest-benchmark, along with the wall time
+    benchmark.extra_info["rss"] = min(run["rss"] for run in runs)
+
+
+@pytest.mark.parametrize("configuration", sorted(startup.CONFIGURATIONS))
+@pytest.mark.benchmark(group="startup.phases")
+def test_startup_phases(benchmark, configuration):
+    runs = []
+
+    def measure_phases():
+        runs.append(startup.measure_phases(configuration))
+
+    benchmark.pedantic(measure_phases, rounds=5)
+
+    # The fastest and smallest of the runs of each phase, in the JSON report of pytest-benchmark
+    names = [phase["name"] for phase in runs[0]]
+    assert "import" in names and "tracer" in names and "patch_all" in names
+    for i, name in enumerate(names):
+        benchmark.extra_info[name] = {
+            "wall_time": min(run[i]["wall_time"] for run in runs),
+            "rss_delta": min(run[i]["rss_delta"] for run in runs),
+        }
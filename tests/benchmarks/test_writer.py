@@ -0,0 +1,208 @@
+"""Throughput of the ``AgentWriter`` under pressure, against an in-process :class:`FakeAgent`.
+
+Traces are produced as fast as possible for a few seconds while the writer sends them to the agent. The spans per
+second received by the agent, the CPU time of the writer thread, the traces dropped by the queue, the payloads
+the writer failed to send and the latency from ``span.finish()`` to the receipt of the span are reported in the
+``extra_info`` of the JSON report of pytest-benchmark.
+"""
+import functools
+import time
+
+import mock
+import pytest
+
+from ddtrace.api import API
+from ddtrace.encoding import JSONEncoder, MsgpackEncoder
+from ddtrace.payload import Payload
+
+from .agent import FakeAgent
+
+
+if not hasattr(time, "thread_time"):
+    pytest.skip("time.thread_time requires Python 3.7", allow_module_level=True)
+
+
+# Time, in seconds, during which traces are produced
+DURATION = 3
+
+# A trace: a web request with a few database queries
+TRACE_SPANS = 5
+
+ENCODERS = {
+    "msgpack": MsgpackEncoder,
+    "json": JSONEncoder,
+}
+
+
+def _percentile(sorted_values, percentile):
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * percentile // 100)]
+
+
+def _produce(tracer, duration):
+    """Produces traces for ``duration`` seconds."""
+    end = time.time() + duration
+    while time.time() < end:
+        with tracer.trace("web.request", service="web", resource="GET /users/<int:pk>") as root:
+            root.set_tag("http.method", "GET")
+            root.set_tag("http.status_code", "200")
+            for _ in range(TRACE_SPANS - 1):
+                with tracer.trace("sqlite.query", service="db", resource="SELECT name FROM users WHERE id = ?"):
+                    pass
+
+
+def measure_writer(benchmark, agent, encoder="msgpack", queue_size=None, timeout=None):
+    tracer = agent.tracer()
+    writer = tracer.writer
+    writer.api = API(
+        writer.api.hostname,
+        writer.api.port,
+        uds_path=writer.api.uds_path,
+        encoder=ENCODERS[encoder](),
+        priority_sampling=True,
+    )
+    if timeout is not None:
+        writer.api.TIMEOUT = timeout
+    if queue_size is not None:
+        writer._trace_queue.maxsize = queue_size
+
+    # The CPU time of the writer thread, of every flush
+    cpu_times = []
+    run_periodic = writer.run_periodic
+
+    def timed_run_periodic():
+        start = time.thread_time()
+        try:
+            run_periodic()
+        finally:
+            cpu_times.append(time.thread_time() - start)
+
+    writer.run_periodic = timed_run_periodic
+
+    # The payloads the writer failed to send, retries included: errors, timeouts and payloads too large
+    failures = []
+    send_traces = writer.api.send_traces
+
+    def counted_send_traces(traces):
+        responses = send_traces(traces)
+        failures.extend(r for r in responses if isinstance(r, Exception) or r.status >= 400)
+        return responses
+
+    writer.api.send_traces = counted_send_traces
+
+    # The payloads the writer sent again, after they failed
+    retries = []
+    send_payload = writer.api.send_payload
+
+    def counted_send_payload(payload):
+        response = send_payload(payload)
+        retries.append(response)
+        if isinstance(response, Exception) or response.status >= 400:
+            failures.append(response)
+        return response
+
+    writer.api.send_payload = counted_send_payload
+
+    elapsed = []
+
+    def run():
+        start = time.time()
+        _produce(tracer, DURATION)
+        tracer.shutdown()
+        elapsed.append(time.time() - start)
+
+    # DEV: Forget what the tracer sent before the measurement, like the ping of its startup diagnostics
+    benchmark.pedantic(run, setup=agent.reset, rounds=1)
+
+    dropped, accepted, _ = writer._trace_queue.pop_stats()
+    # From the end of each span to the receipt of the payload holding it, in nanoseconds
+    latencies = sorted(
+        payload.received - (span["start"] + span["duration"])
+        for payload in agent.payloads
+        for trace in payload.traces()
+        for span in trace
+    )
+
+    benchmark.extra_info["spans_per_second"] = len(latencies) / elapsed[0]
+    benchmark.extra_info["writer_cpu_time"] = sum(cpu_times)
+    benchmark.extra_info["writer_cpu_time_per_span"] = sum(cpu_times) / len(latencies) if latencies else None
+    benchmark.extra_info["traces_queued"] = accepted
+    benchmark.extra_info["traces_dropped"] = dropped
+    benchmark.extra_info["payloads_sent"] = len(agent.payloads)
+    benchmark.extra_info["payloads_rejected"] = agent.errors
+    benchmark.extra_info["payloads_failed"] = len(failures)
+    benchmark.extra_info["payloads_retried"] = len(retries)
+    benchmark.extra_info["api_version"] = writer.api._version
+    benchmark.extra_info["circuit_breaker_open"] = writer._circuit_open
+    for p in (50, 90, 99):
+        benchmark.extra_info["p{}_latency".format(p)] = _percentile(latencies, p) / 1e9 if latencies else None
+
+
+@pytest.mark.parametrize("queue_size", [100, 1000, 10000])
+@pytest.mark.parametrize("encoder", sorted(ENCODERS))
+@pytest.mark.benchmark(group="writer.throughput")
+def test_throughput(benchmark, encoder, queue_size):
+    with FakeAgent() as agent:
+        measure_writer(benchmark, agent, encoder=encoder, queue_size=queue_size)
+        assert agent.payloads
+
+
+@pytest.mark.benchmark(group="writer.throughput")
+def test_throughput_uds(benchmark, tmp_path):
+    with FakeAgent(uds_path=str(tmp_path / "apm.socket")) as agent:
+        measure_writer(benchmark, agent)
+        assert agent.payloads
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_slow_agent(benchmark):
+    with FakeAgent(latency=0.5) as agent:
+        measure_writer(benchmark, agent)
+        assert agent.payloads
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_agent_timeouts(benchmark):
+    with FakeAgent(latency=0.2) as agent:
+        measure_writer(benchmark, agent, timeout=0.1)
+        assert benchmark.extra_info["payloads_failed"]
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_agent_errors(benchmark):
+    with FakeAgent(error_rate=0.5) as agent:
+        measure_writer(benchmark, agent)
+        assert benchmark.extra_info["payloads_failed"] == agent.errors
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_agent_unreachable(benchmark):
+    # Nothing listens on the port of the agent: the writer should neither encode the traces nor try to send them
+    agent = FakeAgent().start()
+    agent.stop()
+    measure_writer(benchmark, agent)
+    assert benchmark.extra_info["circuit_breaker_open"]
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_agent_downgrade(benchmark):
+    with FakeAgent(unsupported_endpoints=("/v0.4/traces",)) as agent:
+        measure_writer(benchmark, agent)
+        assert benchmark.extra_info["api_version"] == "v0.3"
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_agent_rate_by_service(benchmark):
+    # The rates of a large deployment: every response updates the rates of the priority sampler
+    rates = {"service:service-{},env:prod".format(i): 0.5 for i in range(1000)}
+    with FakeAgent(rate_by_service=rates) as agent:
+        measure_writer(benchmark, agent)
+        assert agent.payloads
+
+
+@pytest.mark.benchmark(group="writer.agent")
+def test_payload_full(benchmark):
+    # Payloads of 64KB rather than 5MB: the traces of a flush are split in many payloads
+    with mock.patch("ddtrace.api.Payload", functools.partial(Payload, max_payload_size=64 * 1024)):
+        with FakeAgent() as agent:
+            measure_writer(benchmark, agent)
+            assert len(agent.payloads) > benchmark.extra_info["traces_queued"] // 1000
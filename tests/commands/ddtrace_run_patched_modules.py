@@ -1,5 +1,8 @@
 from ddtrace import monkey
 
 if __name__ == "__main__":
+    # The integrations are patched when their library is first imported
+    import redis  # noqa
+
     assert "redis" in monkey.get_patched_modules()
     print("Test success")
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from ddtrace.compat import CONTEXTVARS_IS_AVAILABLE
+from ddtrace.contrib.asyncio import monitor
+from .utils import AsyncioTestCase
+
+
+class TestLoopMonitor(AsyncioTestCase):
+    def setUp(self):
+        super(TestLoopMonitor, self).setUp()
+        self.monitor = monitor.LoopMonitor(tracer=self.tracer, interval=0.01, slow_callback_threshold=0.02)
+        self.monitor.start(self.loop)
+
+    def tearDown(self):
+        self.monitor.stop()
+        self.loop.close()
+        super(TestLoopMonitor, self).tearDown()
+
+    def test_patch(self):
+        handle_run = asyncio.events.Handle.__dict__["_run"]
+        create_task = asyncio.BaseEventLoop.__dict__["create_task"]
+        self.monitor.stop()
+        assert asyncio.events.Handle.__dict__["_run"] is handle_run.__wrapped__
+        assert asyncio.BaseEventLoop.__dict__["create_task"] is create_task.__wrapped__
+        assert not self.monitor.running
+
+    def test_patch_monitors(self):
+        handle_run = asyncio.events.Handle.__dict__["_run"]
+        other_monitor = monitor.LoopMonitor(tracer=self.tracer)
+        other_loop = asyncio.new_event_loop()
+        try:
+            other_monitor.start(other_loop)
+            # The monitors share the same patch
+            assert asyncio.events.Handle.__dict__["_run"] is handle_run
+            self.monitor.stop()
+            assert asyncio.events.Handle.__dict__["_run"] is handle_run
+        finally:
+            other_monitor.stop()
+            other_loop.close()
+        assert asyncio.events.Handle.__dict__["_run"] is handle_run.__wrapped__
+
+    def test_unmonitored_loop(self):
+        other_loop = asyncio.new_event_loop()
+        try:
+            other_loop.call_soon(time.sleep, 0.03)
+            other_loop.run_until_complete(other_loop.create_task(asyncio.sleep(0)))
+        finally:
+            other_loop.close()
+        assert self.monitor.slow_callbacks.count == 0
+        assert self.monitor.task_delay.count == 0
+
+    def test_lag(self):
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        lag_before = self.monitor.lag.copy()
+        self.loop.call_soon(time.sleep, 0.05)
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        lag = self.monitor.lag - lag_before
+        assert lag.count >= 1
+        assert lag.percentile(100) >= 0.03 * 1e9
+
+    def test_slow_callback(self):
+        self.loop.call_soon(time.sleep, 0.03)
+        self.loop.call_soon(time.sleep, 0)
+        self.loop.run_until_complete(asyncio.sleep(0))
+        assert self.monitor.slow_callbacks.count == 1
+        assert self.monitor.slow_callbacks.total_ns >= 0.03 * 1e9
+
+    @pytest.mark.skipif(not CONTEXTVARS_IS_AVAILABLE, reason="the span of a callback is found with contextvars")
+    def test_slow_callback_span(self):
+        with self.tracer.trace("parent") as span:
+            self.loop.call_soon(time.sleep, 0.03)
+        self.loop.run_until_complete(asyncio.sleep(0))
+        assert span.get_metric(monitor.BLOCKED_KEY) is None
+
+        span = self.tracer.trace("parent")
+        self.loop.call_soon(time.sleep, 0.03)
+        self.loop.run_until_complete(asyncio.sleep(0))
+        span.finish()
+        assert span.get_metric(monitor.BLOCKED_KEY) >= 0.03 * 1e9
+        assert span.get_tag(monitor.SLOW_CALLBACK_KEY) == "sleep"
+
+    def test_task_delay(self):
+        span = self.tracer.trace("parent")
+        self.loop.call_soon(time.sleep, 0.03)
+        task = self.loop.create_task(asyncio.sleep(0))
+        self.loop.run_until_complete(task)
+        span.finish()
+        assert self.monitor.task_delay.count == 1
+        assert self.monitor.task_delay.total_ns >= 0.03 * 1e9
+        assert span.get_metric(monitor.TASK_DELAY_KEY) >= 0.03 * 1e9
+        assert self.monitor._task_handles == {}
+
+    def test_task_never_run(self):
+        coro = asyncio.sleep(0)
+        self.loop.create_task(coro)
+        assert len(self.monitor._task_handles) == 1
+        # Closing the loop drops the first step of the task without running it
+        self.loop.close()
+        coro.close()
+        assert len(self.monitor._task_handles) == 0
+
+    def test_callback_name(self):
+        task = self.loop.create_task(asyncio.sleep(0))
+        assert monitor._callback_name(self.loop._ready[-1]._callback) == "sleep"
+        assert monitor._callback_name(self.test_callback_name) == "TestLoopMonitor.test_callback_name"
+        self.loop.run_until_complete(task)
@@ -184,6 +184,18 @@ class TestTracedCursor(TracerTestCase):
         assert span.get_metric('db.rowcount') == 123, 'Row count is set as a metric'
         assert span.get_metric('sql.rows') == 123, 'Row count is set as a tag (for legacy django cursor replacement)'
 
+    def test_span_resource_normalized(self):
+        cursor = self.cursor
+        tracer = self.tracer
+        cursor.rowcount = 0
+        pin = Pin('my_service', app='my_app', tracer=tracer)
+        traced_cursor = TracedCursor(cursor, pin, {})
+
+        with self.override_global_config(dict(sql_normalization_enabled=True)):
+            traced_cursor.execute("SELECT * FROM t WHERE id IN (1, 2) AND name = 'foo' /* bar */")
+        span = tracer.writer.pop()[0]  # type: Span
+        assert span.resource == "SELECT * FROM t WHERE id IN ( ? ) AND name = ?"
+
     def test_cfg_service(self):
         cursor = self.cursor
         tracer = self.tracer
@@ -41,6 +41,7 @@ urlpatterns = [
     url(r"^authenticated/$", authenticated_view, name="authenticated-view"),
     url(r"^static-method-view/$", views.StaticMethodView.as_view(), name="static-method-view"),
     url(r"^fn-view/$", views.function_view, name="fn-view"),
+    url(r"^slow-view/$", views.slow_view, name="slow-view"),
     url(r"^feed-view/$", views.FeedView(), name="feed-view"),
     url(r"^partial-view/$", views.partial_view, name="partial-view"),
     url(r"^lambda-view/$", views.lambda_view, name="lambda-view"),
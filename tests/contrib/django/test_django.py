@@ -1,5 +1,7 @@
+import importlib
 import itertools
 import django
+import mock
 from django.views.generic import TemplateView
 from django.test import modify_settings, override_settings
 import os
@@ -18,6 +20,9 @@ from ddtrace.propagation.utils import get_wsgi_header
 from tests import override_config, override_global_config, override_http_config, assert_dict_issuperset
 from tests.opentracer.utils import init_tracer
 
+# DEV: `ddtrace.contrib.django.patch` is the `patch` function when imported from its package
+django_patch = importlib.import_module("ddtrace.contrib.django.patch")
+
 pytestmark = pytest.mark.skipif("TEST_DATADOG_DJANGO_MIGRATION" in os.environ, reason="test only without migration")
 
 
@@ -236,6 +241,90 @@ def test_v2XX_middleware(client, test_spans):
     assert first_middleware.parent_id == root_span.span_id
 
 
+@pytest.mark.skipif(django.VERSION < (2, 0, 0), reason="")
+def test_v2XX_middleware_collapsed(client, test_spans):
+    """
+    When making a request to a Django app
+        When the middleware is collapsed
+            We report the durations of the middleware hooks on the `django.request` span
+    """
+    with override_config("django", dict(collapse_middleware=True, middleware_span_threshold=60)):
+        resp = client.get("/")
+    assert resp.status_code == 200
+
+    test_spans.assert_span_count(2)
+    root = test_spans.get_root_span()
+    assert root.name == "django.request"
+    durations = dict((key, value) for key, value in root.metrics.items() if key.startswith("django.middleware."))
+    assert len(durations) == 24
+    assert all(value >= 0 for value in durations.values())
+    assert "django.middleware.django.middleware.csrf.CsrfViewMiddleware.process_view.duration_ns" in durations
+    # Each duration excludes the time spent in the next middleware and in the view
+    call_duration = durations["django.middleware.django.middleware.security.SecurityMiddleware.__call__.duration_ns"]
+    assert call_duration < root.duration_ns - sum(
+        value for key, value in durations.items() if "SecurityMiddleware" not in key
+    )
+    test_spans.reset()
+
+    # Spans are created for the hooks slower than the threshold
+    with override_config("django", dict(collapse_middleware=True, middleware_span_threshold=0)):
+        resp = client.get("/")
+    assert resp.status_code == 200
+
+    test_spans.assert_span_count(26)
+    root = test_spans.get_root_span()
+    middleware_spans = list(test_spans.filter_spans(name="django.middleware"))
+    assert len(middleware_spans) == 24
+    for span in middleware_spans:
+        assert span.parent_id == root.span_id
+        assert root.start_ns <= span.start_ns
+        assert span.start_ns + span.duration_ns <= root.start_ns + root.duration_ns
+
+
+@pytest.mark.skipif(django.VERSION < (2, 0, 0), reason="")
+def test_v2XX_middleware_collapsed_slow_view(client, test_spans):
+    """
+    When making a request to a slow view of a Django app
+        When the middleware is collapsed
+            We do not count the view in the duration of the innermost middleware
+    """
+    with override_config("django", dict(collapse_middleware=True, middleware_span_threshold=0.2)):
+        resp = client.get("/slow-view/")
+    assert resp.status_code == 200
+
+    root = test_spans.get_root_span()
+    assert root.duration_ns >= 0.3 * 1e9
+    call_duration = root.get_metric(
+        "django.middleware.tests.contrib.django.middleware.EverythingMiddleware.__call__.duration_ns"
+    )
+    assert 0 <= call_duration < 0.2 * 1e9
+    assert list(test_spans.filter_spans(name="django.middleware")) == []
+    assert len(list(test_spans.filter_spans(name="django.view"))) == 1
+
+
+@pytest.mark.skipif(django.VERSION < (2, 2, 0), reason="")
+def test_request_resolution(client, test_spans):
+    """
+    When making a request to a Django app
+        We name the request span from the resolution made by Django
+        We resolve the requests not resolved by Django once per path
+    """
+    django_patch._resolutions.clear()
+    with mock.patch.object(django_patch, "get_resolver", wraps=django_patch.get_resolver) as get_resolver:
+        assert client.get("/path/").status_code == 200
+        assert get_resolver.call_count == 0
+        assert test_spans.get_root_span().resource == "GET path/"
+        test_spans.reset()
+
+        for _ in range(2):
+            assert client.get("/unknown/endpoint").status_code == 404
+        assert get_resolver.call_count == 1
+
+    roots = [span for span in test_spans.spans if span.name == "django.request"]
+    assert [root.resource for root in roots] == ["GET 404", "GET 404"]
+    assert (None, "/unknown/endpoint") in django_patch._resolutions
+
+
 def test_django_request_not_found(client, test_spans):
     """
     When making a request to a Django app
@@ -3,6 +3,7 @@ Class based views used for Django tests.
 """
 
 from functools import partial
+import time
 
 from django.contrib.auth.models import User
 from django.contrib.syndication.views import Feed
@@ -57,6 +58,11 @@ def function_view(request):
     return HttpResponse(status=200)
 
 
+def slow_view(request):
+    time.sleep(0.3)
+    return HttpResponse(status=200)
+
+
 def error_500(request):
     raise Exception("Error 500")
 
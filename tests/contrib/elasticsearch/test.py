@@ -7,12 +7,13 @@ from ddtrace.ext import http
 from ddtrace.contrib.elasticsearch import get_traced_transport
 from ddtrace.contrib.elasticsearch.elasticsearch import elasticsearch
 from ddtrace.contrib.elasticsearch.patch import patch, unpatch
+from ddtrace.contrib.elasticsearch.quantize import Quantizer
 
 # testing
 from tests.opentracer.utils import init_tracer
 from tests.tracer.test_tracer import get_dummy_tracer
 from ..config import ELASTICSEARCH_CONFIG
-from ... import TracerTestCase, assert_span_http_status_code
+from ... import TracerTestCase, assert_span_http_status_code, override_config
 
 
 class ElasticsearchTest(TracerTestCase):
@@ -402,3 +403,19 @@ class ElasticsearchPatchTest(TracerTestCase):
             pass
         spans = self.get_spans()
         assert len(spans) == 1
+
+
+def test_quantize():
+    quantizer = Quantizer()
+    assert quantizer.resource("GET", "/index/type/42") == "GET /index/type/?"
+    assert quantizer.resource("GET", "/index/type/42?pretty") == "GET /index/type/??pretty"
+    assert quantizer.resource("PUT", "/1/2") == "PUT /?/2"
+    assert quantizer.resource("PUT", "/12/34") == "PUT /?/?"
+    assert quantizer.resource("GET", "/logs-2020.10.01/_search") == "GET /logs-?.?.?/_search"
+    assert quantizer.resource("GET", "/logs-2020.10.01/_search") == "GET /logs-?.?.?/_search"
+    assert quantizer._resources.hits == 1
+
+    with override_config("elasticsearch", dict(quantize_index_patterns=[r"-[0-9.]+", "users_[a-z]+"])):
+        assert quantizer.resource("GET", "/logs-2020.10.01/_search") == "GET /logs?/_search"
+        assert quantizer.resource("GET", "/users_fr/doc/12") == "GET /?/doc/?"
+    assert quantizer.resource("GET", "/users_fr/doc/12") == "GET /users_fr/doc/?"
@@ -8,7 +8,7 @@ import pymongo
 from ddtrace import Pin
 from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY
 from ddtrace.ext import mongo as mongox, SpanTypes
-from ddtrace.contrib.pymongo.client import normalize_filter
+from ddtrace.contrib.pymongo.client import _query_shape, normalize_filter
 from ddtrace.contrib.pymongo.patch import patch, unpatch, trace_mongo_client
 
 # testing
@@ -63,6 +63,16 @@ def test_normalize_filter():
         assert expected == out
 
 
+def test_query_shape():
+    assert _query_shape({'team': 'leafs'}) == _query_shape({'team': 'habs'})
+    assert _query_shape({'_id': {'$in': [1, 2]}}) == _query_shape({'_id': {'$in': [3]}})
+    assert _query_shape({'$or': [{'a': 1}]}) == _query_shape({'$or': [{'a': 'b'}]})
+    assert _query_shape({'team': 'leafs'}) != _query_shape({'city': 'toronto'})
+    assert _query_shape({'age': 20}) != _query_shape({'age': {'$gt': 20}})
+    assert _query_shape({'$or': [{'a': 1}]}) != _query_shape({'$or': [{'a': 1}, {'b': 1}]})
+    assert _query_shape({'a': []}) != _query_shape({'a': {}})
+
+
 class PymongoCore(object):
     """Test suite for pymongo
 
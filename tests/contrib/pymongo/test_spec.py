@@ -2,9 +2,13 @@
 tests for parsing specs.
 """
 
+import struct
+
+import bson
 from bson.son import SON
 
-from ddtrace.contrib.pymongo.parse import parse_spec
+from ddtrace.ext import net
+from ddtrace.contrib.pymongo.parse import MAX_MSG_PARSE_LEN, parse_msg, parse_spec
 
 
 def test_empty():
@@ -50,3 +54,78 @@ def test_update():
     assert cmd.name == 'update'
     assert cmd.coll == 'songs'
     assert cmd.query == {'artist': 'Neil'}
+
+
+def _op_msg(spec):
+    body = struct.pack('<iB', 0, 0) + bson.BSON.encode(spec)
+    return struct.pack('<iiii', 16 + len(body), 1, 0, 2013) + body
+
+
+def _op_query(ns, spec):
+    body = struct.pack('<i', 0) + ns + b'\x00' + struct.pack('<ii', 0, -1) + bson.BSON.encode(spec)
+    return struct.pack('<iiii', 16 + len(body), 1, 0, 2004) + body
+
+
+def test_parse_msg_insert():
+    spec = SON([
+        ('insert', 'songs'),
+        ('ordered', True),
+        ('lsid', {'id': bson.Binary(b'0123456789abcdef', 4)}),
+        ('documents', [{'_id': bson.ObjectId(), 'artist': 'Neil', 'year': 1970, 'tags': ['rock', 1.5]}] * 3),
+        ('$db', 'testdb'),
+    ])
+    msg = _op_msg(spec)
+    cmd = parse_msg(msg)
+    assert cmd.name == 'insert'
+    assert cmd.coll == 'songs'
+    assert cmd.db == 'testdb'
+    assert cmd.tags == {'mongodb.ordered': True}
+    assert cmd.metrics == {'mongodb.documents': 3, net.BYTES_OUT: len(msg)}
+
+
+def test_parse_msg_update():
+    spec = SON([
+        ('update', 'songs'),
+        ('ordered', False),
+        ('updates', [
+            SON([
+                ('q', {'artist': 'Neil', 'year': {'$in': [1970, 1971]}, '$or': [{'a': 1}, {'b': [1, 2]}]}),
+                ('u', {'$set': {'artist': 'Shakey'}}),
+            ])
+        ]),
+        ('$db', 'testdb'),
+    ])
+    cmd = parse_msg(_op_msg(spec))
+    assert cmd.name == 'update'
+    assert cmd.tags == {'mongodb.ordered': False}
+    assert cmd.query == {'artist': '?', 'year': {'$in': '?'}, '$or': [{'a': '?'}, {'b': [{}, {}]}]}
+
+
+def test_parse_msg_delete():
+    spec = SON([
+        ('delete', 'songs'),
+        ('deletes', [SON([('q', {'artist': bson.regex.Regex('^N')}), ('limit', 1)])]),
+        ('$db', 'testdb'),
+    ])
+    cmd = parse_msg(_op_msg(spec))
+    assert cmd.name == 'delete'
+    assert cmd.coll == 'songs'
+    assert cmd.query == {'artist': '?'}
+
+
+def test_parse_msg_query():
+    cmd = parse_msg(_op_query(b'testdb.$cmd', SON([('count', 'songs'), ('query', {'artist': 'Neil'})])))
+    assert cmd.name == 'count'
+    assert cmd.db == 'testdb'
+    assert cmd.coll == 'songs'
+
+    cmd = parse_msg(_op_query(b'testdb.songs', SON([('ping', 1)])))
+    assert cmd.name == 'ping'
+    assert cmd.coll == 1
+
+
+def test_parse_msg_too_large():
+    spec = SON([('insert', 'songs'), ('documents', [{'data': 'x' * MAX_MSG_PARSE_LEN}])])
+    cmd = parse_msg(_op_msg(spec))
+    assert cmd.name == 'command'
+    assert cmd.coll == 'untraced_message_too_large'
@@ -126,6 +126,35 @@ class TestRedisPatch(TracerTestCase):
         assert span.get_metric("redis.pipeline_length") == 3
         assert span.get_metric(ANALYTICS_SAMPLE_RATE_KEY) is None
 
+    def test_pipeline_aggregated(self):
+        with self.override_config("redis", dict(aggregate_pipelines=True, raw_command_sample_rate=0.0)):
+            with self.r.pipeline(transaction=False) as p:
+                p.set("blah", 32)
+                p.set("foo", u"éé")
+                p.hgetall("xxx")
+                p.execute()
+
+        spans = self.get_spans()
+        assert len(spans) == 1
+        span = spans[0]
+        assert span.resource == u"HGETALL\nSET"
+        assert span.get_tag("redis.raw_command") is None
+        assert span.get_metric("redis.pipeline_length") == 3
+        assert span.get_metric("redis.pipeline.SET.count") == 2
+        assert span.get_metric("redis.pipeline.HGETALL.count") == 1
+        assert span.get_metric("redis.args_size") == len("blah32fooééxxx")
+
+    def test_raw_command_sample_rate(self):
+        with self.override_config("redis", dict(raw_command_sample_rate=0.0)):
+            self.r.get("cheese")
+
+        spans = self.get_spans()
+        assert len(spans) == 1
+        span = spans[0]
+        assert span.resource == u"GET"
+        assert span.get_tag("redis.raw_command") is None
+        assert span.get_metric("redis.args_length") == 2
+
     def test_pipeline_immediate(self):
         with self.r.pipeline() as p:
             p.set("a", 1)
@@ -71,6 +71,24 @@ class TestRedisPatch(TracerTestCase):
         assert span.get_tag('redis.raw_command') == u'SET blah 32\nRPUSH foo éé\nHGETALL xxx'
         assert span.get_metric('redis.pipeline_length') == 3
 
+    def test_pipeline_aggregated(self):
+        with self.override_config('rediscluster', dict(aggregate_pipelines=True)):
+            with self.r.pipeline(transaction=False) as p:
+                p.set('blah', 32)
+                p.set('foo', u'éé')
+                p.hgetall('xxx')
+                p.execute()
+
+        spans = self.get_spans()
+        assert len(spans) == 1
+        span = spans[0]
+        assert span.resource == u'HGETALL\nSET'
+        assert span.get_tag('redis.raw_command') == u'SET blah 32\nSET foo éé\nHGETALL xxx'
+        assert span.get_metric('redis.pipeline_length') == 3
+        assert span.get_metric('redis.pipeline.SET.count') == 2
+        assert span.get_metric('redis.pipeline.HGETALL.count') == 1
+        assert span.get_metric('redis.args_size') == len('blah32fooééxxx')
+
     def test_patch_unpatch(self):
         tracer = get_dummy_tracer()
         writer = tracer.writer
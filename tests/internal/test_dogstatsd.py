@@ -0,0 +1,109 @@
+import threading
+
+import mock
+
+from ddtrace.internal.dogstatsd import AggregatingDogStatsd
+
+
+def _get_client(**kwargs):
+    client = AggregatingDogStatsd(**kwargs)
+    client.socket = mock.Mock()
+    return client
+
+
+def _sent(client):
+    return [call.args[0].decode("utf-8") for call in client.socket.send.mock_calls]
+
+
+def test_aggregate():
+    client = _get_client()
+    client.increment("foo")
+    client.increment("foo", 2)
+    client.increment("foo", tags=["a:b"])
+    client.gauge("bar", 1)
+    client.gauge("bar", 3)
+    client.histogram("baz", 1)
+    client.histogram("baz", 2)
+    client.distribution("qux", 1)
+    assert client.socket.send.mock_calls == []
+
+    client.flush()
+    assert _sent(client) == ["foo:3|c\nfoo:1|c|#a:b\nbar:3|g\nbaz:1|h\nbaz:2|h\nqux:1|d"]
+
+    client.flush()
+    assert len(client.socket.send.mock_calls) == 1
+
+
+def test_histogram_samples():
+    client = _get_client(max_packet_size=65536)
+    for i in range(client.MAX_SAMPLES_PER_CONTEXT * 4):
+        client.histogram("foo", i, tags=["a:b"])
+    client.histogram("foo", 0)
+    client.flush()
+    packets = _sent(client)[0].split("\n")
+    assert len(packets) == client.MAX_SAMPLES_PER_CONTEXT + 1
+    assert all(packet.endswith(":0|h") or packet.endswith("|h|@0.25|#a:b") for packet in packets)
+    assert "foo:0|h" in packets
+
+
+def test_constant_tags_namespace():
+    client = _get_client(namespace="ns", constant_tags=["env:test"])
+    client.increment("foo", tags=["a:b"])
+    client.increment("foo", tags=["a:b"])
+    with client:
+        client.gauge("bar", 1)
+    assert _sent(client) == ["ns.foo:2|c|#a:b,env:test\nns.bar:1|g|#env:test"]
+
+
+def test_sample_rate():
+    client = _get_client()
+    client.increment("foo", sample_rate=0)
+    client.increment("foo", sample_rate=0.99999999)
+    client.flush()
+    assert _sent(client) == ["foo:1|c|@0.99999999"]
+
+
+def test_events():
+    client = _get_client()
+    client.service_check("check", client.OK)
+    client.event("title", "text")
+    client.flush()
+    assert _sent(client) == ["_sc|check|0\n_e{5,4}:title|text"]
+
+
+def test_pack():
+    client = _get_client(max_packet_size=20)
+    for i in range(5):
+        client.histogram("foo", i)
+    client.flush()
+    assert _sent(client) == ["foo:0|h\nfoo:1|h", "foo:2|h\nfoo:3|h", "foo:4|h"]
+    assert all(len(datagram) <= 20 for datagram in _sent(client))
+
+
+def test_max_packet_size():
+    assert AggregatingDogStatsd().max_packet_size == 1432
+    assert AggregatingDogStatsd(socket_path="/foo.sock").max_packet_size == 8192
+
+
+def test_no_flush_on_report():
+    client = _get_client()
+    for i in range(client.MAX_PENDING_PACKETS * 2):
+        client.increment("foo", sample_rate=0.99999999)
+    assert client.socket.send.mock_calls == []
+    assert len(client._packets) == client.MAX_PENDING_PACKETS
+
+
+def test_threads():
+    client = _get_client()
+
+    def _target():
+        for _ in range(1000):
+            client.increment("foo")
+
+    threads = [threading.Thread(target=_target) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    client.flush()
+    assert _sent(client) == ["foo:10000|c"]
@@ -0,0 +1,85 @@
+import gc
+
+import pytest
+
+from ddtrace.internal import gcpause
+
+
+def test_callback():
+    tracker = gcpause.GCPauseTracker()
+    calls = []
+    tracker.register(lambda generation, duration_ns, frame: calls.append((generation, duration_ns, frame)))
+    tracker._callback("start", {"generation": 1})
+    tracker._callback("stop", {"generation": 1})
+    tracker.uninstall()
+    assert tracker.stats[1].count == 1
+    assert tracker.stats[0].count == 0
+    assert len(calls) == 1
+    generation, duration_ns, frame = calls[0]
+    assert generation == 1
+    assert duration_ns >= 0
+    assert frame.f_code.co_name == "test_callback"
+
+
+def test_callback_listener_error():
+    tracker = gcpause.GCPauseTracker()
+
+    def _listener(generation, duration_ns, frame):
+        raise RuntimeError
+
+    tracker.register(_listener)
+    tracker._callback("start", {"generation": 0})
+    tracker._callback("stop", {"generation": 0})
+    tracker.uninstall()
+    assert tracker.stats[0].count == 1
+
+
+def test_unregister():
+    tracker = gcpause.GCPauseTracker()
+    calls = []
+
+    def _listener(generation, duration_ns, frame):
+        calls.append(generation)
+
+    tracker.register(_listener)
+    tracker.register(_listener)
+    tracker.unregister(_listener)
+    tracker._callback("start", {"generation": 0})
+    tracker._callback("stop", {"generation": 0})
+    tracker.uninstall()
+    assert calls == []
+
+
+@pytest.mark.skipif(not hasattr(gc, "callbacks"), reason="gc.callbacks is not available")
+def test_install():
+    tracker = gcpause.GCPauseTracker()
+    tracker.install()
+    tracker.install()
+    try:
+        assert gc.callbacks.count(tracker._callback) == 1
+        gc.collect()
+        assert tracker.stats[2].count >= 1
+    finally:
+        tracker.uninstall()
+    assert tracker._callback not in gc.callbacks
+
+
+@pytest.mark.skipif(not hasattr(gc, "callbacks"), reason="gc.callbacks is not available")
+def test_unregister_last_listener():
+    tracker = gcpause.GCPauseTracker()
+
+    def _listener(generation, duration_ns, frame):
+        pass
+
+    def _other_listener(generation, duration_ns, frame):
+        pass
+
+    tracker.register(_listener)
+    tracker.register(_other_listener)
+    try:
+        tracker.unregister(_listener)
+        assert tracker._callback in gc.callbacks
+        tracker.unregister(_other_listener)
+        assert tracker._callback not in gc.callbacks
+    finally:
+        tracker.uninstall()
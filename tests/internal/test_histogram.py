@@ -0,0 +1,35 @@
+from ddtrace.internal import histogram
+
+
+def test_add():
+    stats = histogram.DurationHistogram()
+    stats.add(1)
+    stats.add(2000)
+    stats.add(2 ** 40)
+    assert stats.count == 3
+    assert stats.total_ns == 2 ** 40 + 2001
+    assert stats.buckets[0] == 1
+    assert stats.buckets[1] == 1
+    assert stats.buckets[-1] == 1
+
+
+def test_percentile():
+    stats = histogram.DurationHistogram()
+    assert stats.percentile(95) == 0
+    for _ in range(99):
+        stats.add(100)
+    stats.add(100000)
+    assert stats.percentile(95) == histogram.BUCKETS[0]
+    assert stats.percentile(100) == 2 ** 17
+
+
+def test_sub_copy():
+    stats = histogram.DurationHistogram()
+    stats.add(100)
+    before = stats.copy()
+    stats.add(5000)
+    window = stats - before
+    assert before.count == 1
+    assert window.count == 1
+    assert window.total_ns == 5000
+    assert window.percentile(100) == 2 ** 13
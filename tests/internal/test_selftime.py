@@ -0,0 +1,49 @@
+import threading
+
+from ddtrace.internal import selftime
+
+
+def setup_function(function):
+    selftime.reset()
+
+
+def test_add_and_snapshot():
+    assert selftime.snapshot() == {}
+    selftime.add("foo", 10)
+    selftime.add("foo", 5)
+    selftime.add("bar", 1)
+    assert selftime.snapshot() == {"foo": 15, "bar": 1}
+
+
+def test_add_threads():
+    def _target():
+        for _ in range(100):
+            selftime.add("foo", 1)
+
+    threads = [threading.Thread(target=_target) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert selftime.snapshot() == {"foo": 1000}
+    # The CPU time of the threads that exited is folded per component
+    assert selftime._exited == {"foo": 1000}
+    assert all(ref() is None or ref() is selftime._local.key for ref in selftime._threads)
+
+
+def test_reset_threads():
+    selftime.add("foo", 1)
+    t = threading.Thread(target=selftime.add, args=("bar", 2))
+    t.start()
+    t.join()
+    assert selftime.snapshot() == {"foo": 1, "bar": 2}
+    selftime.reset()
+    assert selftime.snapshot() == {}
+    selftime.add("foo", 3)
+    assert selftime.snapshot() == {"foo": 3}
+
+
+def test_thread_time_ns():
+    start = selftime.thread_time_ns()
+    sum(range(100000))
+    assert selftime.thread_time_ns() >= start
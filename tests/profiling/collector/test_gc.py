@@ -0,0 +1,76 @@
+from __future__ import absolute_import
+
+import gc
+
+import pytest
+
+from ddtrace.vendor.six.moves import _thread
+
+from ddtrace.internal import gcpause
+from ddtrace.profiling import recorder
+from ddtrace.profiling.collector import gc as gc_collector
+
+from . import test_collector
+
+
+pytestmark = pytest.mark.skipif(not hasattr(gc, "callbacks"), reason="gc.callbacks is not available")
+
+
+def test_repr():
+    test_collector._test_repr(
+        gc_collector.GCCollector,
+        "GCCollector(status=<ServiceStatus.STOPPED: 'stopped'>, "
+        "recorder=Recorder(default_max_events=32768, max_events={}), capture_pct=2.0, nframes=64, tracer=None)",
+    )
+
+
+def test_register():
+    r = recorder.Recorder()
+    c = gc_collector.GCCollector(r)
+    with c:
+        assert c._on_gc_pause in gcpause.tracker._listeners
+        assert gcpause.tracker._callback in gc.callbacks
+    assert c._on_gc_pause not in gcpause.tracker._listeners
+
+
+def test_gc_events():
+    r = recorder.Recorder()
+    with gc_collector.GCCollector(r) as c:
+        gc.collect()
+        c.periodic()
+    events = [e for e in r.events[gc_collector.GCPauseEvent] if e.generation == 2]
+    assert len(events) >= 1
+    event = events[0]
+    assert event.thread_id == _thread.get_ident()
+    assert event.duration_ns >= 0
+    assert event.sampling_pct == 100
+    assert event.frames[0][2] == "test_gc_events"
+    assert event.trace_ids is None
+    assert event.span_ids is None
+
+
+def test_gc_events_tracer(tracer):
+    r = recorder.Recorder()
+    with gc_collector.GCCollector(r, tracer=tracer) as c:
+        with tracer.trace("test") as t:
+            gc.collect()
+        c.periodic()
+    event = [e for e in r.events[gc_collector.GCPauseEvent] if e.generation == 2][0]
+    assert event.trace_ids == {t.trace_id}
+    assert event.span_ids == {t.span_id}
+
+
+def test_capture_pct():
+    r = recorder.Recorder()
+    c = gc_collector.GCCollector(r, capture_pct=10)
+    for _ in range(100):
+        c._on_gc_pause(0, 1, None)
+    c._on_gc_pause(1, 1, None)
+    c.periodic()
+    events = r.events[gc_collector.GCPauseEvent]
+    assert len([e for e in events if e.generation == 0]) == 10
+    assert [e.sampling_pct for e in events if e.generation == 1] == [100]
+
+
+def test_restart():
+    test_collector._test_restart(gc_collector.GCCollector)
@@ -0,0 +1,137 @@
+import os
+import select
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from ddtrace.vendor.six.moves import _thread
+
+from ddtrace.profiling import recorder
+from ddtrace.profiling.collector import iowait
+
+from . import test_collector
+
+
+def test_repr():
+    test_collector._test_repr(
+        iowait.IOWaitCollector,
+        "IOWaitCollector(status=<ServiceStatus.STOPPED: 'stopped'>, "
+        "recorder=Recorder(default_max_events=32768, max_events={}), capture_pct=2.0, nframes=64, "
+        "ignore_profiler=True, tracer=None)",
+    )
+
+
+def test_patch():
+    r = recorder.Recorder()
+    sleep = time.sleep
+    recv = socket.socket.recv
+    select_ = select.select
+    wait = subprocess.Popen.wait
+    with iowait.IOWaitCollector(r):
+        assert time.sleep is not sleep
+        assert socket.socket.__dict__["recv"] is not recv
+    assert time.sleep is sleep
+    assert "recv" not in socket.socket.__dict__
+    assert socket.socket.recv is recv
+    assert select.select is select_
+    assert subprocess.Popen.wait is wait
+
+
+def test_sleep_events():
+    r = recorder.Recorder()
+    with iowait.IOWaitCollector(r, capture_pct=100):
+        time.sleep(0.01)
+    assert len(r.events[iowait.IOWaitEvent]) == 1
+    event = r.events[iowait.IOWaitEvent][0]
+    assert event.io_call == "time.sleep"
+    assert event.thread_id == _thread.get_ident()
+    assert event.wait_time_ns >= 0.01 * 1e9
+    assert event.frames[0] == (__file__, 46, "test_sleep_events")
+    assert event.nframes > 3
+    assert event.sampling_pct == 100
+    assert event.trace_ids is None
+    assert event.span_ids is None
+
+
+def test_socket_events():
+    r = recorder.Recorder()
+    a, b = socket.socketpair()
+    try:
+        with iowait.IOWaitCollector(r, capture_pct=100):
+            a.sendall(b"foobar")
+            assert b.recv(6) == b"foobar"
+    finally:
+        a.close()
+        b.close()
+    assert [e.io_call for e in r.events[iowait.IOWaitEvent]] == ["socket.sendall", "socket.recv"]
+
+
+@pytest.mark.skipif(not hasattr(select, "poll"), reason="select.poll is unavailable")
+def test_select_events():
+    r = recorder.Recorder()
+    rfd, wfd = os.pipe()
+    try:
+        with iowait.IOWaitCollector(r, capture_pct=100):
+            os.write(wfd, b"x")
+            select.select([rfd], [], [], 1)
+            poller = select.poll()
+            poller.register(rfd, select.POLLIN)
+            assert poller.poll(1000)
+            assert os.read(rfd, 1) == b"x"
+    finally:
+        os.close(rfd)
+        os.close(wfd)
+    assert [e.io_call for e in r.events[iowait.IOWaitEvent]] == ["os.write", "select.select", "select.poll", "os.read"]
+
+
+def test_subprocess_events():
+    r = recorder.Recorder()
+    with iowait.IOWaitCollector(r, capture_pct=100):
+        p = subprocess.Popen([sys.executable, "-c", "pass"])
+        p.wait()
+    assert "subprocess.wait" in {e.io_call for e in r.events[iowait.IOWaitEvent]}
+
+
+def test_io_wait_events_tracer(tracer):
+    r = recorder.Recorder()
+    with iowait.IOWaitCollector(r, tracer=tracer, capture_pct=100):
+        with tracer.trace("test") as t:
+            time.sleep(0)
+    event = r.events[iowait.IOWaitEvent][0]
+    assert event.trace_ids == {t.trace_id}
+    assert event.span_ids == {t.span_id}
+
+
+def test_capture_pct():
+    r = recorder.Recorder()
+    with iowait.IOWaitCollector(r, capture_pct=10):
+        for _ in range(100):
+            time.sleep(0)
+    assert len(r.events[iowait.IOWaitEvent]) == 10
+
+
+def test_restart():
+    test_collector._test_restart(iowait.IOWaitCollector)
+
+
+@pytest.mark.benchmark(
+    group="iowait-sleep",
+)
+@pytest.mark.parametrize(
+    "pct",
+    range(5, 61, 5),
+)
+def test_sleep_speed_patched(benchmark, pct):
+    r = recorder.Recorder()
+    with iowait.IOWaitCollector(r, capture_pct=pct):
+        benchmark(time.sleep, 0)
+
+
+@pytest.mark.benchmark(
+    group="iowait-sleep",
+)
+def test_sleep_speed(benchmark):
+    benchmark(time.sleep, 0)
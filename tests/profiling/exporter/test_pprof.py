@@ -10,7 +10,10 @@ import mock
 
 import pytest
 
+from ddtrace.profiling import scheduler
 from ddtrace.profiling.collector import exceptions
+from ddtrace.profiling.collector import gc
+from ddtrace.profiling.collector import iowait
 from ddtrace.profiling.collector import memalloc
 from ddtrace.profiling.collector import memory
 from ddtrace.profiling.collector import stack
@@ -775,6 +778,22 @@ sample_type {
   type: 17
   unit: 18
 }
+sample_type {
+  type: 19
+  unit: 6
+}
+sample_type {
+  type: 20
+  unit: 8
+}
+sample_type {
+  type: 21
+  unit: 6
+}
+sample_type {
+  type: 22
+  unit: 8
+}
 sample {
   location_id: 1
   value: 0
@@ -788,6 +807,10 @@ sample {
   value: 0
   value: 100
   value: 169380
+  value: 0
+  value: 0
+  value: 0
+  value: 0
 }
 sample {
   location_id: 2
@@ -802,10 +825,14 @@ sample {
   value: 0
   value: 40
   value: 1920
+  value: 0
+  value: 0
+  value: 0
+  value: 0
 }
 mapping {
   id: 1
-  filename: 20
+  filename: 24
 }
 location {
   id: 1
@@ -849,14 +876,126 @@ string_table: "lock-release-hold"
 string_table: "alloc-samples"
 string_table: "alloc-space"
 string_table: "bytes"
+string_table: "io-wait"
+string_table: "io-wait-time"
+string_table: "gc-pauses"
+string_table: "gc-pause-time"
 string_table: "time"
 string_table: "bonjour"
 time_nanos: 1
 duration_nanos: 1
 period_type {
-  type: 19
+  type: 23
   unit: 8
 }
 """ == str(
             exp.export(events, 1, 2)
         )
+
+
+def test_pprof_exporter_self_time():
+    exp = pprof.PprofExporter()
+    export = exp.export(
+        {
+            scheduler.SelfTimeEvent: [
+                scheduler.SelfTimeEvent(component="stack", cpu_time_ns=100),
+                scheduler.SelfTimeEvent(component="exporter", cpu_time_ns=20),
+                scheduler.SelfTimeEvent(component="stack", cpu_time_ns=50),
+            ],
+        },
+        0,
+        1,
+    )
+    assert len(export.sample) == 0
+    assert [export.string_table[c] for c in export.comment] == [
+        "self-cpu-time-ns.exporter=20",
+        "self-cpu-time-ns.stack=150",
+    ]
+
+
+def test_pprof_exporter_io_wait():
+    exp = pprof.PprofExporter()
+    frames = [("foobar.py", 23, "func1")]
+    export = exp.export(
+        {
+            iowait.IOWaitEvent: [
+                iowait.IOWaitEvent(
+                    io_call="socket.recv",
+                    thread_id=1,
+                    thread_name="MainThread",
+                    frames=frames,
+                    nframes=1,
+                    wait_time_ns=100,
+                    sampling_pct=50,
+                ),
+                iowait.IOWaitEvent(
+                    io_call="socket.recv",
+                    thread_id=1,
+                    thread_name="MainThread",
+                    frames=frames,
+                    nframes=1,
+                    wait_time_ns=200,
+                    sampling_pct=50,
+                ),
+            ],
+        },
+        0,
+        1,
+    )
+    sample_types = [export.string_table[st.type] for st in export.sample_type]
+    assert len(export.sample) == 1
+    values = dict(zip(sample_types, export.sample[0].value))
+    assert values["io-wait"] == 2
+    assert values["io-wait-time"] == 600
+    labels = {export.string_table[label.key]: export.string_table[label.str] for label in export.sample[0].label}
+    assert labels["io call"] == "socket.recv"
+
+
+def test_pprof_exporter_gc_pause():
+    exp = pprof.PprofExporter()
+    frames = [("foobar.py", 23, "func1")]
+    export = exp.export(
+        {
+            gc.GCPauseEvent: [
+                gc.GCPauseEvent(
+                    generation=0,
+                    thread_id=1,
+                    thread_name="MainThread",
+                    frames=frames,
+                    nframes=1,
+                    duration_ns=100,
+                    sampling_pct=50,
+                ),
+                gc.GCPauseEvent(
+                    generation=0,
+                    thread_id=1,
+                    thread_name="MainThread",
+                    frames=frames,
+                    nframes=1,
+                    duration_ns=200,
+                    sampling_pct=50,
+                ),
+                gc.GCPauseEvent(
+                    generation=2,
+                    thread_id=1,
+                    thread_name="MainThread",
+                    frames=frames,
+                    nframes=1,
+                    duration_ns=1000,
+                    sampling_pct=100,
+                ),
+            ],
+        },
+        0,
+        1,
+    )
+    sample_types = [export.string_table[st.type] for st in export.sample_type]
+    assert len(export.sample) == 2
+    samples = {}
+    for sample in export.sample:
+        labels = {export.string_table[label.key]: export.string_table[label.str] for label in sample.label}
+        samples[labels["gc generation"]] = dict(zip(sample_types, sample.value))
+    assert samples["0"]["gc-pauses"] == 2
+    assert samples["0"]["gc-pause-time"] == 600
+    assert samples["2"]["gc-pauses"] == 1
+    assert samples["2"]["gc-pause-time"] == 1000
@@ -42,7 +42,7 @@ def check_pprof_file(filename):
         content = f.read()
     p = pprof_pb2.Profile()
     p.ParseFromString(content)
-    assert len(p.sample_type) == 11
+    assert len(p.sample_type) == 15
     assert p.string_table[p.sample_type[0].type] == "cpu-samples"
 
 
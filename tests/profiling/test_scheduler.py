@@ -1,4 +1,6 @@
 # -*- encoding: utf-8 -*-
+import mock
+
 from ddtrace.profiling import event
 from ddtrace.profiling import exporter
 from ddtrace.profiling import recorder
@@ -26,3 +28,19 @@ def test_thread_name():
     s.start()
     assert s._worker.name == "ddtrace.profiling.scheduler:Scheduler"
     s.stop()
+
+
+def test_self_time_events():
+    r = recorder.Recorder()
+    s = scheduler.Scheduler(r, [exporter.NullExporter()])
+    with mock.patch("ddtrace.internal.selftime.snapshot", return_value={"stack": 100, "exporter": 10}):
+        s._push_self_time_events()
+    with mock.patch("ddtrace.internal.selftime.snapshot", return_value={"stack": 150, "exporter": 10}):
+        s._push_self_time_events()
+    events = r.reset()[scheduler.SelfTimeEvent]
+    assert sorted((e.component, e.cpu_time_ns) for e in events) == [
+        ("exporter", 0),
+        ("exporter", 10),
+        ("stack", 50),
+        ("stack", 100),
+    ]
@@ -1,13 +1,28 @@
+from ddtrace.internal import gcpause
+from ddtrace.internal import selftime
 from ddtrace.internal.runtime.metric_collectors import (
     RuntimeMetricCollector,
+    AsyncioRuntimeMetricCollector,
     GCRuntimeMetricCollector,
+    GCPauseRuntimeMetricCollector,
     PSUtilRuntimeMetricCollector,
+    SelfTimeRuntimeMetricCollector,
 )
 
 from ddtrace.internal.runtime.constants import (
+    ASYNCIO_LOOP_LAG_MAX,
+    ASYNCIO_RUNTIME_METRICS,
+    ASYNCIO_SLOW_CALLBACK_COUNT,
     GC_COUNT_GEN0,
+    GC_PAUSE_COUNT_GEN1,
+    GC_PAUSE_MAX_GEN1,
+    GC_PAUSE_RUNTIME_METRICS,
+    GC_PAUSE_TIME_GEN1,
     GC_RUNTIME_METRICS,
     PSUTIL_RUNTIME_METRICS,
+    SELF_TIME_EXPORTER,
+    SELF_TIME_RUNTIME_METRICS,
+    SELF_TIME_STACK,
 )
 from tests import BaseTestCase
 
@@ -61,3 +76,81 @@ class TestGCRuntimeMetricCollector(BaseTestCase):
         assert len(collected_after) == 1
         assert collected_after[0][0] == 'runtime.python.gc.count.gen0'
         assert isinstance(collected_after[0][1], int)
+
+
+class TestGCPauseRuntimeMetricCollector(BaseTestCase):
+    def test_metrics(self):
+        # disable gc so only the pauses added below are reported
+        import gc
+        gc.disable()
+        try:
+            collector = GCPauseRuntimeMetricCollector(enabled=True)
+            # Make sure the tracker was loaded
+            collector.collect(GC_PAUSE_RUNTIME_METRICS)
+            gcpause.tracker.stats[1].add(1000)
+            gcpause.tracker.stats[1].add(3000)
+            metrics = dict(collector.collect(GC_PAUSE_RUNTIME_METRICS))
+            assert set(metrics) == GC_PAUSE_RUNTIME_METRICS
+            assert metrics[GC_PAUSE_COUNT_GEN1] == 2
+            assert metrics[GC_PAUSE_TIME_GEN1] == 4000 / 1e9
+            assert metrics[GC_PAUSE_MAX_GEN1] == 4096 / 1e9
+
+            metrics = dict(collector.collect(GC_PAUSE_RUNTIME_METRICS))
+            assert metrics[GC_PAUSE_MAX_GEN1] == 0
+        finally:
+            gc.enable()
+
+    def test_disabled(self):
+        collector = GCPauseRuntimeMetricCollector()
+        assert not collector.enabled
+        assert collector.collect(GC_PAUSE_RUNTIME_METRICS) == []
+
+
+class TestAsyncioRuntimeMetricCollector(BaseTestCase):
+    def test_metrics(self):
+        import asyncio
+        from ddtrace.contrib.asyncio import loop_monitor
+
+        collector = AsyncioRuntimeMetricCollector()
+        # Nothing is reported until the monitor is started
+        assert collector.collect(ASYNCIO_RUNTIME_METRICS) == []
+
+        loop = asyncio.new_event_loop()
+        loop_monitor.start(loop)
+        try:
+            collector.collect(ASYNCIO_RUNTIME_METRICS)
+            loop_monitor.lag.add(1000)
+            loop_monitor.slow_callbacks.add(int(2e8))
+            metrics = dict(collector.collect(ASYNCIO_RUNTIME_METRICS))
+            assert set(metrics) == ASYNCIO_RUNTIME_METRICS
+            assert metrics[ASYNCIO_LOOP_LAG_MAX] == 1024 / 1e9
+            assert metrics[ASYNCIO_SLOW_CALLBACK_COUNT] == 1
+
+            metrics = dict(collector.collect(ASYNCIO_RUNTIME_METRICS))
+            assert metrics[ASYNCIO_LOOP_LAG_MAX] == 0
+            assert metrics[ASYNCIO_SLOW_CALLBACK_COUNT] == 0
+        finally:
+            loop_monitor.stop()
+            loop.close()
+
+        assert collector.collect(ASYNCIO_RUNTIME_METRICS) == []
+
+
+class TestSelfTimeRuntimeMetricCollector(BaseTestCase):
+    def test_metrics(self):
+        selftime.reset()
+        collector = SelfTimeRuntimeMetricCollector()
+        # Nothing is reported until the profiler accounts for CPU time
+        assert collector.collect(SELF_TIME_RUNTIME_METRICS) == []
+
+        selftime.add("stack", int(2e9))
+        selftime.add("exporter", 0)
+        metrics = dict(collector.collect(SELF_TIME_RUNTIME_METRICS))
+        assert set(metrics) == {SELF_TIME_STACK, SELF_TIME_EXPORTER}
+        assert metrics[SELF_TIME_STACK] == 2.0
+        assert metrics[SELF_TIME_EXPORTER] == 0
+
+        # Only the CPU time used since the last collection is reported
+        selftime.add("stack", int(1e9))
+        metrics = dict(collector.collect(SELF_TIME_RUNTIME_METRICS))
+        assert metrics[SELF_TIME_STACK] == 1.0
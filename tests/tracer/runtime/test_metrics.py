@@ -71,6 +71,20 @@ class TestValueCollector(BaseTestCase):
             vc.collect()
             mock_module.fn.assert_called_once()
 
+    def test_required_module_disabled(self):
+        mock_module = mock.MagicMock()
+        with self.override_sys_modules(dict(A=mock_module)):
+            class AVC(ValueCollector):
+                enabled = False
+                required_modules = ['A']
+
+                def _on_modules_load(self):
+                    self.modules.get('A').load()
+
+            vc = AVC()
+            self.assertIsNone(vc.modules)
+            mock_module.load.assert_not_called()
+
     def test_required_module_not_installed(self):
         collect = mock.MagicMock()
         with mock.patch('ddtrace.internal.runtime.collector.log') as log_mock:
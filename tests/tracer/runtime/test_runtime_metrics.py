@@ -1,9 +1,15 @@
+import gc
 import time
 
 import mock
 
+from ddtrace.constants import GC_PAUSE_KEY
+
 from ddtrace.ext import SpanTypes
+from ddtrace.internal import gcpause
+from ddtrace.internal import selftime
 
+from ddtrace.internal.runtime.metric_collectors import GCPauseRuntimeMetricCollector
 from ddtrace.internal.runtime.runtime_metrics import (
     RuntimeTags,
     RuntimeMetrics,
@@ -62,6 +68,8 @@ class TestRuntimeTags(TracerTestCase):
 
 class TestRuntimeMetrics(BaseTestCase):
     def test_all_metrics(self):
+        # DEV: The CPU time accounted by the profiler tests would be reported
+        selftime.reset()
         metrics = set([k for (k, v) in RuntimeMetrics()])
         self.assertSetEqual(metrics, DEFAULT_RUNTIME_METRICS)
 
@@ -72,6 +80,8 @@ class TestRuntimeMetrics(BaseTestCase):
 
 class TestRuntimeWorker(TracerTestCase):
     def test_tracer_metrics(self):
+        # DEV: The CPU time accounted by the profiler tests would be reported
+        selftime.reset()
         # Mock socket.socket to hijack the dogstatsd socket
         with mock.patch('socket.socket'):
             # configure tracer for runtime metrics
@@ -119,3 +129,29 @@ class TestRuntimeWorker(TracerTestCase):
             self.assertRegexpMatches(gauge, 'lang_version:')
             self.assertRegexpMatches(gauge, 'lang:python')
             self.assertRegexpMatches(gauge, 'tracer_version:')
+
+    def test_tracer_gc_pause(self):
+        with mock.patch('socket.socket'), mock.patch.object(GCPauseRuntimeMetricCollector, 'enabled', True):
+            self.tracer.configure(collect_metrics=True)
+            try:
+                assert self.tracer._on_gc_pause in gcpause.tracker._listeners
+                with self.tracer.trace('parent') as span:
+                    gc.collect()
+            finally:
+                self.tracer.configure(collect_metrics=False)
+
+        assert self.tracer._on_gc_pause not in gcpause.tracker._listeners
+        if hasattr(gc, 'callbacks'):
+            assert span.get_metric(GC_PAUSE_KEY) > 0
+
+    def test_tracer_gc_pause_disabled(self):
+        with mock.patch('socket.socket'):
+            self.tracer.configure(collect_metrics=True)
+            try:
+                assert self.tracer._on_gc_pause not in gcpause.tracker._listeners
+                with self.tracer.trace('parent') as span:
+                    gc.collect()
+            finally:
+                self.tracer.configure(collect_metrics=False)
+
+        assert span.get_metric(GC_PAUSE_KEY) is None
@@ -250,6 +250,8 @@ def test_flush_connection_timeout_connect():
     else:
         assert isinstance(response, socket.error)
     assert response.errno in (errno.EADDRNOTAVAIL, errno.ECONNREFUSED)
+    # The payload is kept to be sent again
+    assert response.payload is payload
 
 
 def test_flush_connection_timeout(endpoint_test_timeout_server):
@@ -280,6 +282,30 @@ def test_flush_connection_uds(endpoint_uds_server):
     api = API(_HOST, 2019, uds_path=endpoint_uds_server.server_address)
     response = api._flush(payload)
     assert response.status == 200
+    assert response.payload is payload
+
+
+def test_send_payload(endpoint_uds_server):
+    payload = mock.Mock()
+    payload.get_payload.return_value = 'foobar'
+    payload.length = 12
+    api = API(_HOST, 2019, uds_path=endpoint_uds_server.server_address)
+    response = api.send_payload(payload)
+    assert response.status == 200
+    payload.get_payload.assert_called_once_with()
+
+
+def test_ping(endpoint_uds_server):
+    api = API(_HOST, 2019, uds_path=endpoint_uds_server.server_address)
+    response = api.ping()
+    assert response.status == 200
+    assert response.payload.length == 1
+
+
+def test_ping_connection_refused():
+    api = API(_HOST, 2019)
+    response = api.ping()
+    assert isinstance(response, (OSError, IOError))
 
 
 @mock.patch('ddtrace.internal.runtime.container.get_container_info')
@@ -12,6 +12,7 @@ from ddtrace.span import Span
 from ddtrace.context import Context
 from ddtrace.constants import HOSTNAME_KEY
 from ddtrace.ext.priority import USER_REJECT, AUTO_REJECT, AUTO_KEEP, USER_KEEP
+from ddtrace.internal import compression
 
 
 @pytest.fixture
@@ -71,6 +72,20 @@ class TestTracingContext(BaseTestCase):
             ctx._partial_flush_enabled = original_enabled
             ctx._partial_flush_min_spans = original_min_spans
 
+    @contextlib.contextmanager
+    def override_budget(self, ctx, max_spans=0, max_memory=0):
+        original_max_spans = ctx._max_spans
+        original_max_memory = ctx._max_memory
+
+        ctx._max_spans = max_spans
+        ctx._max_memory = max_memory
+
+        try:
+            yield
+        finally:
+            ctx._max_spans = original_max_spans
+            ctx._max_memory = original_max_memory
+
     def test_add_span(self):
         # it should add multiple spans
         ctx = Context()
@@ -447,3 +462,109 @@ class TestTracingContext(BaseTestCase):
         assert cloned_ctx._dd_origin == ctx._dd_origin
         assert cloned_ctx._current_span == ctx._current_span
         assert cloned_ctx._trace == []
+
+    def test_span_compression(self):
+        tracer = get_dummy_tracer()
+        compression.register('test.command', 'test_compression')
+
+        def _run():
+            with tracer.trace('root'):
+                for resource in ('a', 'a', 'a', 'b', 'a'):
+                    with tracer.trace('test.command', resource=resource):
+                        pass
+                with tracer.trace('test.command', resource='a') as span:
+                    span.error = 1
+                # Spans with children are not merged
+                for _ in range(2):
+                    with tracer.trace('test.command', resource='a'):
+                        with tracer.trace('child'):
+                            pass
+
+        _run()
+        assert len(tracer.writer.pop()) == 11
+
+        with self.override_config('test_compression', dict(span_compression=True)):
+            _run()
+        spans = tracer.writer.pop()
+        assert [s.resource for s in spans] == ['root', 'a', 'b', 'a', 'a', 'a', 'child', 'a', 'child']
+        merged = spans[1]
+        assert merged.get_metric(compression.COUNT_KEY) == 3
+        assert merged.get_metric(compression.MIN_NS_KEY) <= merged.get_metric(compression.MAX_NS_KEY)
+        assert merged.get_metric(compression.TOTAL_NS_KEY) <= merged.duration_ns
+        assert merged.duration_ns <= spans[2].start_ns - merged.start_ns
+        assert all(s.get_metric(compression.COUNT_KEY) is None for s in spans[2:])
+
+    def test_span_compression_partial_flush(self):
+        tracer = get_dummy_tracer()
+        compression.register('test.command', 'test_compression')
+        ctx = tracer.get_call_context()
+        # The flushed spans can not be merged
+        with self.override_partial_flush(ctx, enabled=True, min_spans=1):
+            with self.override_config('test_compression', dict(span_compression=True)):
+                with tracer.trace('root'):
+                    for _ in range(4):
+                        with tracer.trace('test.command'):
+                            pass
+        spans = tracer.writer.pop()
+        assert [s.name for s in spans] == ['test.command'] * 4 + ['root']
+        assert all(s.get_metric(compression.COUNT_KEY) is None for s in spans)
+
+    def test_max_spans(self):
+        tracer = get_dummy_tracer()
+        ctx = tracer.get_call_context()
+        with self.override_budget(ctx, max_spans=3):
+            with tracer.trace('root') as root:
+                for _ in range(2):
+                    with tracer.trace('kept'):
+                        pass
+                with tracer.trace('dropped', service='svc') as dropped:
+                    with tracer.trace('dropped.child', service='svc'):
+                        pass
+                    assert ctx.get_current_span() is dropped
+                    dropped.finish()
+                with tracer.trace('dropped', service='svc'):
+                    pass
+                assert ctx.get_current_span() is root
+            assert ctx._dropped_spans == set()
+
+        spans = tracer.writer.pop()
+        assert [s.name for s in spans] == ['root', 'kept', 'kept']
+        assert root.get_metric('trace.dropped_spans') == 3
+        assert root.get_metric('trace.dropped_spans.svc.dropped.count') == 2
+        assert root.get_metric('trace.dropped_spans.svc.dropped.duration_ns') > 0
+        assert root.get_metric('trace.dropped_spans.svc.dropped.child.count') == 1
+        assert ctx._dropped_stats == {}
+
+        # The budget is per trace
+        with self.override_budget(ctx, max_spans=3):
+            with tracer.trace('root') as root:
+                with tracer.trace('kept'):
+                    pass
+        assert len(tracer.writer.pop()) == 2
+        assert root.get_metric('trace.dropped_spans') is None
+
+    def test_max_spans_partial_flush(self):
+        tracer = get_dummy_tracer()
+        ctx = tracer.get_call_context()
+        with self.override_budget(ctx, max_spans=3):
+            with self.override_partial_flush(ctx, enabled=True, min_spans=2):
+                with tracer.trace('root') as root:
+                    for _ in range(10):
+                        with tracer.trace('child'):
+                            pass
+        assert len(tracer.writer.pop()) == 11
+        assert root.get_metric('trace.dropped_spans') is None
+
+    def test_max_memory(self):
+        tracer = get_dummy_tracer()
+        ctx = tracer.get_call_context()
+        with self.override_budget(ctx, max_memory=1):
+            with tracer.trace('root') as root:
+                with tracer.trace('kept') as kept:
+                    kept.set_tag('key', 'value')
+                assert ctx._memory >= len('keyvalue')
+                with tracer.trace('dropped'):
+                    pass
+        assert [s.name for s in tracer.writer.pop()] == ['root', 'kept']
+        assert root.get_metric('trace.dropped_spans') == 1
+        assert ctx._memory == 0
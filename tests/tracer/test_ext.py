@@ -1,4 +1,7 @@
+import pytest
+
 from ddtrace.ext import aws
+from ddtrace.ext import sql
 
 
 def test_flatten_dict():
@@ -6,3 +9,47 @@ def test_flatten_dict():
     d = dict(A=1, B=2, C=dict(A=3, B=4, C=dict(A=5, B=6)))
     e = dict(A=1, B=2, C_A=3, C_B=4, C_C_A=5, C_C_B=6)
     assert aws._flatten_dict(d, sep="_") == e
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("SELECT * FROM users WHERE id = 1", "SELECT * FROM users WHERE id = ?"),
+        ("SELECT * FROM users WHERE name = 'it''s' AND id = 2.5e3", "SELECT * FROM users WHERE name = ? AND id = ?"),
+        ("SELECT * FROM t WHERE a = 'x -- not a comment'", "SELECT * FROM t WHERE a = ?"),
+        ("SELECT a1, b FROM table2 LIMIT 10 OFFSET 20", "SELECT a1, b FROM table2 LIMIT ? OFFSET ?"),
+        ('SELECT "col1" FROM `tbl` WHERE v = 0xFF AND w = .5', 'SELECT "col1" FROM `tbl` WHERE v = ? AND w = ?'),
+        ("SELECT * FROM t WHERE id IN (1, 2, 3)", "SELECT * FROM t WHERE id IN ( ? )"),
+        ("SELECT * FROM t WHERE id in (%s, %s) OR id IN ($1, $2)", "SELECT * FROM t WHERE id IN ( ? ) OR id IN ( ? )"),
+        ("SELECT * FROM t WHERE id IN (SELECT id FROM u)", "SELECT * FROM t WHERE id IN (SELECT id FROM u)"),
+        ("SELECT *\n  FROM t -- comment\n  /* multi\nline */ WHERE a = %s", "SELECT * FROM t WHERE a = %s"),
+        ("INSERT INTO t (a, b) VALUES (%(a)s, %(b)s)", "INSERT INTO t (a, b) VALUES (%(a)s, %(b)s)"),
+    ],
+)
+def test_sql_normalize_query(query, expected):
+    assert sql.normalize_query(query) == expected
+
+
+def test_sql_normalize_query_backslash():
+    query = "SELECT * FROM t WHERE path = 'C:\\' AND id = 5 AND name = 'x'"
+    assert sql.normalize_query(query) == "SELECT * FROM t WHERE path = ? AND id = ? AND name = ?"
+
+    query = "SELECT * FROM t WHERE name = 'it\\'s' AND id = 5"
+    assert sql.normalize_query(query, backslash_escapes=True) == "SELECT * FROM t WHERE name = ? AND id = ?"
+
+
+def test_sql_normalize_query_cache():
+    sql._normalized_queries.clear()
+    sql.normalize_query("SELECT 1")
+    sql.normalize_query("SELECT 1")
+    assert sql._normalized_queries.hits == 1
+    assert sql._normalized_queries.misses == 1
+    sql.normalize_query("SELECT 1", backslash_escapes=True)
+    assert sql._normalized_queries.misses == 2
+
+
+def test_sql_normalize_query_long():
+    sql._normalized_queries.clear()
+    query = "SELECT * FROM t WHERE id IN (%s)" % ", ".join(["1"] * 2000)
+    assert sql.normalize_query(query) == "SELECT * FROM t WHERE id IN ( ? )"
+    assert len(sql._normalized_queries) == 0
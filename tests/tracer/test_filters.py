@@ -1,7 +1,8 @@
 from unittest import TestCase
 
-from ddtrace.filters import FilterRequestsOnUrl
+from ddtrace.filters import AggregateRepeatedQueries, FilterRequestsOnUrl
 from ddtrace.span import Span
+from ddtrace.ext import db
 from ddtrace.ext.http import URL
 
 
@@ -33,3 +34,55 @@ class FilterRequestOnUrlTests(TestCase):
         filtr = FilterRequestsOnUrl([r'http://domain\.example\.com', r'http://anotherdomain\.example\.com'])
         trace = filtr.process_trace([span])
         self.assertIsNotNone(trace)
+
+
+class AggregateRepeatedQueriesTests(TestCase):
+    def _trace(self, queries, parent_id=1):
+        root = Span(name='root', tracer=None, span_id=1, start=0)
+        root.duration_ns = 10000
+        trace = [root]
+        for i, query in enumerate(queries):
+            span = Span(name='db.query', tracer=None, resource=query, span_type='sql', parent_id=parent_id,
+                        span_id=i + 2, start=i * 1e-6)
+            span._parent = root
+            span.duration_ns = 100 * (i + 1)
+            trace.append(span)
+        return trace
+
+    def test_aggregate(self):
+        trace = self._trace(['SELECT * FROM t WHERE id = %d' % i for i in range(5)] + ['SELECT 1'])
+        root, first, last = trace[0], trace[1], trace[5]
+        trace = AggregateRepeatedQueries(threshold=3).process_trace(trace)
+        self.assertEqual(trace, [root, first, trace[2]])
+        self.assertEqual(trace[2].resource, 'SELECT 1')
+        self.assertEqual(first.resource, 'SELECT * FROM t WHERE id = ?')
+        self.assertEqual(first.start_ns, 0)
+        self.assertEqual(first.duration_ns, last.start_ns + last.duration_ns)
+        self.assertEqual(first.get_metric(db.QUERY_COUNT), 5)
+        self.assertEqual(first.get_metric(db.QUERY_TOTAL_NS), 1500)
+        self.assertEqual(first.get_metric(db.QUERY_MIN_NS), 100)
+        self.assertEqual(first.get_metric(db.QUERY_MAX_NS), 500)
+        self.assertEqual(root.get_metric(db.N_PLUS_ONE), 1)
+
+    def test_under_threshold(self):
+        trace = self._trace(['SELECT * FROM t WHERE id = %d' % i for i in range(3)])
+        self.assertEqual(AggregateRepeatedQueries(threshold=3).process_trace(list(trace)), trace)
+        self.assertIsNone(trace[0].get_metric(db.N_PLUS_ONE))
+        self.assertEqual(AggregateRepeatedQueries(threshold=0).process_trace(list(trace)), trace)
+
+    def test_different_parents(self):
+        trace = self._trace(['SELECT 1'] * 2) + self._trace(['SELECT 1'] * 2, parent_id=2)[1:]
+        self.assertEqual(AggregateRepeatedQueries(threshold=2).process_trace(list(trace)), trace)
+
+    def test_errors_and_children(self):
+        trace = self._trace(['SELECT 1'] * 4)
+        trace[1].error = 1
+        trace[2].span_id = 42
+        child = Span(name='child', tracer=None, parent_id=42)
+        child.duration_ns = 1
+        trace.append(child)
+        self.assertEqual(AggregateRepeatedQueries(threshold=2).process_trace(list(trace)), trace)
+
+    def test_bytes_query(self):
+        trace = self._trace([b'SELECT 1'] * 4)
+        self.assertEqual(AggregateRepeatedQueries(threshold=2).process_trace(list(trace)), trace)
@@ -6,6 +6,23 @@ from ddtrace.settings import Config, IntegrationConfig
 from ddtrace.utils.http import normalize_header_name
 
 
+class CaseInsensitiveHeaders(object):
+    """Headers looked up case-insensitively, recording how they are accessed."""
+
+    def __init__(self, headers):
+        self._headers = {normalize_header_name(name): value for name, value in headers.items()}
+        self.looked_up = []
+        self.iterated = False
+
+    def get(self, name, default=None):
+        self.looked_up.append(name)
+        return self._headers.get(normalize_header_name(name), default)
+
+    def __iter__(self):
+        self.iterated = True
+        return iter(self._headers.items())
+
+
 class TestHeaders(object):
     @pytest.fixture()
     def span(self):
@@ -151,6 +168,69 @@ class TestHeaders(object):
         store_response_headers({"cOnTeNt-TyPe": "some;value",}, span, integration_config)
         assert span.get_tag("http.response.headers.content-type") == "some;value"
 
+    def test_whitelist_wsgi_spelling(self, span, integration_config):
+        """
+        :type span: Span
+        :type integration_config: IntegrationConfig
+        """
+        integration_config.http.trace_headers(["Content-Type", "X-Request-Id"])
+        store_request_headers(
+            {"CONTENT_TYPE": "some;value", "HTTP_X_REQUEST_ID": "some;id", "HTTP_OTHER": "other"},
+            span,
+            integration_config,
+        )
+        assert span.get_tag("http.request.headers.content-type") == "some;value"
+        assert span.get_tag("http.request.headers.x-request-id") == "some;id"
+        assert span.get_tag("http.request.headers.other") is None
+
+    def test_mapping_only_traced_headers_looked_up(self, span, integration_config):
+        """
+        :type span: Span
+        :type integration_config: IntegrationConfig
+        """
+        headers = CaseInsensitiveHeaders({"Content-Type": "some;value", "Other": "other"})
+        integration_config.http.trace_headers(["content-type", "max-age"])
+        store_request_headers(headers, span, integration_config)
+        assert span.get_tag("http.request.headers.content-type") == "some;value"
+        assert span.get_tag("http.request.headers.max-age") is None
+        assert span.get_tag("http.request.headers.other") is None
+        assert not headers.iterated
+        assert {normalize_header_name(name) for name in headers.looked_up} <= {
+            "content-type",
+            "max-age",
+            "http_content_type",
+            "http_max_age",
+            "content_type",
+        }
+        # The content type is found on the first lookup, its other spellings are not looked up
+        assert len([name for name in headers.looked_up if "type" in name.lower()]) == 1
+
+    def test_no_whitelist_no_lookup(self, span, integration_config):
+        """
+        :type span: Span
+        :type integration_config: IntegrationConfig
+        """
+        headers = CaseInsensitiveHeaders({"Content-Type": "some;value"})
+        store_request_headers(headers, span, integration_config)
+        assert not headers.looked_up
+        assert not headers.iterated
+        assert span.get_tag("http.request.headers.content-type") is None
+
+    def test_global_whitelist(self, span, config, integration_config):
+        """
+        :type span: Span
+        :type integration_config: IntegrationConfig
+        """
+        config.trace_headers("Content-Type")
+        store_response_headers(CaseInsensitiveHeaders({"content-type": "some;value"}), span, integration_config)
+        assert span.get_tag("http.response.headers.content-type") == "some;value"
+
+        # The whitelist of the integration takes precedence over the global one
+        integration_config.http.trace_headers("Max-Age")
+        store_request_headers({"Content-Type": "some;value", "Max-Age": "1"}, span, integration_config)
+        assert span.get_tag("http.request.headers.content-type") is None
+        assert span.get_tag("http.request.headers.max-age") == "1"
+
 
 class TestHeaderNameNormalization(object):
     def test_name_is_trimmed(self):
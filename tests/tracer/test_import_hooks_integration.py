@@ -4,6 +4,7 @@ import sys
 
 import pytest
 
+from ddtrace.compat import PY3
 from ddtrace.internal import import_hooks
 
 from tests.subprocesstest import run_in_subprocess, SubprocessTestCase
@@ -143,3 +144,92 @@ class ImportHookTestCase(SubprocessTestCase):
         test_module_hook.assert_called_once_with(tests.test_module)
         test_module_hook2.assert_called_once_with(tests.test_module)
         test_module2_hook.assert_called_once_with(tests.test_module2)
+
+    def test_reload(self):
+        """
+        When a module with hooks is reloaded
+            The import hook should run again
+        """
+        from ddtrace.compat import reload_module
+
+        module_hook = mock.Mock()
+        import_hooks.register_module_hook("tests.test_module", module_hook)
+        import tests.test_module
+
+        reload_module(tests.test_module)
+
+        assert module_hook.call_count == 2
+
+    def test_hook_imports_module_with_hooks(self):
+        """
+        When an import hook imports another module with hooks
+            The hooks of both modules should run
+        """
+        test_module2_hook = mock.Mock()
+
+        def test_module_hook(module):
+            import tests.test_module2  # noqa
+
+        import_hooks.register_module_hook("tests.test_module", test_module_hook)
+        import_hooks.register_module_hook("tests.test_module2", test_module2_hook)
+
+        import tests.test_module  # noqa
+        import tests.test_module2
+
+        test_module2_hook.assert_called_once_with(tests.test_module2)
+
+
+@pytest.mark.skipif(not PY3, reason="the import hooks use a finder of sys.meta_path on Python 3 only")
+@run_in_subprocess
+class MetaPathImportHookTestCase(SubprocessTestCase):
+    def test_module_loader(self):
+        """
+        When a module with hooks is imported
+            The module keeps the loader it was found with
+        """
+        module_hook = mock.Mock()
+        import_hooks.register_module_hook("tests.test_module", module_hook)
+        import tests.test_module
+
+        assert not isinstance(tests.test_module.__loader__, import_hooks._ImportHookLoader)
+        assert tests.test_module.__loader__ is tests.test_module.__spec__.loader
+
+    def test_no_hooks_not_intercepted(self):
+        """
+        When a module without hooks is imported
+            The finder of the import hooks does not find it
+        """
+        import tests
+
+        import_hooks.register_module_hook("tests.test_module", mock.Mock())
+
+        assert import_hooks._finder.find_spec("tests.test_module2", tests.__path__) is None
+        spec = import_hooks._finder.find_spec("tests.test_module", tests.__path__)
+        assert isinstance(spec.loader, import_hooks._ImportHookLoader)
+
+    def test_deferring_finder(self):
+        """
+        When another finder in front of ours calls back into the import system
+            The import hook should run only once
+        """
+        import importlib.util
+
+        class DeferringFinder(object):
+            in_progress = set()
+
+            def find_spec(self, fullname, path=None, target=None):
+                if fullname in self.in_progress:
+                    return None
+                self.in_progress.add(fullname)
+                try:
+                    return importlib.util.find_spec(fullname)
+                finally:
+                    self.in_progress.discard(fullname)
+
+        module_hook = mock.Mock()
+        import_hooks.register_module_hook("tests.test_module", module_hook)
+        sys.meta_path.insert(0, DeferringFinder())
+
+        import tests.test_module
+
+        module_hook.assert_called_once_with(tests.test_module)
@@ -1,3 +1,7 @@
+import sys
+
+import pytest
+
 from ddtrace import monkey
 from tests.subprocesstest import SubprocessTestCase, run_in_subprocess
 
@@ -17,17 +21,23 @@ class TestPatching(SubprocessTestCase):
     def test_patch_all_env_override_sqlite_none(self):
         # Make sure sqlite is enabled by default.
         monkey.patch_all()
+        import sqlite3  # noqa
+
         assert "sqlite3" in monkey._PATCHED_MODULES
 
     @run_in_subprocess(env_overrides=dict(DD_TRACE_SQLITE3_ENABLED="false"))
     def test_patch_all_env_override_sqlite_disabled(self):
         monkey.patch_all()
+        import sqlite3  # noqa
+
         assert "sqlite3" not in monkey._PATCHED_MODULES
 
     @run_in_subprocess(env_overrides=dict(DD_TRACE_SQLITE3_ENABLED="false"))
     def test_patch_all_env_override_manual_patch(self):
         # Manual patching should not be affected by the environment variable override.
         monkey.patch(sqlite3=True)
+        import sqlite3  # noqa
+
         assert "sqlite3" in monkey._PATCHED_MODULES
 
     @run_in_subprocess(env_overrides=dict())
@@ -39,4 +49,32 @@ class TestPatching(SubprocessTestCase):
     @run_in_subprocess(env_overrides=dict(DD_TRACE_HTTPLIB_ENABLED="true"))
     def test_patch_all_env_override_httplib_enabled(self):
         monkey.patch_all()
+        from ddtrace.compat import httplib  # noqa
+
         assert "httplib" in monkey._PATCHED_MODULES
+
+    @run_in_subprocess(env_overrides=dict())
+    def test_patch_on_import(self):
+        monkey.patch_all()
+        assert "sqlite3" not in sys.modules
+        # The modules are only reported as patched once they are imported
+        assert "sqlite3" not in monkey.get_patched_modules()
+        assert "sqlite3" in monkey._PENDING_MODULES
+        # vertica is not installed
+        assert "vertica" not in monkey.get_patched_modules()
+        assert "vertica" in monkey._PENDING_MODULES
+
+        import sqlite3  # noqa
+
+        assert "sqlite3" in monkey.get_patched_modules()
+        assert "sqlite3" not in monkey._PENDING_MODULES
+
+    @run_in_subprocess(env_overrides=dict())
+    def test_patch_raise_errors(self):
+        # The libraries which are not installed raise right away, instead of waiting to be imported
+        with pytest.raises(monkey.ModuleNotFoundException):
+            monkey.patch(vertica=True)
+        assert "vertica" not in monkey._PENDING_MODULES
+
+        monkey.patch(vertica=True, raise_errors=False)
+        assert "vertica" in monkey._PENDING_MODULES
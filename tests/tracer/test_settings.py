@@ -1,6 +1,6 @@
 from copy import deepcopy
 
-from ddtrace.settings import Config, HttpConfig, IntegrationConfig
+from ddtrace.settings import Config, HttpConfig, IntegrationConfig, IntegrationSettings
 
 from tests import BaseTestCase
 
@@ -130,6 +130,28 @@ class TestHttpConfig(BaseTestCase):
         http_config.trace_headers('some_header')
         assert not http_config.header_is_traced(None)
 
+    def test_header_tags(self):
+        http_config = HttpConfig()
+        assert http_config._header_tags == {'request': {}, 'response': {}}
+
+        http_config.trace_headers(['Content-Type', 'http_x_foo', ' X-Foo '])
+        assert http_config._header_tags['request'] == {
+            'content-type': 'http.request.headers.content-type',
+            'Content-Type': 'http.request.headers.content-type',
+            'CONTENT-TYPE': 'http.request.headers.content-type',
+            'HTTP_CONTENT_TYPE': 'http.request.headers.content-type',
+            'CONTENT_TYPE': 'http.request.headers.content-type',
+            'x-foo': 'http.request.headers.x-foo',
+            'X-Foo': 'http.request.headers.x-foo',
+            'X-FOO': 'http.request.headers.x-foo',
+            # The whitelisted header is not shadowed by the WSGI spelling of X-Foo
+            'HTTP_X_FOO': 'http.request.headers.http_x_foo',
+            'http_x_foo': 'http.request.headers.http_x_foo',
+            'Http_X_Foo': 'http.request.headers.http_x_foo',
+            'HTTP_HTTP_X_FOO': 'http.request.headers.http_x_foo',
+        }
+        assert http_config._header_tags['response']['X-Foo'] == 'http.response.headers.x-foo'
+
 
 class TestIntegrationConfig(BaseTestCase):
     def setUp(self):
@@ -294,6 +316,74 @@ class TestIntegrationConfig(BaseTestCase):
         ic = IntegrationConfig(self.config, "foo")
         assert ic.service is None
 
+    def test_version(self):
+        version = self.config._version
+        ic = self.config.foo
+        ic.service = "svc"
+        assert self.config._version == version + 1
+        ic.update(dict(service="svc"))
+        ic.setdefault("service", "other")
+        ic.setdefault("foo", "bar")
+        assert self.config._version == version + 3
+        del ic["foo"]
+        ic.pop("service")
+        assert self.config._version == version + 5
+        self.config.analytics_enabled = True
+        assert self.config._version == version + 6
+        # Copies are not registered
+        ic.copy().service = "svc"
+        self.integration_config.service = "svc"
+        assert self.config._version == version + 6
+        self.config._add("foo", dict())
+        assert self.config._version == version + 7
+
+    def test_snapshot(self):
+        ic = self.config.foo
+        ic.update({"distributed_tracing": True, "extra_codes": {401}, "not-an-identifier": 1, "class": 2})
+        snapshot = ic.snapshot()
+        assert isinstance(snapshot, IntegrationSettings)
+        assert snapshot.distributed_tracing is True
+        assert snapshot.extra_codes is ic.extra_codes
+        assert snapshot.service is None
+        assert snapshot.analytics_sample_rate is None
+        assert snapshot.trace_query_string is None
+        assert not hasattr(snapshot, "__dict__")
+        assert ic.snapshot() is snapshot
+
+        # Snapshots of integrations with the same settings share their class
+        assert type(IntegrationConfig(self.config, "bar", ic).snapshot()) is type(snapshot)
+
+    def test_snapshot_invalidated(self):
+        ic = self.config.foo
+        ic.distributed_tracing = True
+        snapshot = ic.snapshot()
+
+        ic.distributed_tracing = False
+        assert ic.snapshot() is not snapshot
+        assert ic.snapshot().distributed_tracing is False
+
+        # The values resolved with the global configuration
+        snapshot = ic.snapshot()
+        self.config.analytics_enabled = True
+        assert ic.snapshot() is not snapshot
+        assert ic.snapshot().analytics_sample_rate == 1.0
+
+        snapshot = ic.snapshot()
+        self.config.http.trace_query_string = True
+        assert ic.snapshot() is not snapshot
+        assert ic.snapshot().trace_query_string is True
+
+        snapshot = ic.snapshot()
+        ic.http.trace_query_string = False
+        assert ic.snapshot() is not snapshot
+        assert ic.snapshot().trace_query_string is False
+
+        # Integration configurations which are not registered are invalidated too
+        ic = IntegrationConfig(self.config, "bar")
+        snapshot = ic.snapshot()
+        ic["distributed_tracing"] = True
+        assert ic.snapshot().distributed_tracing is True
+
     @BaseTestCase.run_in_subprocess(env_overrides=dict(DD_FOO_SERVICE="foo-svc"))
     def test_service_env_var(self):
         ic = IntegrationConfig(self.config, "foo")
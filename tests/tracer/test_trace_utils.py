@@ -1,10 +1,13 @@
 import pytest
 
 from ddtrace import Pin, Tracer
+from ddtrace import config as ddtrace_config
+from ddtrace.constants import ANALYTICS_SAMPLE_RATE_KEY, MANUAL_KEEP_KEY, SERVICE_KEY, SPAN_MEASURED_KEY
+from ddtrace.ext import priority
 from ddtrace.settings import Config
 from ddtrace.contrib import trace_utils
 
-from tests import override_global_config
+from tests import DummyTracer, override_config, override_global_config
 
 
 @pytest.fixture
@@ -63,3 +66,92 @@ def test_ext_service(config, pin, config_val, default, expected):
         config.myint.service = config_val
 
     assert trace_utils.ext_service(pin, config.myint, default) == expected
+
+
+def test_sql_resource():
+    query = "SELECT * FROM t WHERE id = 1"
+    assert trace_utils.sql_resource(query) == query
+    with override_global_config(dict(sql_normalization_enabled=True)):
+        assert trace_utils.sql_resource(query) == "SELECT * FROM t WHERE id = ?"
+        assert trace_utils.sql_resource(b"SELECT 1") == b"SELECT 1"
+
+        query = "SELECT * FROM t WHERE name = 'it\\'s' AND id = 1"
+        assert trace_utils.sql_resource(query, "postgres") == "SELECT * FROM t WHERE name = ?s' AND id = ?"
+        assert trace_utils.sql_resource(query, "mysql") == "SELECT * FROM t WHERE name = ? AND id = ?"
+
+
+def test_span_template():
+    template = trace_utils.SpanTemplate(
+        "myint.query",
+        "myint",
+        "sql",
+        {"a": "b", "c": 1, SPAN_MEASURED_KEY: True, ANALYTICS_SAMPLE_RATE_KEY: None, MANUAL_KEEP_KEY: True},
+    )
+    assert template.meta == {"a": "b"}
+    assert template.metrics == {"c": 1, SPAN_MEASURED_KEY: 1}
+
+    tracer = DummyTracer()
+    with template.trace(tracer, resource="SELECT 1") as span:
+        assert span.context.sampling_priority == priority.USER_KEEP
+    assert span.name == "myint.query"
+    assert span.service == "myint"
+    assert span.span_type == "sql"
+    assert span.resource == "SELECT 1"
+    assert span.get_tag("a") == "b"
+    assert span.get_metric("c") == 1
+    assert span.get_metric(SPAN_MEASURED_KEY) == 1
+
+    template = trace_utils.SpanTemplate("myint.query", "myint", tags={SERVICE_KEY: "other"})
+    assert template.service == "other"
+
+
+def test_get_span_template():
+    calls = []
+
+    def build(pin, name, arg):
+        calls.append((pin, name, arg))
+        return trace_utils.SpanTemplate(name, trace_utils.ext_service(pin, ddtrace_config.myint), tags=pin.tags)
+
+    ddtrace_config._add("myint", dict(_default_service="myint"))
+    pin = Pin(tags={"a": "b"})
+    template = trace_utils.get_span_template(pin, "myint.query", build, 1)
+    assert template.service == "myint"
+    assert template.meta == {"a": "b"}
+    assert trace_utils.get_span_template(pin, "myint.query", build, 1) is template
+    assert calls == [(pin, "myint.query", 1)]
+
+    # Templates are rebuilt when the configuration changes
+    with override_config("myint", dict(service="config-svc")):
+        assert trace_utils.get_span_template(pin, "myint.query", build, 1).service == "config-svc"
+    assert trace_utils.get_span_template(pin, "myint.query", build, 1).service == "myint"
+    assert len(calls) == 3
+
+    # Pins are immutable: overriding a pin does not keep the templates
+    class Client(object):
+        pass
+
+    obj = Client()
+    pin.onto(obj)
+    Pin.override(obj, service="pin-svc")
+    assert trace_utils.get_span_template(Pin.get_from(obj), "myint.query", build, 1).service == "pin-svc"
+
+
+def test_get_span_template_onto():
+    class Client(object):
+        def __init__(self, host):
+            self.host = host
+
+    def build(pin, name, client):
+        return trace_utils.SpanTemplate(name, "myint", tags={"out.host": client.host})
+
+    pin = Pin()
+    client, other_client = Client("a"), Client("b")
+    pin.onto(client)
+    assert trace_utils.get_span_template(Pin.get_from(client), "myint.query", build, client).meta == {"out.host": "a"}
+
+    # The templates built for an object are not used for the next object the pin is attached to
+    pin.onto(other_client)
+    template = trace_utils.get_span_template(Pin.get_from(other_client), "myint.query", build, other_client)
+    assert template.meta == {"out.host": "b"}
+    template = trace_utils.get_span_template(Pin.get_from(client), "myint.query", build, client)
+    assert template.meta == {"out.host": "a"}
@@ -1138,3 +1138,47 @@ def test_filters():
     for s in spans:
         assert s.get_tag("boop") == "beep"
         assert s.get_tag("mats") == "sundin"
+
+
+def test_sql_aggregation():
+    t = ddtrace.Tracer()
+    t.writer = DummyWriter()
+
+    def _run():
+        with t.trace("root"):
+            for i in range(3):
+                with t.trace("db.query", resource="SELECT * FROM users WHERE id = %d" % i, span_type="sql"):
+                    pass
+
+    _run()
+    assert len(t.writer.pop()) == 4
+
+    with override_global_config(dict(sql_aggregation_threshold=2)):
+        _run()
+    root, query = t.writer.pop()
+    assert root.get_metric("db.n_plus_one") == 1
+    assert query.resource == "SELECT * FROM users WHERE id = ?"
+    assert query.get_metric("db.query.count") == 3
+
+
+def test_sql_aggregation_bytes_query():
+    t = ddtrace.Tracer()
+    # DEV: DummyWriter cannot JSON encode bytes resources
+    t.writer = mock.Mock()
+
+    with override_global_config(dict(sql_aggregation_threshold=1)):
+        with t.trace("root"):
+            for _ in range(2):
+                with t.trace("db.query", resource=b"SELECT 1", span_type="sql"):
+                    pass
+
+    spans = t.writer.write.call_args[1]["spans"]
+    assert len(spans) == 3
+    assert [s.resource for s in spans[1:]] == [b"SELECT 1"] * 2
+
+    # A failing aggregation does not prevent the trace from being sent
+    with override_global_config(dict(sql_aggregation_threshold=1)):
+        with mock.patch.object(t._query_aggregator, "process_trace", side_effect=ValueError):
+            with t.trace("root"):
+                pass
+    assert len(t.writer.write.call_args[1]["spans"]) == 1
@@ -7,6 +7,7 @@ import warnings
 import pytest
 
 from ddtrace.utils import time
+from ddtrace.utils.cache import LRUCache, cached
 from ddtrace.utils.importlib import func_name
 from ddtrace.utils.deprecation import deprecation, deprecated, format_message
 from ddtrace.utils.formats import asbool, get_env, parse_tags_str
@@ -256,3 +257,37 @@ class TestContrib(object):
         assert "partial" == func_name(minus_two)
         assert 10 == plus_three(7)
         assert "tests.tracer.test_utils.<lambda>" == func_name(plus_three)
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    assert len(cache) == 2
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_cached():
+    calls = []
+
+    @cached(maxsize=2)
+    def f(arg):
+        calls.append(arg)
+        return arg * 2
+
+    assert f(1) == 2
+    assert f(1) == 2
+    assert f(2) == 4
+    assert f(3) == 6
+    assert f(1) == 2
+    assert calls == [1, 2, 3, 1]
+    assert f.__name__ == "f"
+    assert f.cache.hits == 1
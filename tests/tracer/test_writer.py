@@ -1,11 +1,14 @@
+import socket
 import time
 
 import mock
 
 from ddtrace.span import Span
-from ddtrace.api import API
+from ddtrace.api import API, Response
+from ddtrace.internal.rate_limiter import RateLimiter
 from ddtrace.internal.writer import AgentWriter, LogWriter
-from ddtrace.payload import PayloadFull
+from ddtrace.payload import Payload, PayloadFull
+from ddtrace.vendor.dogstatsd import DogStatsd
 from tests import BaseTestCase
 
 MAX_NUM_SPANS = 7
@@ -48,6 +51,24 @@ class FailingAPI(object):
         return [Exception("oops")]
 
 
+class FlakyAPI(API):
+    """An API failing to send its first payloads, with a connection error or with an HTTP error status."""
+
+    def __init__(self, failures, status=None):
+        super(FlakyAPI, self).__init__(hostname="localhost", port=8126)
+        self.failures = failures
+        self.status = status
+        self.sent = []
+
+    def _put(self, endpoint, data, count):
+        self.sent.append(data)
+        if len(self.sent) > self.failures:
+            return Response(status=200, body=b"{}")
+        if self.status is None:
+            raise socket.error("Connection refused")
+        return Response(status=self.status)
+
+
 class AgentWriterTests(BaseTestCase):
     N_TRACES = 11
 
@@ -81,6 +102,14 @@ class AgentWriterTests(BaseTestCase):
         with self.override_global_config(dict(health_metrics_enabled=True)):
             assert worker._send_stats is False
 
+    def test_dogstatsd_without_flush(self):
+        dogstatsd = mock.Mock(spec=DogStatsd)
+        worker = AgentWriter(dogstatsd=dogstatsd)
+        with self.override_global_config(dict(health_metrics_enabled=True)):
+            worker.run_periodic()
+            worker.on_shutdown()
+        assert mock.call("datadog.tracer.shutdown") in dogstatsd.increment.mock_calls
+
     def test_no_dogstats(self):
         worker = self.create_worker()
         assert worker._send_stats is False
@@ -91,6 +120,7 @@ class AgentWriterTests(BaseTestCase):
         assert [
             mock.call("datadog.tracer.heartbeat", 1),
             mock.call("datadog.tracer.queue.max_length", 1000),
+            mock.call("datadog.tracer.circuit_breaker.open", 0),
         ] == self.dogstatsd.gauge.mock_calls
 
         assert [
@@ -126,6 +156,7 @@ class AgentWriterTests(BaseTestCase):
         assert [
             mock.call("datadog.tracer.heartbeat", 1),
             mock.call("datadog.tracer.queue.max_length", 1000),
+            mock.call("datadog.tracer.circuit_breaker.open", 0),
         ] == self.dogstatsd.gauge.mock_calls
 
         assert [
@@ -158,6 +189,7 @@ class AgentWriterTests(BaseTestCase):
         assert [
             mock.call("datadog.tracer.heartbeat", 1),
             mock.call("datadog.tracer.queue.max_length", 1000),
+            mock.call("datadog.tracer.circuit_breaker.open", 0),
         ] == self.dogstatsd.gauge.mock_calls
 
         assert [
@@ -186,6 +218,285 @@ class AgentWriterTests(BaseTestCase):
         assert histogram_calls == self.dogstatsd.histogram.mock_calls
 
 
+class FlakyAgentWriterTestCase(BaseTestCase):
+    def create_writer(self, api, enable_stats=False):
+        self.enable_stats = enable_stats
+        self.dogstatsd = mock.Mock()
+        writer = AgentWriter(dogstatsd=self.dogstatsd)
+        writer.api = api
+        return writer
+
+    def flush(self, writer, trace_id=None):
+        """Flush the writer, with a new trace if a trace id is given."""
+        if trace_id is not None:
+            writer._trace_queue.put(
+                [
+                    Span(tracer=None, name="name", trace_id=trace_id, span_id=j, parent_id=j - 1 or None)
+                    for j in range(3)
+                ]
+            )
+        with self.override_global_config(dict(health_metrics_enabled=self.enable_stats)):
+            writer.flush_queue()
+
+    def flush_at(self, writer, now, trace_id=None):
+        """Flush the writer at the given monotonic time."""
+        with mock.patch("ddtrace.internal.writer.compat.monotonic", return_value=now):
+            self.flush(writer, trace_id=trace_id)
+
+
+class AgentWriterRetryTests(FlakyAgentWriterTestCase):
+    def create_writer(self, api, enable_stats=False):
+        writer = super(AgentWriterRetryTests, self).create_writer(api, enable_stats=enable_stats)
+        # Retry on each flush
+        writer.RETRY_BACKOFF_BASE = 0
+        # DEV: The circuit breaker would stop the retries after a few failures
+        writer._circuit_breaker_threshold = 0
+        return writer
+
+    def test_retry(self):
+        api = FlakyAPI(failures=2)
+        writer = self.create_writer(api)
+        self.flush(writer, trace_id=1)
+        assert len(writer._retries) == 1
+
+        # The encoded payload is sent again, the traces are not encoded again
+        with mock.patch.object(Payload, "add_trace") as add_trace:
+            self.flush(writer)
+            assert len(writer._retries) == 1
+            self.flush(writer)
+            assert add_trace.call_count == 0
+
+        assert len(api.sent) == 3
+        assert api.sent[0] == api.sent[1] == api.sent[2]
+        assert len(writer._retries) == 0
+        assert writer._retries_size == 0
+
+    def test_retry_status(self):
+        for status, retried in ((500, True), (503, True), (429, True), (408, True), (400, False), (413, False)):
+            api = FlakyAPI(failures=1, status=status)
+            writer = self.create_writer(api)
+            self.flush(writer, trace_id=1)
+            self.flush(writer)
+            assert len(api.sent) == (2 if retried else 1), status
+
+    def test_retry_max_retries(self):
+        api = FlakyAPI(failures=10)
+        writer = self.create_writer(api)
+        writer._max_retries = 2
+        self.flush(writer, trace_id=1)
+        for _ in range(4):
+            self.flush(writer)
+
+        # Sent once, then retried twice before giving up
+        assert len(api.sent) == 3
+        assert len(writer._retries) == 0
+        assert writer._retries_size == 0
+        assert writer._retries_dropped == 1
+
+    def test_retry_max_retries_env(self):
+        with self.override_env(dict(DD_TRACE_WRITER_MAX_RETRIES="0")):
+            writer = self.create_writer(FlakyAPI(failures=1))
+        self.flush(writer, trace_id=1)
+        assert len(writer._retries) == 0
+        assert writer._retries_dropped == 1
+
+    def test_retry_backoff(self):
+        api = FlakyAPI(failures=10)
+        writer = self.create_writer(api)
+        writer.RETRY_BACKOFF_BASE = 1
+        writer.RETRY_BACKOFF_MAX = 3
+        # DEV: The rate limiter uses the monotonic clock mocked below
+        writer._retry_budget = RateLimiter(-1)
+        self.flush_at(writer, 100, trace_id=1)
+        # Not due yet
+        self.flush_at(writer, 100)
+        assert len(api.sent) == 1
+        assert 100.5 <= writer._retries[0].due <= 101
+
+        self.flush_at(writer, 101)
+        assert len(api.sent) == 2
+        assert 102 <= writer._retries[0].due <= 103
+
+        self.flush_at(writer, 103)
+        # The delay is capped
+        assert 104.5 <= writer._retries[0].due <= 106
+
+    def test_retry_stop_after_failure(self):
+        api = FlakyAPI(failures=10)
+        writer = self.create_writer(api)
+        for i in range(3):
+            self.flush(writer, trace_id=i)
+
+        # Each flush retries the oldest payload only, the agent is still unavailable for the others
+        assert len(api.sent) == 5
+        assert len(writer._retries) == 3
+
+    def test_retry_max_bytes(self):
+        api = FlakyAPI(failures=10)
+        writer = self.create_writer(api)
+        self.flush(writer, trace_id=1)
+        payload_size = writer._retries[0].payload.size
+        writer._max_retries_size = payload_size * 2
+        # The retry of the first payload fails, the others wait: the oldest payload is given up for the newest one
+        writer._max_retries = 10
+        for i in range(2, 4):
+            self.flush(writer, trace_id=i)
+
+        assert len(writer._retries) == 2
+        assert writer._retries_size == payload_size * 2
+        assert writer._retries_dropped == 1
+
+    def test_retry_budget(self):
+        api = FlakyAPI(failures=1)
+        writer = self.create_writer(api)
+        writer._retry_budget = RateLimiter(0)
+        self.flush(writer, trace_id=1)
+        self.flush(writer)
+        assert len(api.sent) == 1
+        assert len(writer._retries) == 1
+        assert writer._retries_throttled == 1
+
+    def test_retry_dogstatsd(self):
+        api = FlakyAPI(failures=1)
+        writer = self.create_writer(api, enable_stats=True)
+        self.flush(writer, trace_id=1)
+        payload_size = writer._retries_size
+        self.flush(writer)
+
+        assert [
+            mock.call("datadog.tracer.retries.pending.payloads", 1),
+            mock.call("datadog.tracer.retries.pending.bytes", payload_size),
+            mock.call("datadog.tracer.retries.pending.payloads", 0),
+            mock.call("datadog.tracer.retries.pending.bytes", 0),
+        ] == self.dogstatsd.gauge.mock_calls
+        assert mock.call("datadog.tracer.api.retries.total", 0, tags=None) in self.dogstatsd.increment.mock_calls
+        assert mock.call("datadog.tracer.api.retries.total", 1, tags=None) in self.dogstatsd.increment.mock_calls
+        assert mock.call("datadog.tracer.api.retries.errors.total", 0, tags=None) in self.dogstatsd.increment.mock_calls
+        assert mock.call("datadog.tracer.retries.dropped.traces", 0) in self.dogstatsd.increment.mock_calls
+
+    def test_retry_no_dogstatsd_without_failures(self):
+        writer = self.create_writer(FlakyAPI(failures=0), enable_stats=True)
+        self.flush(writer, trace_id=1)
+        self.flush(writer)
+        assert [] == self.dogstatsd.gauge.mock_calls
+        assert not any("retries" in c[1][0] for c in self.dogstatsd.increment.mock_calls)
+
+
+class AgentWriterCircuitBreakerTests(FlakyAgentWriterTestCase):
+    def create_writer(self, api, enable_stats=False):
+        writer = super(AgentWriterCircuitBreakerTests, self).create_writer(api, enable_stats=enable_stats)
+        writer._circuit_breaker_threshold = 3
+        # DEV: The payloads are not retried, each flush sends its traces once
+        writer._max_retries = 0
+        return writer
+
+    def test_open(self):
+        api = FlakyAPI(failures=100)
+        writer = self.create_writer(api)
+        for i in range(2):
+            self.flush_at(writer, 100, trace_id=i)
+            assert not writer._circuit_open
+        self.flush_at(writer, 100, trace_id=2)
+        assert writer._circuit_open
+        assert len(api.sent) == 3
+
+        # The traces are kept in the queue without being encoded nor sent until the agent is probed
+        with mock.patch.object(Payload, "add_trace") as add_trace:
+            self.flush_at(writer, 100.5, trace_id=3)
+            self.flush_at(writer, 100.5, trace_id=4)
+            assert add_trace.call_count == 0
+        assert len(api.sent) == 3
+        assert len(writer._trace_queue) == 2
+
+    def test_http_errors(self):
+        api = FlakyAPI(failures=100, status=500)
+        writer = self.create_writer(api)
+        for i in range(5):
+            self.flush(writer, trace_id=i)
+        assert not writer._circuit_open
+        assert len(api.sent) == 5
+
+    def test_disabled(self):
+        api = FlakyAPI(failures=100)
+        with self.override_env(dict(DD_TRACE_WRITER_CIRCUIT_BREAKER_THRESHOLD="0")):
+            writer = AgentWriter(dogstatsd=None)
+        writer._max_retries = 0
+        writer.api = api
+        self.enable_stats = False
+        for i in range(5):
+            self.flush(writer, trace_id=i)
+        assert not writer._circuit_open
+        assert len(api.sent) == 5
+
+    def test_probe(self):
+        api = FlakyAPI(failures=100)
+        writer = self.create_writer(api)
+        writer.CIRCUIT_BREAKER_PROBE_MAX = 4
+        for i in range(3):
+            self.flush_at(writer, 100, trace_id=i)
+        assert writer._next_probe == 101
+
+        # The delay before the next probe doubles after each failed probe, up to the maximum
+        for now, next_probe in ((101, 103), (103, 107), (107, 111)):
+            self.flush_at(writer, now - 0.5)
+            assert writer._next_probe == now
+            sent = len(api.sent)
+            self.flush_at(writer, now)
+            assert len(api.sent) == sent + 1
+            assert writer._next_probe == next_probe
+            assert writer._circuit_open
+
+    def test_close(self):
+        api = FlakyAPI(failures=3)
+        writer = self.create_writer(api)
+        for i in range(3):
+            self.flush_at(writer, 100, trace_id=i)
+        self.flush_at(writer, 100, trace_id=3)
+        assert writer._circuit_open
+
+        # The probe succeeds and the traces kept in the queue are sent
+        self.flush_at(writer, 101)
+        assert not writer._circuit_open
+        assert writer._connection_failures == 0
+        assert len(api.sent) == 5
+        assert len(writer._trace_queue) == 0
+
+    def test_unbounded_queue(self):
+        api = FlakyAPI(failures=100)
+        writer = self.create_writer(api, enable_stats=True)
+        writer._trace_queue.maxsize = 0
+        for i in range(4):
+            self.flush_at(writer, 100, trace_id=i)
+        assert writer._circuit_open
+        assert len(writer._trace_queue) == 0
+        assert mock.call("datadog.tracer.circuit_breaker.dropped.traces", 1) in self.dogstatsd.increment.mock_calls
+
+    def test_dogstatsd(self):
+        api = FlakyAPI(failures=4)
+        writer = self.create_writer(api, enable_stats=True)
+        for i in range(3):
+            self.flush_at(writer, 100, trace_id=i)
+        self.flush_at(writer, 101)
+        self.flush_at(writer, 103)
+
+        assert [
+            mock.call("datadog.tracer.circuit_breaker.opened"),
+            mock.call("datadog.tracer.circuit_breaker.probes", tags=["result:failure"]),
+            mock.call("datadog.tracer.circuit_breaker.probes", tags=["result:success"]),
+        ] == [c for c in self.dogstatsd.increment.mock_calls if "circuit_breaker" in c[1][0]]
+
+    def test_dogstatsd_open(self):
+        writer = self.create_writer(FlakyAPI(failures=100), enable_stats=True)
+        with self.override_global_config(dict(health_metrics_enabled=True)):
+            writer.run_periodic()
+            writer._circuit_open = True
+            writer.run_periodic()
+        assert [
+            mock.call("datadog.tracer.circuit_breaker.open", 0),
+            mock.call("datadog.tracer.circuit_breaker.open", 1),
+        ] == [c for c in self.dogstatsd.gauge.mock_calls if c[1][0] == "datadog.tracer.circuit_breaker.open"]
+
+
 class LogWriterTests(BaseTestCase):
     N_TRACES = 11
 